@@ -15,8 +15,5 @@ while getopts ":r" opt; do
       esac
 done
 
-echo "Updating git submodules..."
-git submodule update --init
-
 echo "Running REMME build..."
 docker-compose $COMPOSE_FILES build
\ No newline at end of file
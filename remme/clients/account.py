@@ -12,10 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ------------------------------------------------------------------------
+import asyncio
 
-from remme.protos.account_pb2 import AccountMethod, GenesisPayload, TransferPayload
+from remme.protos.account_pb2 import AccountMethod, BulkTransferPayload, GenesisPayload, TransferPayload
+from remme.protos.pub_key_pb2 import PubKeyOwnerIndex, PubKeyOwnerIndexBucket
 from remme.clients.basic import BasicClient
 from remme.tp.account import AccountHandler
+from remme.tp.pub_key import PubKeyHandler, PUB_KEYS_INDEX_BUCKET_SIZE
 from remme.shared.exceptions import KeyNotFound
 from remme.settings.helper import _make_settings_key
 from remme.settings import SETTINGS_KEY_ZERO_ADDRESS_OWNERS
@@ -36,6 +39,15 @@ class AccountClient(BasicClient):
 
         return transfer
 
+    @classmethod
+    def get_bulk_transfer_payload(self, transfers):
+        bulk_transfer = BulkTransferPayload()
+        bulk_transfer.transfers.extend(
+            self.get_transfer_payload(address_to, value) for address_to, value in transfers
+        )
+
+        return bulk_transfer
+
     @classmethod
     def get_genesis_payload(self, total_supply):
         genesis = GenesisPayload()
@@ -57,19 +69,80 @@ class AccountClient(BasicClient):
 
         return self._send_transaction(AccountMethod.TRANSFER, transfer, addresses_input, addresses_output)
 
+    def bulk_transfer(self, transfers):
+        """
+        Send transaction transferring tokens to several receivers, transfers are (address to, value) pairs.
+        """
+        addresses_input = list(dict.fromkeys([address_to for address_to, _ in transfers] + [self.get_user_address()]))
+        addresses_output = addresses_input
+        bulk_transfer = self.get_bulk_transfer_payload(transfers)
+
+        return self._send_transaction(AccountMethod.BULK_TRANSFER, bulk_transfer, addresses_input, addresses_output)
+
     async def get_account(self, address):
         account = Account()
         raw_account = await self.get_value(address)
         account.ParseFromString(raw_account)
         return account
 
-    async def get_pub_keys(self, address):
+    async def _get_message(self, pb_class, address, state_root=None):
+        message = pb_class()
         try:
-            account = await self.get_account(address)
-            return list(account.pub_keys)
+            message.ParseFromString(await self.get_value(address, state_root=state_root))
         except KeyNotFound:
+            pass
+        return message
+
+    async def get_pub_keys(self, address, start=0, limit=None):
+        """
+        Get addresses of public keys stored by the account, `limit` of them starting from `start` (all by default).
+
+        The owner's public keys index ones go first, addresses linked to the account by family version 0.1
+        follow. The index is only appended to, 0.1 stores append to the account and 0.2 stores move account
+        ones to the end of the index in the same order a bucket at a time, so every address keeps its position
+        and pages do not skip or repeat addresses. Only buckets of the index the requested page falls into
+        are fetched, all of the addresses are read at the state root of the same chain head.
+        """
+        pub_key_handler = PubKeyHandler()
+        state_root = await self.get_state_root()
+
+        account, owner_index = await asyncio.gather(
+            self._get_message(Account, address, state_root),
+            self._get_message(PubKeyOwnerIndex, pub_key_handler.make_owner_index_address(address), state_root),
+        )
+
+        bucketed_pub_keys_count = owner_index.buckets_count * PUB_KEYS_INDEX_BUCKET_SIZE
+        index_pub_keys_count = bucketed_pub_keys_count + len(owner_index.pub_keys)
+        pub_keys_count = index_pub_keys_count + len(account.pub_keys)
+
+        stop = pub_keys_count if limit is None else min(start + limit, pub_keys_count)
+        if start >= stop:
             return []
 
+        pub_keys = []
+
+        index_stop = min(stop, index_pub_keys_count)
+        if start < index_stop:
+            first_bucket = start // PUB_KEYS_INDEX_BUCKET_SIZE
+            last_bucket = min(-(-index_stop // PUB_KEYS_INDEX_BUCKET_SIZE), owner_index.buckets_count)
+
+            buckets = await asyncio.gather(*(
+                self._get_message(
+                    PubKeyOwnerIndexBucket, pub_key_handler.make_owner_index_bucket_address(address, bucket), state_root,
+                ) for bucket in range(first_bucket, last_bucket)
+            ))
+
+            index_pub_keys = [pub_key for bucket in buckets for pub_key in bucket.pub_keys]
+            if index_stop > bucketed_pub_keys_count:
+                index_pub_keys.extend(owner_index.pub_keys)
+
+            offset = first_bucket * PUB_KEYS_INDEX_BUCKET_SIZE
+            pub_keys.extend(index_pub_keys[start - offset:index_stop - offset])
+
+        pub_keys.extend(account.pub_keys[max(start - index_pub_keys_count, 0):stop - index_pub_keys_count])
+
+        return pub_keys
+
     async def get_balance(self, address):
         try:
             account = await self.get_account(address)
@@ -28,11 +28,11 @@ from remme.protos.transaction_pb2 import TransactionPayload
 from remme.shared.utils import (
     hash512,
 )
-from remme.settings.helper import _make_settings_key
+from remme.settings.helper import SETTINGS_NAMESPACE, _make_settings_key
 from remme.shared.messaging import Connection
 from remme.settings import PRIV_KEY_FILE, PUB_KEY_FILE
 from remme.settings.default import load_toml_with_defaults
-from remme.shared.router import Router
+from remme.shared.router import Router, ChainHeadTracker, StateCache
 from remme.shared.exceptions import (
     ClientException,
 )
@@ -49,7 +49,12 @@ class BasicClient:
         self.url = config['validator_rest_api_url']
         self._family_handler = family_handler() if callable(family_handler) else None
         self._stream = Connection.get_single_connection(f'tcp://{ config["validator_ip"] }:{ config["validator_port"] }')
-        self._router = Router(self._stream)
+        head_tracker = ChainHeadTracker.get_single_tracker(self._stream)
+        self._router = Router(
+            self._stream,
+            head_tracker=head_tracker,
+            state_cache=StateCache.get_single_cache(head_tracker, address_prefixes=self.get_state_namespaces()),
+        )
 
         try:
             self._signer = self.get_signer_priv_key_from_file(PRIV_KEY_FILE)
@@ -57,6 +62,17 @@ class BasicClient:
             LOGGER.warning('Could not set up signer from file, detailed: %s', e)
             self._signer = self.generate_signer(PRIV_KEY_FILE, PUB_KEY_FILE)
 
+    @staticmethod
+    def get_state_namespaces():
+        """
+        Get namespaces of state clients read: the transaction families, settings and block info ones.
+        """
+        from remme.tp.handlers import TP_HANDLERS
+
+        return [
+            namespace for handler in TP_HANDLERS.values() for namespace in handler.namespaces
+        ] + [SETTINGS_NAMESPACE, BLOCK_INFO_NAMESPACE]
+
     def __getattr__(self, name):
         rfunc = getattr(self._router, name, None)
         if rfunc:
@@ -122,8 +138,8 @@ class BasicClient:
         setting.ParseFromString(value)
         return setting.entries[0].value
 
-    async def get_value(self, address):
-        result = await self.fetch_state(address)
+    async def get_value(self, address, state_root=None):
+        result = await self.fetch_state(address, state_root=state_root)
         return base64.b64decode(result['data'])
 
     async def get_batch_status(self, batch_id):
@@ -151,13 +167,26 @@ class BasicClient:
         prefix = self._get_prefix()
         return prefix + pub_key
 
+    def get_family_version(self, method):
+        """
+        Get the earliest family version processing the method.
+
+        Methods existing before a family version is added keep being sent with the version they were added by,
+        so their transactions are processed by nodes not upgraded yet. New methods are sent with the new version.
+        """
+        for family_version in self._family_handler.family_versions:
+            if method in self._family_handler.get_dispatch_table(family_version):
+                return family_version
+
+        raise ClientException(f'Method {method} is not processed by the {self._family_handler.family_name} family.')
+
     def make_batch_list(self, payload_pb, addresses_input, addresses_output):
         payload = payload_pb.SerializeToString()
         signer = self._signer
         header = TransactionHeader(
             signer_public_key=signer.get_public_key().as_hex(),
             family_name=self._family_handler.family_name,
-            family_version=self._family_handler.family_versions[-1],
+            family_version=self.get_family_version(payload_pb.method),
             inputs=addresses_input,
             outputs=addresses_output,
             dependencies=[],
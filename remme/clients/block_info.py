@@ -2,14 +2,16 @@ import logging
 
 from remme.clients.basic import BasicClient
 from remme.protos.block_info_pb2 import BlockInfo, BlockInfoConfig
+from remme.shared.block_info import (  # noqa: F401
+    BLOCK_INFO_NAMESPACE,
+    CONFIG_ADDRESS,
+    NAMESPACE,
+    create_block_address,
+)
 from remme.shared.exceptions import KeyNotFound
 
 LOGGER = logging.getLogger(__name__)
 
-NAMESPACE = '00b10c'
-CONFIG_ADDRESS = NAMESPACE + '01' + '0' * 62
-BLOCK_INFO_NAMESPACE = NAMESPACE + '00'
-
 
 class BlockInfoClient(BasicClient):
 
@@ -56,7 +58,7 @@ class BlockInfoClient(BasicClient):
 
     @staticmethod
     def create_block_address(block_num):
-        return BLOCK_INFO_NAMESPACE + hex(block_num)[2:].zfill(62)
+        return create_block_address(block_num)
 
     @staticmethod
     def interpret_block_info(block_info):
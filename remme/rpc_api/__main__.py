@@ -66,8 +66,18 @@ if __name__ == '__main__':
         ) for ao in cors_config["allow_origin"]
     })
     zmq_url = f'tcp://{ cfg_ws["validator_ip"] }:{ cfg_ws["validator_port"] }'
-    rpc = JsonRpc(zmq_url=zmq_url, websocket_state_logger=cfg_rpc['websocket_state_logger'], loop=loop, max_workers=1)
+    rpc = JsonRpc(
+        zmq_url=zmq_url,
+        websocket_state_logger=cfg_rpc['websocket_state_logger'],
+        zmq_pool_size=cfg_rpc['zmq_pool_size'],
+        batch_concurrency=cfg_rpc['batch_concurrency'],
+        batch_max_size=cfg_rpc['batch_max_size'],
+        loop=loop,
+        max_workers=1,
+    )
     rpc.load_from_modules(cfg_rpc['available_modules'])
+    app.on_startup.append(rpc.on_startup)
+    app.on_shutdown.append(rpc.on_shutdown)
     cors.add(app.router.add_route('GET', '/', rpc))
     cors.add(app.router.add_route('POST', '/', rpc))
 
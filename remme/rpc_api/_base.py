@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ------------------------------------------------------------------------
+import json
 import logging
 import weakref
 import asyncio
@@ -23,6 +24,7 @@ from aiohttp import web
 
 from aiohttp_json_rpc.rpc import JsonRpc
 from aiohttp_json_rpc.protocol import (
+    JsonRpcMsg,
     JsonRpcMsgTyp,
     encode_result,
     encode_error,
@@ -34,24 +36,58 @@ from aiohttp_json_rpc.exceptions import (
     RpcMethodNotFoundError,
     RpcInvalidParamsError,
     RpcInternalError,
+    RpcParseError,
     RpcError,
 )
 
-from remme.shared.router import Router
+from remme.shared.router import Router, StateCache
 from remme.shared.exceptions import RemmeRpcError
-from remme.shared.messaging import Connection
+from remme.shared.messaging import ConnectionPool
 from remme.shared.metrics import METRICS_SENDER
 from .utils import load_methods
 
 
 LOGGER = logging.getLogger(__name__)
 
+JSONRPC_VERSION = '2.0'
+
+
+def decode_batch_entry(entry):
+    """Validate JSON-RPC message of an already decoded batch entry the way `decode_msg` does.
+    """
+    if not isinstance(entry, dict):
+        raise RpcInvalidRequestError()
+
+    if entry.get('jsonrpc') != JSONRPC_VERSION or len({'error', 'result', 'method'} & entry.keys()) != 1:
+        raise RpcInvalidRequestError(msg_id=entry.get('id', None))
+
+    if 'method' in entry:
+        if entry.get('id', None) is not None:
+            msg_type = JsonRpcMsgTyp.REQUEST
+        else:
+            msg_type = JsonRpcMsgTyp.NOTIFICATION
+        entry.setdefault('params', None)
+    elif 'result' in entry:
+        msg_type = JsonRpcMsgTyp.RESULT
+    else:
+        msg_type = JsonRpcMsgTyp.ERROR
+
+    entry.setdefault('id', None)
+
+    return JsonRpcMsg(msg_type, entry)
+
 
 class JsonRpc(JsonRpc):
 
-    def __init__(self, zmq_url, websocket_state_logger=False, *args, **kwargs):
+    def __init__(self, zmq_url, websocket_state_logger=False, zmq_pool_size=4, batch_concurrency=10,
+                 batch_max_size=100, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._zmq_url = zmq_url
+        self._zmq_pool_size = zmq_pool_size
+        self._batch_concurrency = batch_concurrency
+        self._batch_max_size = batch_max_size
+        self._zmq_pool = None
+        self._report_metrics_task = None
         self._accepting = True
         self._evthashes = {}
         self._subsevt = {}
@@ -61,6 +97,25 @@ class JsonRpc(JsonRpc):
                 asyncio.ensure_future(self._print_storage_state(), loop=self.loop))
             self._print_storage_state_running = True
 
+    async def on_startup(self, app):
+        """Create the ZMQ connection pool shared by websocket clients and start reporting its metrics.
+        """
+        self._zmq_pool = ConnectionPool(self._zmq_url, size=self._zmq_pool_size, loop=self.loop)
+        self._report_metrics_task = asyncio.ensure_future(self._report_metrics(), loop=self.loop)
+
+    async def on_shutdown(self, app):
+        """Stop reporting metrics and close the ZMQ connection pool.
+        """
+        if self._report_metrics_task is not None:
+            self._report_metrics_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._report_metrics_task
+            self._report_metrics_task = None
+
+        if self._zmq_pool is not None:
+            self._zmq_pool.close()
+            self._zmq_pool = None
+
     async def __call__(self, request):
         # prepare request
         request.rpc = self
@@ -108,14 +163,14 @@ class JsonRpc(JsonRpc):
                 del self._evthashes[ws]
 
     async def handle_websocket_request(self, http_request):
-        if not self._accepting:
+        if not self._accepting or self._zmq_pool is None:
             return web.Response(status=503)
 
         http_request.pending = {}
 
         LOGGER.debug('WS ready')
 
-        stream = Connection(self._zmq_url, loop=self.loop)
+        stream = self._zmq_pool.connect()
         await stream.open()
 
         LOGGER.debug('ZMQ ready')
@@ -149,6 +204,16 @@ class JsonRpc(JsonRpc):
             raw_msg = await http_request.read()
         else:
             raw_msg = data.data
+
+        if raw_msg.lstrip()[:1] in ('[', b'['):
+            response = await self._handle_rpc_batch(http_request, raw_msg)
+
+            # Batch of notifications only gets nothing in response
+            if response is None:
+                return None if http_request.protocol._upgrade else web.Response(status=204)
+
+            return await self._send_str(http_request, response)
+
         try:
             msg = decode_msg(raw_msg)
             self.logger.debug(f'message decoded: {msg}')
@@ -156,6 +221,83 @@ class JsonRpc(JsonRpc):
         except RpcError as error:
             return await self._send_str(http_request, encode_error(error))
 
+        return await self._send_str(http_request, await self._process_rpc_msg(http_request, msg))
+
+    async def _handle_rpc_batch(self, http_request, raw_msg):
+        """Process JSON-RPC batch entries concurrently and encode their results to a single array.
+
+        Entries are isolated, an entry failed to be decoded or processed gets its error.
+        Notifications are processed, but get no result or error, so a batch of notifications only gets None.
+        """
+        try:
+            entries = json.loads(raw_msg)
+        except ValueError:
+            return encode_error(RpcParseError())
+
+        if not entries:
+            return encode_error(RpcInvalidRequestError())
+
+        if len(entries) > self._batch_max_size:
+            return encode_error(RpcInvalidRequestError(
+                message=f'Batch should not have more than {self._batch_max_size} entries',
+            ))
+
+        self.logger.debug(f'batch of {len(entries)} messages decoded')
+
+        semaphore = asyncio.Semaphore(self._batch_concurrency)
+
+        async def process_entry(entry):
+            try:
+                msg = decode_batch_entry(entry)
+            except RpcError as error:
+                return encode_error(error)
+
+            if msg.type == JsonRpcMsgTyp.NOTIFICATION:
+                async with semaphore:
+                    await self._process_rpc_notification(http_request, msg)
+                return None
+
+            async with semaphore:
+                return await self._process_rpc_msg(http_request, msg)
+
+        results = [
+            result for result in await asyncio.gather(*(process_entry(entry) for entry in entries))
+            if result is not None
+        ]
+
+        if not results:
+            return None
+
+        return f'[{",".join(results)}]'
+
+    async def _process_rpc_notification(self, http_request, msg):
+        """Call method of the notification, its result and errors are not sent to the client.
+        """
+        method = msg.data['method']
+
+        if method not in http_request.methods:
+            self.logger.debug(f'notification method {method} is unknown or restricted')
+            return
+
+        measurement = METRICS_SENDER.get_time_measurement(f'rpc_api.{method}')
+
+        try:
+            await http_request.methods[method](
+                http_request=http_request,
+                rpc=self,
+                msg=msg,
+            )
+        except (RpcGenericServerDefinedError,
+                RpcInvalidRequestError,
+                RpcInvalidParamsError,
+                RemmeRpcError) as error:
+            self.logger.debug(f'notification method {method} failed: {error}')
+        except Exception as error:
+            logging.error(error, exc_info=True)
+
+        measurement.done()
+
+    async def _process_rpc_msg(self, http_request, msg):
         # handle requests
         if msg.type == JsonRpcMsgTyp.REQUEST:
             self.logger.debug('msg gets handled as request')
@@ -170,10 +312,10 @@ class JsonRpc(JsonRpc):
                 else:
                     err_msg = 'Method not found'
 
-                return await self._send_str(http_request, encode_error(
+                return encode_error(
                     RpcMethodNotFoundError(msg_id=msg.data.get('id', None),
                                            message=err_msg)
-                ))
+                )
 
             measurement = METRICS_SENDER.get_time_measurement(f'rpc_api.{method}')
 
@@ -209,20 +351,19 @@ class JsonRpc(JsonRpc):
                 )
 
             measurement.done()
-            return await self._send_str(http_request, result)
+            return result
 
         # handle result
         elif msg.type == JsonRpcMsgTyp.RESULT:
             self.logger.debug('msg gets handled as result')
 
-            result = encode_result(msg.data['id'], msg.data['result'])
-            return await self._send_str(http_request, result)
+            return encode_result(msg.data['id'], msg.data['result'])
         else:
             self.logger.debug(f'unsupported msg type ({msg.type})')
 
-            return await self._send_str(http_request, encode_error(
+            return encode_error(
                 RpcInvalidRequestError(msg_id=msg.data.get('id', None))
-            ))
+            )
 
     def _http_send_str(self, request, string):
         return web.json_response(string, dumps=lambda obj, *a, **kw: obj)
@@ -242,6 +383,21 @@ class JsonRpc(JsonRpc):
 
         await client.ws.send_str(string)
 
+    async def _report_metrics(self):
+        while True:
+            await asyncio.sleep(5)
+            for index, in_flight in enumerate(self._zmq_pool.in_flight):
+                METRICS_SENDER.send_metric('rpc_api.zmq_pool', {
+                    'in_flight': in_flight,
+                }, tags={'socket': str(index)})
+            METRICS_SENDER.send_metric('rpc_api.zmq_pool.events', {
+                'subscribers': self._zmq_pool.subscribers_count,
+            })
+
+            state_cache_stats = StateCache.get_single_cache_stats()
+            if state_cache_stats:
+                METRICS_SENDER.send_metric('rpc_api.state_cache', state_cache_stats)
+
     async def _print_storage_state(self):
         while self._print_storage_state_running:
             await asyncio.sleep(5)
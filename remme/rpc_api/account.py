@@ -14,6 +14,8 @@
 # ------------------------------------------------------------------------
 import logging
 
+from aiohttp_json_rpc.exceptions import RpcInvalidParamsError
+
 from remme.shared.forms import get_address_form
 from remme.clients.account import AccountClient
 
@@ -35,8 +37,21 @@ async def get_balance(request):
     return await client.get_balance(address)
 
 
-@validate_params(get_address_form('public_key_address'))
+def _get_non_negative_param(request, name, default):
+    value = request.params.get(name, default)
+    if value is default:
+        return value
+
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise RpcInvalidParamsError(message=f'Parameter "{name}" should be a non-negative integer.')
+
+    return value
+
+
+@validate_params(get_address_form('public_key_address'), ignore_fields=('start', 'limit'))
 async def get_public_keys_list(request):
     client = AccountClient()
     address = request.params['public_key_address']
-    return await client.get_pub_keys(address)
+    start = _get_non_negative_param(request, 'start', 0)
+    limit = _get_non_negative_param(request, 'limit', None)
+    return await client.get_pub_keys(address, start, limit)
@@ -18,7 +18,7 @@ from remme.clients.block_info import BlockInfoClient
 from remme.shared.exceptions import KeyNotFound
 from remme.shared.forms import ProtoForm, IdentifierForm
 
-from .utils import validate_params
+from .utils import encode_raw_result, raw_response, validate_params
 
 
 __all__ = (
@@ -52,6 +52,7 @@ async def get_blocks(request):
         raise KeyNotFound('Blocks not found')
 
 
+@raw_response
 @validate_params(ProtoForm, ignore_fields=('address', 'start', 'limit', 'head', 'reverse'))
 async def list_blocks(request):
     client = BlockInfoClient()
@@ -61,14 +62,18 @@ async def list_blocks(request):
     head = request.params.get('head')
     reverse = request.params.get('reverse')
 
-    return await client.list_blocks(ids, start, limit, head, reverse)
+    return encode_raw_result(
+        request.msg.data['id'],
+        await client.list_blocks(ids, start, limit, head, reverse, as_json=True),
+    )
 
 
+@raw_response
 @validate_params(IdentifierForm)
 async def fetch_block(request):
     id = request.params['id']
     client = BlockInfoClient()
     try:
-        return await client.fetch_block(id)
+        return encode_raw_result(request.msg.data['id'], await client.fetch_block(id, as_json=True))
     except KeyNotFound:
         raise KeyNotFound(f'Block with id "{id}" not found')
@@ -62,17 +62,14 @@ async def subscribe(request):
             raise ClientException(
                 message=f'Already subscribed to event "{event_type}"')
 
-        router = ws.stream.router
-
         event_types = set(subsevt.keys())
         event_types.add(event_type)
 
         LOGGER.debug(f'Events to re-subsribe: {event_types}')
 
         validated_data = evt_tr.validate(msg_id, request.params)
+        # Subscription without a known block gets events since the head over the shared connection
         from_block = validated_data.get('from_block')
-        if not from_block:
-            from_block = (await router.list_blocks(limit=1))['head']
 
         req_msg = evt_tr.prepare_subscribe_message(event_types, from_block)
 
@@ -231,20 +228,24 @@ async def _process_msg(request, msg):
                 LOGGER.debug('Skiping evt with empty response')
                 continue
 
-            LOGGER.debug(f'Got response: {response}')
-            evthash = evt_tr.prepare_evt_hash(response)
-            LOGGER.debug(f'Evt hash calculated: {evthash}')
+            # Event changing several entities (e.g. a bulk expiry) is delivered as a list of notifications
+            responses = response if isinstance(response, list) else [response]
 
-            # Check if we already have sent update
-            if evthash in request.rpc._evthashes[ws]:
-                LOGGER.debug(f'Connection {ws} already '
-                             'received this notification')
-                continue
+            for response in responses:
+                LOGGER.debug(f'Got response: {response}')
+                evthash = evt_tr.prepare_evt_hash(response)
+                LOGGER.debug(f'Evt hash calculated: {evthash}')
+
+                # Check if we already have sent update
+                if evthash in request.rpc._evthashes[ws]:
+                    LOGGER.debug(f'Connection {ws} already '
+                                 'received this notification')
+                    continue
 
-            result = encode_result(msg_id, {
-                'event_type': evt_name,
-                'attributes': response
-            })
-            await request.rpc._ws_send_str(request, result)
+                result = encode_result(msg_id, {
+                    'event_type': evt_name,
+                    'attributes': response
+                })
+                await request.rpc._ws_send_str(request, result)
 
-            request.rpc._evthashes[ws].add(evthash)
+                request.rpc._evthashes[ws].add(evthash)
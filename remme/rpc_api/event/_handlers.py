@@ -232,6 +232,7 @@ class TransferEventHandler(BaseEventHandler):
     NAME = 'transfer'
     EVENTS = (
         Events.ACCOUNT_TRANSFER.value,
+        Events.ACCOUNT_BULK_TRANSFER.value,
     )
 
     @classmethod
@@ -239,22 +240,35 @@ class TransferEventHandler(BaseEventHandler):
         return ('from', 'to')
 
     def prepare_response(self, state, validated_data):
-        sender, receiver = state[0], state[1]
-        if any([
-            sender['address'] == validated_data['address'],
-            receiver['address'] == validated_data['address']
-        ]):
+        """
+        Prepare response.
+
+        Sender is the first changed account and receivers are the rest of them. Receiver gets the transfer
+        to its account, sender of a bulk transfer gets the list of all receivers.
+        """
+        sender, receivers = state[0], state[1:]
+
+        if sender['address'] == validated_data['address']:
+            receivers_response = [self._prepare_account(receiver) for receiver in receivers]
             return {
-                'from': {
-                    'address': sender['address'],
-                    'balance': float(sender['balance'])
-                },
-                'to': {
-                    'address': receiver['address'],
-                    'balance': float(receiver['balance'])
-                },
+                'from': self._prepare_account(sender),
+                'to': receivers_response[0] if len(receivers_response) == 1 else receivers_response,
             }
 
+        for receiver in receivers:
+            if receiver['address'] == validated_data['address']:
+                return {
+                    'from': self._prepare_account(sender),
+                    'to': self._prepare_account(receiver),
+                }
+
+    @staticmethod
+    def _prepare_account(account):
+        return {
+            'address': account['address'],
+            'balance': float(account['balance']),
+        }
+
     def parse_evt(self, evt):
         try:
             return json.loads(next(filter(lambda el: el['key'] == 'entities_changed', evt['attributes']))['value'])
@@ -285,6 +299,7 @@ class AtomicSwapEventHandler(BaseEventHandler):
         Events.SWAP_CLOSE.value,
         Events.SWAP_APPROVE.value,
         Events.SWAP_EXPIRE.value,
+        Events.SWAP_EXPIRE_MANY.value,
         Events.SWAP_SET_SECRET_LOCK.value,
         Events.SAWTOOTH_BLOCK_COMMIT.value,
     )
@@ -294,14 +309,24 @@ class AtomicSwapEventHandler(BaseEventHandler):
         return ('swap_id', 'state')
 
     def prepare_response(self, state, validated_data):
-        swap_info = next(filter(lambda el: el['type'] == 'AtomicSwapInfo', state))
-        LOGGER.debug(f'Parsed swap info: {swap_info}')
+        """
+        Prepare response.
+
+        Event of a bulk expiry changes several swaps, each of them is a separate notification then.
+        """
+        swap_infos = [el for el in state if el['type'] == 'AtomicSwapInfo']
+        LOGGER.debug(f'Parsed swap infos: {swap_infos}')
 
         id_ = validated_data.get('id')
-        if id_ and id_ != swap_info['swap_id']:
-            return
-        del swap_info['type']
-        return swap_info
+        if id_:
+            swap_infos = [swap_info for swap_info in swap_infos if swap_info['swap_id'] == id_]
+
+        for swap_info in swap_infos:
+            del swap_info['type']
+
+        if len(swap_infos) == 1:
+            return swap_infos[0]
+        return swap_infos
 
     def parse_evt(self, evt):
         try:
@@ -26,14 +26,13 @@ from sawtooth_sdk.protobuf.transaction_pb2 import (
 )
 
 from remme.shared.exceptions import KeyNotFound
-from remme.tp.basic import PB_CLASS, VALIDATOR
-from remme.tp.__main__ import TP_HANDLERS
+from remme.tp.handlers import TP_HANDLERS
 from remme.clients.account import AccountClient
 from remme.clients.pub_key import PubKeyClient
 from remme.protos.transaction_pb2 import TransactionPayload
 from remme.shared.forms import ProtoForm, IdentifierForm, IdentifiersForm
 
-from .utils import validate_params
+from .utils import encode_raw_result, raw_response, validate_params
 
 
 __all__ = (
@@ -78,22 +77,26 @@ async def send_tokens(request):
     return result['data']
 
 
-def _get_proto_validator(current_handler, tr_payload_pb):
-    processor = current_handler.get_state_processor()
+def _get_proto_errors(current_handler, family_version, tr_payload_pb):
+    """Get protobuf class of the payload data and its validation errors.
+
+    Payload is validated against methods of the transaction family version,
+    as the transaction processor does.
+    """
+    if family_version not in current_handler.family_versions:
+        logger.debug(f'Family version "{family_version}" '
+                     f'not found for handler {current_handler.family_name}')
+        return None, None
+
     try:
-        state_processor = processor[tr_payload_pb.method]
+        dispatch = current_handler.get_dispatch_table(family_version)[tr_payload_pb.method]
     except KeyError:
         logger.debug(f'Payload method "{tr_payload_pb.method}" '
-                     f'not found for processor {processor}')
-        return
+                     f'not found for handler {current_handler.family_name} '
+                     f'of version {family_version}')
+        return None, None
 
-    try:
-        pb_class = state_processor[PB_CLASS]
-        validator_class = state_processor[VALIDATOR]
-    except KeyError:
-        logger.debug('"validator_class" or "pb_class" not found '
-                     f'in {state_processor}')
-        return
+    pb_class = dispatch.pb_class
 
     try:
         data_pb = pb_class()
@@ -101,9 +104,9 @@ def _get_proto_validator(current_handler, tr_payload_pb):
     except DecodeError:
         logger.debug('Failed to parse payload proto '
                      f'with protobuf "{pb_class}"')
-        return
+        return None, None
 
-    return validator_class.load_proto(data_pb)
+    return pb_class, dispatch.proto_validator.validate(data_pb)
 
 
 @validate_params(ProtoForm)
@@ -164,13 +167,13 @@ async def send_raw_transaction(request):
             message='Validation handler not set for this method'
         )
 
-    validator = _get_proto_validator(handler, tr_payload_pb)
-    if validator and not validator.validate():
+    pb_class, errors = _get_proto_errors(handler, tr_head_pb.family_version, tr_payload_pb)
+    if errors:
         logger.debug('Form "send_raw_transaction" validator errors: '
-                     f'{validator.errors}')
+                     f'{errors}')
         raise RpcGenericServerDefinedError(
             error_code=-32050,
-            message=f'Invalid "{validator.get_pb_class().__name__}" '
+            message=f'Invalid "{pb_class.__name__}" '
                     'structure'
         )
 
@@ -190,6 +193,7 @@ async def list_receipts(request):
         raise KeyNotFound(f'Transactions with ids "{ids}" not found')
 
 
+@raw_response
 @validate_params(ProtoForm, ignore_fields=('ids', 'start', 'limit', 'head', 'reverse'))
 async def list_batches(request):
     client = AccountClient()
@@ -199,16 +203,20 @@ async def list_batches(request):
     head = request.params.get('head')
     reverse = request.params.get('reverse')
 
-    return await client.list_batches(ids, start, limit, head, reverse)
+    return encode_raw_result(
+        request.msg.data['id'],
+        await client.list_batches(ids, start, limit, head, reverse, as_json=True),
+    )
 
 
+@raw_response
 @validate_params(IdentifierForm)
 async def fetch_batch(request):
     id = request.params['id']
 
     client = AccountClient()
     try:
-        return await client.fetch_batch(id)
+        return encode_raw_result(request.msg.data['id'], await client.fetch_batch(id, as_json=True))
     except KeyNotFound:
         raise KeyNotFound(f'Batch with id "{id}" not found')
 
@@ -221,6 +229,7 @@ async def get_batch_status(request):
     return await client.get_batch_status(id)
 
 
+@raw_response
 @validate_params(ProtoForm, ignore_fields=('ids', 'start', 'limit', 'head', 'reverse', 'family_name'))
 async def list_transactions(request):
     client = AccountClient()
@@ -231,14 +240,18 @@ async def list_transactions(request):
     reverse = request.params.get('reverse')
     family_name = request.params.get('family_name')
 
-    return await client.list_transactions(ids, start, limit, head, reverse, family_name)
+    return encode_raw_result(
+        request.msg.data['id'],
+        await client.list_transactions(ids, start, limit, head, reverse, family_name, as_json=True),
+    )
 
 
+@raw_response
 @validate_params(IdentifierForm)
 async def fetch_transaction(request):
     id = request.params['id']
     client = AccountClient()
     try:
-        return await client.fetch_transaction(id)
+        return encode_raw_result(request.msg.data['id'], await client.fetch_transaction(id, as_json=True))
     except KeyNotFound:
         raise KeyNotFound(f'Transaction with id "{id}" not found')
@@ -13,6 +13,7 @@
 # limitations under the License.
 # ------------------------------------------------------------------------
 import os
+import json
 import logging
 import importlib
 import functools
@@ -49,6 +50,19 @@ def validate_params(form_class, ignore_fields=None):
     return decorator
 
 
+def raw_response(func):
+    """Mark method as returning JSON encoded result of the response, that is sent as is.
+    """
+    func.raw_response = True
+    return func
+
+
+def encode_raw_result(msg_id, result):
+    """Wrap JSON encoded result to JSON-RPC response the way `encode_result` does.
+    """
+    return f'{{"jsonrpc": "2.0", "id": {json.dumps(msg_id)}, "result": {result}}}'
+
+
 def load_methods(prefix, modules="*"):
     if modules == '*':
         logger.info('Loading all modules')
@@ -11,6 +11,10 @@ SETTINGS_SWAP_COMMISSION = 'remme.settings.swap_comission'
 ZMQ_CONNECTION_TIMEOUT = 30
 # Number of seconds to wait for state operations to succeed
 STATE_TIMEOUT_SEC = 30
+# Number of seconds to reuse the chain head requested from the validator
+CHAIN_HEAD_TTL_SEC = 1
+# Number of bytes of state values cached by state roots and addresses
+STATE_CACHE_MEMORY_BUDGET = 64 * 1024 * 1024
 
 ZERO_ADDRESS = '0' * 70
 GENESIS_ADDRESS = '0' * 69 + '1'
@@ -18,11 +18,14 @@ import hashlib
 from functools import lru_cache
 
 
+from google.protobuf.message import DecodeError
 from sawtooth_sdk.messaging.future import FutureTimeoutError
 from sawtooth_sdk.processor.exceptions import InternalError
 
 from sawtooth_sdk.protobuf.setting_pb2 import Setting
 
+from remme.shared.utils import LRUCache
+
 
 LOGGER = logging.getLogger(__name__)
 
@@ -31,14 +34,19 @@ LOGGER = logging.getLogger(__name__)
 SETTINGS_NAMESPACE = '000000'
 
 
+# Number of settings addresses parsed values are kept for.
+SETTINGS_CACHE_SIZE = 256
+
+# Parse-only memo: parsed setting values by settings address, stored together with
+# the serialized entry they were parsed from. Entries are still read from the state
+# of every transaction, a transaction processor knows neither the state root it runs
+# against nor writes of the settings family, so reads can not be keyed or skipped.
+_setting_values = LRUCache(maxsize=SETTINGS_CACHE_SIZE)
+
+
 def _get_setting_value(context, key, default_value=None):
     address = _make_settings_key(key)
-    setting = _get_setting_entry(context, address)
-    for entry in setting.entries:
-        if key == entry.key:
-            return entry.value
-
-    return default_value
+    return _get_setting_values(context, address).get(key, default_value)
 
 
 def get_setting_from_key_value(key, value):
@@ -48,17 +56,43 @@ def get_setting_from_key_value(key, value):
     return setting
 
 
-def _get_setting_entry(context, address):
-    from remme.tp.basic import get_data  # noqa
+def _get_setting_values(context, address):
+    """Get values of setting entry by their keys.
+
+    The entry is always read in the context, only its parsing is memoized. Cached
+    values are reused only if the entry read in the context is byte-equal
+    to the one they were parsed from, so values of another block or fork state,
+    or of an entry written by a transaction, are never returned.
+    """
+    data = _get_setting_data(context, address)
+
+    cached = _setting_values.get(address)
+    if cached is not None and cached[0] == data:
+        return cached[1]
 
+    setting = Setting()
+    try:
+        if data:
+            setting.ParseFromString(data)
+    except DecodeError as e:
+        LOGGER.exception(e)
+        setting = Setting()
+
+    values = {}
+    for entry in setting.entries:
+        values.setdefault(entry.key, entry.value)
+
+    _setting_values.set(address, (data, values))
+    return values
+
+
+def _get_setting_data(context, address):
     try:
-        entry = get_data(context, Setting, address)
+        return context.get_cached_raw_data(address)
     except FutureTimeoutError:
         LOGGER.warning('Timeout occured on context.get_state([%s])', address)
         raise InternalError('Unable to get {}'.format(address))
 
-    return entry if entry else Setting()
-
 
 def _to_hash(value):
     return hashlib.sha256(value.encode()).hexdigest()
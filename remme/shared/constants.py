@@ -26,9 +26,12 @@ class Events(Enum):
     SWAP_CLOSE = 'atomic-swap/close'
     SWAP_APPROVE = 'atomic-swap/approve'
     SWAP_EXPIRE = 'atomic-swap/expire'
+    SWAP_EXPIRE_MANY = 'atomic-swap/expire-many'
     SWAP_SET_SECRET_LOCK = 'atomic-swap/set-secret-lock'
 
     ACCOUNT_TRANSFER = 'account/transfer'
+    ACCOUNT_BULK_TRANSFER = 'account/bulk-transfer'
 
     SAWTOOTH_BLOCK_COMMIT = 'sawtooth/block-commit'
+    SAWTOOTH_STATE_DELTA = 'sawtooth/state-delta'
     REMME_BATCH_DELTA = 'remme/batch-status'
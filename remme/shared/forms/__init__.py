@@ -1,16 +1,19 @@
 from .base import ProtoForm
+from .compiled import get_proto_validator
 from .pub_key import (
     NewPublicKeyPayloadForm,
     RevokePubKeyPayloadForm,
 )
 from .account import (
     TransferPayloadForm,
+    BulkTransferPayloadForm,
     GenesisPayloadForm,
     get_address_form,
 )
 from .pub_key import (
     NewPublicKeyPayloadForm,
     NewPubKeyStoreAndPayPayloadForm,
+    NewPubKeyBatchPayloadForm,
     RevokePubKeyPayloadForm,
 )
 from .account import TransferPayloadForm, GenesisPayloadForm
@@ -18,6 +21,7 @@ from .atomic_swap import (
     AtomicSwapInitPayloadForm,
     AtomicSwapApprovePayloadForm,
     AtomicSwapExpirePayloadForm,
+    AtomicSwapExpireManyPayloadForm,
     AtomicSwapSetSecretLockPayloadForm,
     AtomicSwapClosePayloadForm,
     AtomicSwapForm,
@@ -11,6 +11,19 @@ class TransferPayloadForm(ProtoForm):
     ])
 
 
+# Maximum number of recipients of a bulk transfer, it keeps a transaction within a state round trip
+BULK_TRANSFER_MAX_TRANSFERS = 100
+
+
+class BulkTransferPayloadForm(ProtoForm):
+    transfers = fields.FieldList(fields.FormField(TransferPayloadForm), validators=[
+        validators.Length(
+            min=1, max=BULK_TRANSFER_MAX_TRANSFERS,
+            message='Number of transfers should be from %(min)d to %(max)d.',
+        ),
+    ])
+
+
 class GenesisPayloadForm(ProtoForm):
     total_supply = fields.IntegerField(validators=[validators.DataRequired()])
 
@@ -3,6 +3,8 @@ from wtforms import fields, validators
 from .base import ProtoForm
 from ._fields import AddressField, SwapIDField
 
+ATOMIC_SWAP_EXPIRE_MANY_MAX_SWAPS = 200
+
 
 class AtomicSwapInitPayloadForm(ProtoForm):
     receiver_address = AddressField()
@@ -22,6 +24,15 @@ class AtomicSwapExpirePayloadForm(ProtoForm):
     swap_id = SwapIDField()
 
 
+class AtomicSwapExpireManyPayloadForm(ProtoForm):
+    swap_ids = fields.FieldList(SwapIDField(), validators=[
+        validators.Length(
+            min=1, max=ATOMIC_SWAP_EXPIRE_MANY_MAX_SWAPS,
+            message='Number of swaps should be from %(min)d to %(max)d.',
+        ),
+    ])
+
+
 class AtomicSwapSetSecretLockPayloadForm(ProtoForm):
     swap_id = SwapIDField()
     secret_lock = fields.StringField(validators=[validators.DataRequired()])
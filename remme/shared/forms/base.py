@@ -38,11 +38,19 @@ class ProtoForm(Form):
                 field = getattr(form, k)
             except AttributeError:
                 continue
-            if not isinstance(field, fields.FormField):
-                field.data = int(v) if str(v).isdigit() else v
-                continue
-            cls._gen_load(field.form, v)
-            
+            cls._gen_load_field(field, v)
+
+    @classmethod
+    def _gen_load_field(cls, field, value):
+        if isinstance(field, fields.FormField):
+            cls._gen_load(field.form, value)
+        elif isinstance(field, fields.FieldList):
+            # Entries are created for every item of the list when the form is processed
+            for entry, entry_value in zip(field.entries, value):
+                cls._gen_load_field(entry, entry_value)
+        else:
+            field.data = int(value) if str(value).isdigit() else value
+
     @classmethod
     def load_data(cls, data):
         form = cls(**data)
@@ -60,8 +68,18 @@ class ProtoForm(Form):
         super().process(formdata, obj, data, **kwargs)
         self._wrong_fields = set(kwargs.keys()).difference(self._fields.keys())
 
+    @staticmethod
+    def clean_errors(errors):
+        """Post-process errors of the validated fields in place.
+
+        Is called by compiled protobuf validators as well, so forms should
+        override it instead of `validate` to keep them in sync.
+        """
+
     def validate(self):
         if self.wrong_fields:
             self.errors['error'] = [f"Wrong params keys: {list(self.wrong_fields)}"]
             return False
-        return super().validate()
+        super().validate()
+        self.clean_errors(self.errors)
+        return not self.errors
@@ -0,0 +1,362 @@
+"""Validators of protobuf messages compiled from `ProtoForm` definitions.
+
+`ProtoForm.load_proto` converts a message to a dictionary, builds the form
+with nested forms and only then validates it. Compiled validators run the same
+checks directly on fields of the message and produce the same errors the form
+does, so they could be used interchangeably.
+
+Forms with fields, validators or hooks that could not be compiled are
+validated with the form itself.
+"""
+import base64
+import logging
+from functools import lru_cache
+
+from google.protobuf.descriptor import FieldDescriptor
+from wtforms import fields, validators
+
+from .base import ProtoForm
+
+
+logger = logging.getLogger(__name__)
+
+# Arguments of the form constructor, data keys named so are not passed to the form as fields
+FORM_ARGUMENTS = frozenset(['formdata', 'obj', 'prefix', 'data', 'meta', 'ignore_fields'])
+
+INT64_TYPES = frozenset([
+    FieldDescriptor.TYPE_INT64,
+    FieldDescriptor.TYPE_UINT64,
+    FieldDescriptor.TYPE_SINT64,
+    FieldDescriptor.TYPE_FIXED64,
+    FieldDescriptor.TYPE_SFIXED64,
+])
+
+INT32_TYPES = frozenset([
+    FieldDescriptor.TYPE_INT32,
+    FieldDescriptor.TYPE_UINT32,
+    FieldDescriptor.TYPE_SINT32,
+    FieldDescriptor.TYPE_FIXED32,
+    FieldDescriptor.TYPE_SFIXED32,
+    FieldDescriptor.TYPE_BOOL,
+])
+
+DATA_REQUIRED = 'data_required'
+OPTIONAL = 'optional'
+
+
+class UncompilableFormError(Exception):
+    """Form could not be compiled to a protobuf validator.
+    """
+
+
+def _load_string(value):
+    # The same digits casting `ProtoForm._gen_load` does
+    return int(value) if value.isdigit() else value
+
+
+def _load_bytes(value):
+    return _load_string(base64.b64encode(value).decode('utf-8'))
+
+
+def _load_int64(value):
+    # `MessageToDict` converts 64-bit integers to strings, the form casts them back unless they are negative
+    return value if value >= 0 else str(value)
+
+
+def _load_identity(value):
+    return value
+
+
+def _get_value_loader(field_descriptor):
+    """Get function converting value of the field (an item of it if repeated) to the data the form loads for it.
+    """
+    if field_descriptor.type == FieldDescriptor.TYPE_STRING:
+        return _load_string
+
+    if field_descriptor.type == FieldDescriptor.TYPE_BYTES:
+        return _load_bytes
+
+    if field_descriptor.type in INT64_TYPES:
+        return _load_int64
+
+    if field_descriptor.type in INT32_TYPES:
+        return _load_identity
+
+    if field_descriptor.type == FieldDescriptor.TYPE_ENUM:
+        values_by_number = field_descriptor.enum_type.values_by_number
+
+        def load_enum(value):
+            enum_value = values_by_number.get(value)
+            return value if enum_value is None else enum_value.name
+
+        return load_enum
+
+    raise UncompilableFormError(f'Field "{field_descriptor.full_name}" type is not supported.')
+
+
+def _compile_field_validation(field):
+    """Compile validation chain of the form field to a function getting errors of the field data.
+    """
+    chain = []
+    for validator in field.validators:
+        if type(validator) is validators.DataRequired:
+            chain.append((DATA_REQUIRED, validator.message or 'This field is required.'))
+        elif type(validator) is validators.Optional:
+            # Data is not loaded as raw data, so the field is always skipped as an empty one
+            chain.append((OPTIONAL, None))
+        elif type(validator) is validators.Regexp:
+            chain.append((validator.regex, validator.message or 'Invalid input.'))
+        else:
+            raise UncompilableFormError(f'Validator {validator!r} of field "{field.name}" is not supported.')
+
+    choices = None
+    if isinstance(field, fields.SelectField):
+        if type(field).pre_validate is not fields.SelectField.pre_validate:
+            raise UncompilableFormError(f'Field "{field.name}" overrides pre-validation.')
+        choices = [value for value, _ in field.choices]
+
+    elif type(field).pre_validate is not fields.Field.pre_validate:
+        raise UncompilableFormError(f'Field "{field.name}" overrides pre-validation.')
+
+    def get_errors(data):
+        errors = []
+
+        if choices is not None and data not in choices:
+            errors.append('Not a valid choice')
+
+        for check, message in chain:
+            if check is DATA_REQUIRED:
+                if not data or isinstance(data, str) and not data.strip():
+                    return [message]
+            elif check is OPTIONAL:
+                return []
+            elif not check.match(data or ''):
+                errors.append(message)
+
+        return errors
+
+    return get_errors
+
+
+def _compile_list_validation(field):
+    """Compile validation chain of the list field to a function getting its errors by number of entries.
+    """
+    chain = []
+    for validator in field.validators:
+        if type(validator) is not validators.Length or validator.message is None:
+            raise UncompilableFormError(f'Validator {validator!r} of field "{field.name}" is not supported.')
+        chain.append(validator)
+
+    def get_errors(entries_count):
+        return [
+            validator.message % dict(min=validator.min, max=validator.max, length=entries_count)
+            for validator in chain
+            if entries_count < validator.min or validator.max != -1 and entries_count > validator.max
+        ]
+
+    return get_errors
+
+
+def _compile_list_entry(name, field, field_descriptor):
+    """Compile entry of the list field to functions loading an item of the repeated field and getting its errors.
+    """
+    is_message = field_descriptor.type == FieldDescriptor.TYPE_MESSAGE
+
+    if issubclass(field.unbound_field.field_class, fields.FormField):
+        if not is_message:
+            raise UncompilableFormError(f'List field "{name}" of nested forms is not a list of messages.')
+
+        form_class = field.unbound_field.kwargs.get('form_class') or field.unbound_field.args[0]
+        nested_validator = CompiledProtoValidator(form_class, descriptor=field_descriptor.message_type)
+        return nested_validator.load, nested_validator.get_errors
+
+    if is_message or issubclass(field.unbound_field.field_class, fields.FieldList):
+        raise UncompilableFormError(f'List field "{name}" entries are not supported.')
+
+    # Entries are bound by the list field when the form is processed, so a detached one is validated the same way
+    entry = field.unbound_field.bind(form=None, name=name, _meta=field.meta)
+    return _get_value_loader(field_descriptor), _compile_field_validation(entry)
+
+
+def _compile_list_field(name, field, field_descriptor):
+    """Compile the list field to functions loading its data and getting errors of the data.
+
+    As the form does it, entries are validated first and only errors of invalid ones are kept.
+    """
+    if field.min_entries or field_descriptor is None or field_descriptor.label != FieldDescriptor.LABEL_REPEATED:
+        raise UncompilableFormError(f'List field "{name}" is not a list of repeated field items.')
+
+    load_entry, get_entry_errors = _compile_list_entry(name, field, field_descriptor)
+    get_list_errors = _compile_list_validation(field)
+
+    def load_list_field(pb):
+        if pb is None:
+            return []
+        return [load_entry(item) for item in getattr(pb, name)]
+
+    def get_errors(data):
+        errors = []
+        for entry_data in data:
+            entry_errors = get_entry_errors(entry_data)
+            if entry_errors:
+                errors.append(entry_errors)
+
+        errors.extend(get_list_errors(len(data)))
+        return errors
+
+    return load_list_field, get_errors
+
+
+def _compile_field(name, field, field_descriptor):
+    """Compile the form field to functions loading its data from the message and getting errors of the data.
+
+    Message is None if it is not set, so the form loads default data to its fields.
+    """
+    if isinstance(field, fields.FieldList):
+        return _compile_list_field(name, field, field_descriptor)
+
+    if isinstance(field, fields.FormField):
+        if field_descriptor is None:
+            nested_validator = CompiledProtoValidator(field.form_class, descriptor=None)
+        elif field_descriptor.type == FieldDescriptor.TYPE_MESSAGE \
+                and field_descriptor.label != FieldDescriptor.LABEL_REPEATED:
+            nested_validator = CompiledProtoValidator(field.form_class, descriptor=field_descriptor.message_type)
+        else:
+            raise UncompilableFormError(f'Field "{field_descriptor.full_name}" is not a message.')
+
+        def load_form_field(pb):
+            if pb is None or field_descriptor is None or not pb.HasField(name):
+                return nested_validator.load(None)
+            return nested_validator.load(getattr(pb, name))
+
+        return load_form_field, nested_validator.get_errors
+
+    get_errors = _compile_field_validation(field)
+    default = field.data
+
+    if field_descriptor is None:
+        return lambda pb: default, get_errors
+
+    if field_descriptor.label == FieldDescriptor.LABEL_REPEATED:
+        raise UncompilableFormError(f'Repeated field "{field_descriptor.full_name}" is not supported.')
+
+    load_value = _get_value_loader(field_descriptor)
+
+    if field_descriptor.containing_oneof is not None:
+        def load_oneof_field(pb):
+            if pb is None or not pb.HasField(name):
+                return default
+            return load_value(getattr(pb, name))
+
+        return load_oneof_field, get_errors
+
+    def load_field(pb):
+        if pb is None:
+            return default
+        return load_value(getattr(pb, name))
+
+    return load_field, get_errors
+
+
+def _is_loaded_by_default(field_descriptor):
+    # `MessageToDict` includes default values of these fields if they are not set
+    return field_descriptor.containing_oneof is None and (
+        field_descriptor.label == FieldDescriptor.LABEL_REPEATED
+        or field_descriptor.type != FieldDescriptor.TYPE_MESSAGE
+    )
+
+
+class CompiledProtoValidator:
+    """Validator of messages of a protobuf descriptor compiled from a form.
+
+    Nested validators are compiled for `FormField`s, `descriptor` is None if
+    the form describes a message field that is not presented in the parent message.
+    """
+
+    def __init__(self, form_class, descriptor, is_nested=True):
+        if form_class.validate is not ProtoForm.validate:
+            raise UncompilableFormError(f'Form {form_class.__name__} overrides `validate`, '
+                                        'errors should be post-processed in `clean_errors`.')
+
+        form = form_class()
+        self._clean_errors = form_class.clean_errors
+        self._fields = []
+
+        for name, field in form._fields.items():
+            if name in FORM_ARGUMENTS or hasattr(form_class, f'validate_{name}') or field.filters:
+                raise UncompilableFormError(f'Field "{name}" of form {form_class.__name__} is not supported.')
+
+            # Nested forms get their data as an object, so dictionary attributes are loaded to fields named so
+            if is_nested and hasattr(dict, name):
+                raise UncompilableFormError(f'Field "{name}" of form {form_class.__name__} is not supported.')
+
+            field_descriptor = descriptor and descriptor.fields_by_name.get(name)
+            self._fields.append((name, *_compile_field(name, field, field_descriptor)))
+
+        # Loaded keys, that are not fields of the form, make it invalid
+        self._wrong_fields = []
+        if not is_nested and descriptor is not None:
+            for field_descriptor in descriptor.fields:
+                if field_descriptor.name in form._fields:
+                    continue
+
+                if field_descriptor.name in FORM_ARGUMENTS or hasattr(form, field_descriptor.name):
+                    raise UncompilableFormError(f'Field "{field_descriptor.full_name}" could not be loaded '
+                                                f'to form {form_class.__name__}.')
+
+                self._wrong_fields.append((field_descriptor.name, _is_loaded_by_default(field_descriptor)))
+
+    def validate(self, pb):
+        """Validate the message, get dictionary of errors, which is empty if the message is valid.
+        """
+        if self._wrong_fields:
+            wrong_fields = {
+                name for name, is_loaded_by_default in self._wrong_fields if is_loaded_by_default or pb.HasField(name)
+            }
+            if wrong_fields:
+                return {'error': [f"Wrong params keys: {list(wrong_fields)}"]}
+
+        return self.get_errors(self.load(pb))
+
+    def load(self, pb):
+        """Load data of the form fields from the message, as the form is loaded before it is validated.
+        """
+        return [load_field(pb) for _, load_field, _ in self._fields]
+
+    def get_errors(self, data):
+        errors = {}
+
+        for (name, _, get_field_errors), field_data in zip(self._fields, data):
+            field_errors = get_field_errors(field_data)
+            if field_errors:
+                errors[name] = field_errors
+
+        self._clean_errors(errors)
+        return errors
+
+
+class FormProtoValidator:
+    """Validator of protobuf messages with the form, used if the form could not be compiled.
+    """
+
+    def __init__(self, form_class):
+        self._form_class = form_class
+
+    def validate(self, pb):
+        form = self._form_class.load_proto(pb)
+        form.validate()
+        return form.errors
+
+
+@lru_cache(maxsize=None)
+def get_proto_validator(form_class, pb_class):
+    """Get validator of messages of the protobuf class compiled from the form.
+
+    Validator has `validate(pb)` method returning dictionary of the form errors,
+    that is empty if the message is valid.
+    """
+    try:
+        return CompiledProtoValidator(form_class, descriptor=pb_class.DESCRIPTOR, is_nested=False)
+    except UncompilableFormError as error:
+        logger.warning(f'Form {form_class.__name__} is not compiled for {pb_class.__name__}: {error}')
+        return FormProtoValidator(form_class)
@@ -4,6 +4,8 @@ from remme.protos.pub_key_pb2 import NewPubKeyPayload
 from .base import ProtoForm
 from ._fields import AddressField
 
+PUB_KEY_STORE_BATCH_MAX_KEYS = 50
+
 
 class RSAConfigurationForm(ProtoForm):
     key = fields.StringField(validators=[validators.DataRequired()])
@@ -32,28 +34,22 @@ class NewPublicKeyPayloadForm(ProtoForm):
     ecdsa = fields.FormField(ECDSAConfigurationForm)
     ed25519 = fields.FormField(Ed25519ConfigurationForm)
 
-    def validate(self):
-        is_valid = super().validate()
+    @staticmethod
+    def clean_errors(errors):
         pt_error_keys = ['rsa', 'ecdsa', 'ed25519']
-        if all((ek in self.errors for ek in pt_error_keys)):
+        if all((ek in errors for ek in pt_error_keys)):
             msg = ['At least one of RSAConfiguration, ECDSAConfiguration or '
                    'Ed25519Configuration must be set']
-            self._errors['configuration'] = msg
+            errors['configuration'] = msg
             for cfg in pt_error_keys:
-                del self._errors[cfg]
-            is_valid = False
+                del errors[cfg]
         else:
             for ek in pt_error_keys:
-                if ek not in self.errors:
-                    cp_errs = pt_error_keys[:]
-                    cp_errs.remove(ek)
-                    for cfg in cp_errs:
-                        del self._errors[cfg]
-                    if not self._errors:
-                        is_valid = True
+                if ek not in errors:
+                    for cfg in pt_error_keys:
+                        if cfg != ek:
+                            errors.pop(cfg, None)
                     break
-            
-        return is_valid
 
 
 class NewPubKeyStoreAndPayPayloadForm(ProtoForm):
@@ -63,5 +59,14 @@ class NewPubKeyStoreAndPayPayloadForm(ProtoForm):
     signature_by_owner = fields.StringField(validators=[validators.DataRequired()])
 
 
+class NewPubKeyBatchPayloadForm(ProtoForm):
+    pub_keys = fields.FieldList(fields.FormField(NewPublicKeyPayloadForm), validators=[
+        validators.Length(
+            min=1, max=PUB_KEY_STORE_BATCH_MAX_KEYS,
+            message='Number of public keys should be from %(min)d to %(max)d.',
+        ),
+    ])
+
+
 class RevokePubKeyPayloadForm(ProtoForm):
     address = AddressField()
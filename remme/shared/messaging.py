@@ -22,6 +22,13 @@ import aiozmq
 from aiozmq.stream import ZmqStream
 
 from google.protobuf.message import DecodeError
+from sawtooth_sdk.protobuf.client_event_pb2 import (
+    ClientEventsSubscribeRequest,
+    ClientEventsSubscribeResponse,
+    ClientEventsUnsubscribeRequest,
+    ClientEventsUnsubscribeResponse,
+)
+from sawtooth_sdk.protobuf.events_pb2 import EventList, EventSubscription
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 
 
@@ -303,3 +310,271 @@ class Connection:
         self._receiver.cancel()
         self._socket.close()
         self._msg_router.fail_all(DisconnectError())
+
+
+class ConnectionPool:
+    """A fixed set of connections to the validator shared by many clients.
+
+    Requests of clients are multiplexed over the connection with the fewest
+    replies in flight, replies are routed back by their correlation ids.
+    Events are received over the first connection subscribed to event types
+    of all clients, and demultiplexed to the clients subscribed to them.
+    """
+
+    def __init__(self, url, size=4, *, loop=None):
+        self._url = url
+        self._loop = loop or asyncio.get_event_loop()
+        self._connections = [Connection(url, loop=self._loop) for _ in range(size)]
+        self._in_flight = [0] * size
+
+        self._subscribers = {}
+        self._subscribed_event_types = frozenset()
+        self._subscribe_lock = asyncio.Lock()
+
+        self._open_task = None
+        self._dispatch_task = None
+
+    @property
+    def url(self):
+        return self._url
+
+    @property
+    def loop(self):
+        return self._loop
+
+    @property
+    def has_transport(self):
+        return all(connection.has_transport for connection in self._connections)
+
+    @property
+    def in_flight(self):
+        """Numbers of replies awaited over each connection of the pool.
+        """
+        return list(self._in_flight)
+
+    @property
+    def subscribers_count(self):
+        return len(self._subscribers)
+
+    async def open(self):
+        """Opens connections of the pool, if they are not opened yet.
+        """
+        if self._open_task is None:
+            self._open_task = asyncio.ensure_future(self._open(), loop=self._loop)
+        await self._open_task
+
+    async def _open(self):
+        for connection in self._connections:
+            await connection.open()
+
+        self._dispatch_task = asyncio.ensure_future(self._dispatch_events(), loop=self._loop)
+
+    def connect(self):
+        """Returns a connection of a single client over the pool.
+        """
+        return PooledConnection(self)
+
+    async def send(self, message_type, message_content, timeout=None):
+        """Sends a message over the least loaded connection and returns the reply.
+        """
+        index = self._in_flight.index(min(self._in_flight))
+
+        self._in_flight[index] += 1
+        try:
+            return await self._connections[index].send(message_type, message_content, timeout=timeout)
+        finally:
+            self._in_flight[index] -= 1
+
+    async def subscribe(self, subscriber, event_types, timeout=None):
+        """Subscribes the client to sawtooth event types and returns the subscribe response.
+
+        Validator is asked to send events only if some of the types are not sent yet.
+        """
+        async with self._subscribe_lock:
+            subscribed_event_types = self._subscribed_event_types | event_types
+
+            if subscribed_event_types != self._subscribed_event_types:
+                request = ClientEventsSubscribeRequest(subscriptions=[
+                    EventSubscription(event_type=event_type) for event_type in sorted(subscribed_event_types)
+                ])
+                reply = await self._send_events_request(
+                    Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, request.SerializeToString(), timeout,
+                )
+
+                if reply.message_type != Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE:
+                    return reply
+
+                response = ClientEventsSubscribeResponse()
+                response.ParseFromString(reply.content)
+
+                if response.status != ClientEventsSubscribeResponse.OK:
+                    return reply
+
+                self._subscribed_event_types = subscribed_event_types
+
+            self._subscribers[subscriber] = event_types
+
+        return _create_reply(
+            Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE,
+            ClientEventsSubscribeResponse(status=ClientEventsSubscribeResponse.OK),
+        )
+
+    def unsubscribe(self, subscriber):
+        """Stops demultiplexing events to the client.
+
+        Validator keeps sending events of the types while the pool has subscribers.
+        """
+        self._subscribers.pop(subscriber, None)
+
+        if not self._subscribers and self._subscribed_event_types:
+            asyncio.ensure_future(self._unsubscribe_events(), loop=self._loop)
+
+    async def _unsubscribe_events(self):
+        async with self._subscribe_lock:
+            if self._subscribers or not self._subscribed_event_types:
+                return
+
+            try:
+                await self._send_events_request(
+                    Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST, ClientEventsUnsubscribeRequest().SerializeToString(),
+                )
+            except (asyncio.TimeoutError, DisconnectError, SendBackoffTimeoutError) as error:
+                LOGGER.warning('Unable to unsubscribe from events: %s', error)
+                return
+
+            self._subscribed_event_types = frozenset()
+
+    async def _send_events_request(self, message_type, message_content, timeout=None):
+        self._in_flight[0] += 1
+        try:
+            return await self._connections[0].send(message_type, message_content, timeout=timeout)
+        finally:
+            self._in_flight[0] -= 1
+
+    async def _dispatch_events(self):
+        """Routes events received over the first connection to the subscribed clients.
+
+        Uncorrelated messages of other types (e.g. replies received after timeouts) are dropped.
+        """
+        while True:
+            msg = await self._connections[0].receive()
+
+            if msg.message_type != Message.CLIENT_EVENTS:
+                LOGGER.debug('Skip unexpected msg type %s', msg.message_type)
+                continue
+
+            events = EventList()
+            try:
+                events.ParseFromString(msg.content)
+            except DecodeError as e:
+                LOGGER.warning('Unable to decode: %s', e)
+                continue
+
+            event_types = {event.event_type for event in events.events}
+
+            for subscriber, subscribed_event_types in list(self._subscribers.items()):
+                if event_types & subscribed_event_types:
+                    await subscriber.route_msg(msg)
+
+    def close(self):
+        """Closes connections of the pool.
+        """
+        if self._dispatch_task:
+            self._dispatch_task.cancel()
+
+        for connection in self._connections:
+            connection.close()
+
+
+class PooledConnection:
+    """A connection of a single client over the connection pool.
+
+    It has the interface of `Connection`, but its requests are sent over the
+    pool, and its incoming queue gets events the client subscribed to.
+    Subscriptions, that catch up since a known block, are made over a
+    connection of the client itself, as other clients must not receive events
+    of the past blocks.
+    """
+
+    def __init__(self, pool):
+        self._pool = pool
+        self._msg_router = _MessageRouter()
+
+        self._events_connection = None
+        self._events_task = None
+
+    @property
+    def has_transport(self):
+        return self._pool.has_transport
+
+    async def open(self):
+        await self._pool.open()
+
+    async def send(self, message_type, message_content, timeout=None):
+        """Sends a message and returns a future for the response.
+        """
+        if message_type == Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST:
+            request = ClientEventsSubscribeRequest()
+            request.ParseFromString(message_content)
+
+            if not request.last_known_block_ids and self._events_connection is None:
+                return await self._pool.subscribe(self, frozenset(
+                    subscription.event_type for subscription in request.subscriptions
+                ), timeout=timeout)
+
+            self._pool.unsubscribe(self)
+            await self._open_events_connection()
+
+        if message_type == Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST and self._events_connection is None:
+            self._pool.unsubscribe(self)
+            return _create_reply(
+                Message.CLIENT_EVENTS_UNSUBSCRIBE_RESPONSE,
+                ClientEventsUnsubscribeResponse(status=ClientEventsUnsubscribeResponse.OK),
+            )
+
+        if message_type in (Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST):
+            return await self._events_connection.send(message_type, message_content, timeout=timeout)
+
+        return await self._pool.send(message_type, message_content, timeout=timeout)
+
+    async def _open_events_connection(self):
+        if self._events_connection is not None:
+            return
+
+        self._events_connection = Connection(self._pool.url, loop=self._pool.loop)
+        await self._events_connection.open()
+        self._events_task = asyncio.ensure_future(self._forward_events(), loop=self._pool.loop)
+
+    async def _forward_events(self):
+        while True:
+            await self.route_msg(await self._events_connection.receive())
+
+    async def receive(self):
+        """Returns a future for an incoming message.
+        """
+        return await self._msg_router.incoming()
+
+    async def route_msg(self, msg):
+        return await self._msg_router.route_msg(msg)
+
+    def receive_nowait(self):
+        return self._msg_router.incoming_nowait()
+
+    def close(self):
+        """Closes the client connection, the pool is kept open.
+        """
+        self._pool.unsubscribe(self)
+
+        if self._events_task:
+            self._events_task.cancel()
+        if self._events_connection:
+            self._events_connection.close()
+
+        self._msg_router.fail_all(DisconnectError())
+
+
+def _create_reply(message_type, response):
+    return Message(
+        correlation_id=uuid.uuid4().hex,
+        content=response.SerializeToString(),
+        message_type=message_type)
@@ -17,20 +17,216 @@
 
 This module contains wrappers around metrics system to make metrics collection
 easy to use. The metric collection mechanism is based on InfluxDB.
+
+Metrics are not written on the caller thread: data points are put to a bounded
+queue and written by a background thread in batches using line protocol.
+
+Time measurements are aggregated in memory into histograms, a single summary
+point per metric is written every flush interval.
 """
 
+import atexit
 import logging
+import math
 import platform
+import queue
+import threading
 from requests.exceptions import ConnectionError
-from concurrent.futures import ThreadPoolExecutor
 import time
-from datetime import datetime
 from influxdb import InfluxDBClient
 from influxdb.exceptions import InfluxDBClientError, InfluxDBServerError
 from remme.settings.default import load_toml_with_defaults
 
 LOGGER = logging.getLogger(__name__)
 
+_STOP = object()
+
+
+def _escape_key(value):
+    return str(value).replace(',', r'\,').replace('=', r'\=').replace(' ', r'\ ')
+
+
+def _escape_field_value(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return f'{value}i'
+    if isinstance(value, float):
+        return repr(value)
+
+    escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def to_line_protocol(measurement, tags, fields, timestamp):
+    """Format a data point using InfluxDB line protocol.
+
+    :param measurement: The name of the measurement.
+    :param tags: The dict of tags of the point.
+    :param fields: The dict of field values of the point.
+    :param timestamp: Time of the point in nanoseconds.
+    """
+    measurement = str(measurement).replace(',', r'\,').replace(' ', r'\ ')
+    tags = ''.join(f',{_escape_key(k)}={_escape_key(v)}' for k, v in sorted(tags.items()))
+    fields = ','.join(f'{_escape_key(k)}={_escape_field_value(v)}' for k, v in fields.items())
+    return f'{measurement}{tags} {fields} {timestamp}'
+
+
+class _BatchingSink:
+    """Background writer of line protocol data points.
+
+    Points are put to a bounded queue without blocking, and written by a
+    daemon thread when `batch_size` points are collected or `flush_interval`
+    seconds passed since the previous write. Points that do not fit into the
+    queue are dropped and counted.
+    """
+    def __init__(self, write, batch_size=1000, flush_interval=5,
+                 queue_size=10000, collect=None):
+        """Initialize the sink. The thread is started on `start()` call.
+
+        :param write: Callable, that writes a list of line protocol strings.
+        :param batch_size: Maximum number of points written at once.
+        :param flush_interval: Maximum number of seconds a point waits for write.
+        :param queue_size: Maximum number of points waiting for write.
+        :param collect: Optional. Callable returning a list of line protocol
+            strings aggregated since its previous call, called every flush
+            interval and on stop.
+        """
+        self._write = write
+        self._collect = collect
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._dropped = 0
+        self._thread = None
+
+    @property
+    def dropped(self):
+        """Number of points dropped because the queue was full.
+        """
+        return self._dropped
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name='metrics-sink', daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Write queued points and stop the thread.
+        """
+        if self._thread is None:
+            return
+
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def put(self, line):
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self._dropped += 1
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self._flush_interval
+
+        while True:
+            try:
+                line = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                line = None
+
+            if line is not None and line is not _STOP:
+                batch.append(line)
+
+            is_deadline = time.monotonic() >= deadline
+            if self._collect is not None and (line is _STOP or is_deadline):
+                batch.extend(self._collect())
+
+            if line is _STOP or len(batch) >= self._batch_size or is_deadline:
+                if batch:
+                    self._flush(batch)
+                    batch = []
+                deadline = time.monotonic() + self._flush_interval
+
+            if line is _STOP:
+                return
+
+    def _flush(self, batch):
+        try:
+            self._write(batch)
+        except Exception as e:
+            LOGGER.error(f'Failed to write {len(batch)} metrics points: {e}')
+
+
+class _Histogram:
+    """Histogram of non-negative values with logarithmic buckets.
+
+    Like HDR histograms, values are counted in buckets which bounds grow
+    exponentially, so percentiles are estimated with a relative error of
+    `precision` and memory does not depend on the number of values.
+    """
+    def __init__(self, precision=0.01):
+        self._log_base = math.log1p(precision)
+        self._buckets = {}
+        self._zeros = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if value <= 0:
+            self._zeros += 1
+            return
+
+        index = math.floor(math.log(value) / self._log_base)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+
+    def percentile(self, percent):
+        """Estimate the value, which is greater than or equal to `percent`
+        percents of recorded values.
+        """
+        if not self.count:
+            return None
+
+        rank = max(math.ceil(percent / 100 * self.count), 1)
+        if rank <= self._zeros:
+            return 0.0
+
+        seen = self._zeros
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                value = math.exp((index + 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    def summary(self, percentiles):
+        """Get count, sum, min, max, mean and `percentiles` of recorded values.
+        """
+        summary = {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.sum / self.count,
+        }
+        for percent in percentiles:
+            summary[f'p{percent}'] = self.percentile(percent)
+        return summary
+
 
 class _TimeMeasurement:
     """The class used to measure times and send the metric to the collector.
@@ -57,24 +253,23 @@ class _TimeMeasurement:
         self._start_time = time.time()
 
     def done(self, noblock=False):
-        """Sends the time metric to the collector.
+        """Records the measured time to the metric histogram of the collector.
 
-        The metric format is
+        The histogram summary is sent every flush interval, its format is
             {
-                'execution_time': stop_time - self._start_time
+                'count': ..., 'sum': ..., 'min': ..., 'max': ..., 'mean': ...,
+                'p50': ..., 'p90': ..., 'p99': ...
             }
+        with percentiles set in the configuration.
 
-        :param noblock: Optional. When set to `True` the call is non-blocking.
+        :param noblock: Optional. Kept for compatibility, the call never blocks.
         """
         if self._done:
             return
 
         stop_time = time.time()
         self._done = True
-        values = {
-            'execution_time': stop_time - self._start_time
-        }
-        self._metrics_sender.send_metric(self._metric, values, noblock)
+        self._metrics_sender.record_time(self._metric, stop_time - self._start_time)
 
 
 class MetricsSender:
@@ -83,7 +278,8 @@ class MetricsSender:
     This class performs the majority of routine related to metrics, such as
     connecting to InfluxDB and constructing requests.
     """
-    def __init__(self, address, port, user, password, db):
+    def __init__(self, address, port, user, password, db, batch_size=1000,
+                 flush_interval=5, queue_size=10000, percentiles=(50, 90, 99)):
         """Initialize metrics collection.
 
         This wrapper tests the connection at the time of initialization. If the
@@ -98,9 +294,22 @@ class MetricsSender:
         :param user: InfluxDB user name.
         :param password: InfluxDB user password.
         :param db: The name of the database for metrics.
+        :param batch_size: Optional. Maximum number of points written at once.
+        :param flush_interval: Optional. Maximum number of seconds a point
+            waits for write.
+        :param queue_size: Optional. Maximum number of points waiting for write,
+            further points are dropped.
+        :param percentiles: Optional. Percentiles of time measurements sent.
         """
         self._influxdb_client = InfluxDBClient(address, port, user, password)
-        self._thread_pool = ThreadPoolExecutor()
+        self._sink = _BatchingSink(
+            self._write_lines, batch_size, flush_interval, queue_size,
+            collect=self._collect_summaries,
+        )
+        self._tags = {'hostname': platform.node()}
+        self._percentiles = tuple(percentiles)
+        self._histograms = {}
+        self._histograms_lock = threading.Lock()
         self._ready = False
 
         try:
@@ -124,17 +333,32 @@ class MetricsSender:
             return
 
         self._influxdb_client.switch_database(db)
+        self._sink.start()
+        atexit.register(self.close)
         self._ready = True
 
-    def send_metric(self, metric, values, noblock=False):
+    @property
+    def dropped_points(self):
+        """Number of points dropped because the sending queue was full.
+        """
+        return self._sink.dropped
+
+    def add_tags(self, **tags):
+        """Add tags to all points sent afterwards, e.g. to tell worker processes apart.
+        """
+        self._tags.update(tags)
+
+    def send_metric(self, metric, values, noblock=False, tags=None):
         """Send metrics to the database.
 
         If the connection initialization was not successful, this method will do
-        nothing.
+        nothing. The point is queued and written in background.
 
         :param metric: The name of the metric (will be prefixed with "remme").
         :param values: The dict of values for the metric.
-        :param noblock: Optional. When set to `True` the call is non-blocking.
+        :param noblock: Optional. Kept for compatibility, the call never blocks.
+        :param tags: Optional. The dict of tags of the point in addition to
+            the hostname.
 
         :Example:
 
@@ -151,27 +375,60 @@ class MetricsSender:
             raise ValueError(f'Values should be in a dict, got type '
                              f'{type(values)}.')
 
-        data_point = {
-            'measurement': f'remme.{metric}',
-            'tags': {
-                'hostname': platform.node()
-            },
-            'time': datetime.now().strftime('%Y-%m-%dT%H:%M:%SZ'),
-            'fields': values
-        }
+        self._sink.put(to_line_protocol(
+            f'remme.{metric}',
+            {**self._tags, **(tags or {})},
+            values,
+            int(time.time() * 10 ** 9),
+        ))
+
+    def record_time(self, metric, execution_time):
+        """Record execution time to the histogram of the metric.
+
+        If the connection initialization was not successful, this method will do
+        nothing.
+
+        :param metric: The name of the metric (will be prefixed with "remme").
+        :param execution_time: Execution time in seconds.
+        """
+        if not self._ready:
+            return
 
-        if noblock:
-            self._thread_pool.submit(self._write_point, data_point)
-        else:
-            self._write_point(data_point)
+        with self._histograms_lock:
+            histogram = self._histograms.get(metric)
+            if histogram is None:
+                histogram = self._histograms[metric] = _Histogram()
+            histogram.record(execution_time)
 
-    def _write_point(self, data_point):
+    def close(self):
+        """Write queued points and stop background writing.
+        """
+        self._sink.stop()
+
+    def _collect_summaries(self):
+        with self._histograms_lock:
+            histograms, self._histograms = self._histograms, {}
+
+        timestamp = int(time.time() * 10 ** 9)
+        return [
+            to_line_protocol(
+                f'remme.{metric}',
+                self._tags,
+                histogram.summary(self._percentiles),
+                timestamp,
+            )
+            for metric, histogram in histograms.items()
+        ]
+
+    def _write_lines(self, lines):
         try:
-            self._influxdb_client.write_points([data_point])
+            self._influxdb_client.write_points(lines, protocol='line')
         except InfluxDBClientError:
             LOGGER.error(f'Failed to send metrics because of a client error.')
         except InfluxDBServerError:
             LOGGER.error(f'Failed to send metrics because of a server error.')
+        except ConnectionError:
+            LOGGER.error(f'Failed to send metrics because of a connection error.')
 
     def get_time_measurement(self, metric):
         """Used to measure execution times of different procedures.
@@ -184,7 +441,7 @@ class MetricsSender:
         >>> metrics_sender = MetricsSender("localhost", 8086, "user", "password", "db")
         >>> measurement = metrics_sender.get_time_measurement("processing_time")
         >>> # do some work...
-        >>> # this will measure the time from `measurement` init and send the metric
+        >>> # this will measure the time from `measurement` init and record the metric
         >>> measurement.done()
         """
         return _TimeMeasurement(self, metric)
@@ -197,7 +454,11 @@ METRICS_SENDER = MetricsSender(
     config['influxdb_port'],
     config['influxdb_user'],
     config['influxdb_password'],
-    config['influxdb_database']
+    config['influxdb_database'],
+    batch_size=config['batch_size'],
+    flush_interval=config['flush_interval'],
+    queue_size=config['queue_size'],
+    percentiles=config['percentiles'],
 )
 """Global MetricsSender instance initialized from the configuration file.
 """
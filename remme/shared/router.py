@@ -13,8 +13,11 @@
 # limitations under the License.
 # ------------------------------------------------------------------------
 
+import time
+import json
 import logging
 import asyncio
+from collections import OrderedDict
 from contextlib import suppress
 
 from google.protobuf.message import DecodeError
@@ -22,6 +25,11 @@ from sawtooth_sdk.messaging.future import FutureTimeoutError
 from sawtooth_sdk.messaging.exceptions import ValidatorConnectionError
 
 from sawtooth_sdk.protobuf.client_list_control_pb2 import ClientPagingControls
+from sawtooth_sdk.protobuf.client_event_pb2 import (
+    ClientEventsSubscribeRequest, ClientEventsSubscribeResponse,
+)
+from sawtooth_sdk.protobuf.events_pb2 import EventFilter, EventList, EventSubscription
+from sawtooth_sdk.protobuf.transaction_receipt_pb2 import StateChangeList
 from sawtooth_sdk.protobuf.client_state_pb2 import (
     ClientStateGetRequest, ClientStateGetResponse,
     ClientStateListRequest, ClientStateListResponse,
@@ -52,10 +60,16 @@ from sawtooth_sdk.protobuf.client_block_pb2 import (
     ClientBlockGetByIdRequest, ClientBlockGetResponse,
     ClientBlockListRequest, ClientBlockListResponse,
 )
+from sawtooth_sdk.protobuf.block_pb2 import BlockHeader
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 from sawtooth_sdk.protobuf.validator_pb2 import Message
 
-from remme.settings import ZMQ_CONNECTION_TIMEOUT
+from remme.settings import (
+    ZMQ_CONNECTION_TIMEOUT, CHAIN_HEAD_TTL_SEC, STATE_CACHE_MEMORY_BUDGET,
+)
+from remme.shared.constants import Events
 from remme.shared.utils import (
+    LRUCache,
     get_paging_controls,
     get_head_id,
     get_filter_ids,
@@ -65,6 +79,9 @@ from remme.shared.utils import (
     expand_block,
     expand_transaction,
     validate_id,
+    parse_header_proto,
+    resource_to_json,
+    resources_to_json,
     drop_empty_props,
     drop_id_prefixes,
     message_to_dict,
@@ -76,13 +93,373 @@ from remme.shared.exceptions import (
 
 LOGGER = logging.getLogger(__name__)
 
+# Number of seconds to wait before subscribing to block commits again after a failure
+RESUBSCRIBE_INTERVAL_SEC = 10
+# Number of seconds without block commits, after which the committed chain head is checked by a request
+COMMITTED_HEAD_STALENESS_SEC = 30
+
+# Approximate number of bytes a state cache entry takes besides its value
+STATE_CACHE_ENTRY_OVERHEAD = 256
+# Number of the last committed blocks, which state deltas are kept by the state cache
+STATE_CACHE_DELTAS_DEPTH = 32
+
+_MISSING = object()
+
+
+class StateCache:
+    """LRU cache of state values keyed by state roots and addresses.
+
+    State under a root never changes, so entries are valid until they are
+    evicted to keep cached values within `memory_budget` bytes. A value of
+    an address under `address_prefixes` missing under a committed root is
+    taken from the entry of a preceding root, if state deltas of the blocks
+    between them do not change the address.
+    """
+    _instance = None
+
+    def __init__(self, memory_budget=STATE_CACHE_MEMORY_BUDGET, address_prefixes=()):
+        self._address_prefixes = tuple(address_prefixes)
+        self._entries = LRUCache(maxsize=memory_budget)
+
+        # Deltas of the last committed blocks, the oldest ones are evicted first whatever is read
+        self._block_roots = OrderedDict()
+        self._root_deltas = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def get_single_cache(cls, head_tracker, address_prefixes=()):
+        """Get cache of the single connection fed with block commits and state deltas
+        of addresses under `address_prefixes` of its head tracker.
+        """
+        if cls._instance is None:
+            cls._instance = cls(address_prefixes=address_prefixes)
+            head_tracker.add_commit_listener(cls._instance.add_block_commit, address_prefixes)
+        return cls._instance
+
+    @classmethod
+    def get_single_cache_stats(cls):
+        """Get statistics of the single connection cache, None if it is not created yet.
+        """
+        return cls._instance and cls._instance.stats
+
+    @property
+    def stats(self):
+        lookups = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+            'entries': len(self._entries),
+            'memory': self._entries.info().currsize,
+        }
+
+    def get(self, state_root, address, default=_MISSING):
+        """Get value of the address under the state root, None if the address has no value.
+        """
+        value = self._lookup(state_root, address)
+
+        if value is _MISSING:
+            self._misses += 1
+            return default
+
+        self._hits += 1
+        return value
+
+    def _lookup(self, state_root, address):
+        value = self._entries.get((state_root, address), _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # Changes of other addresses are not in state deltas
+        if not address.startswith(self._address_prefixes):
+            return _MISSING
+
+        root = state_root
+        for _ in range(len(self._root_deltas)):
+            delta = self._root_deltas.get(root)
+            if delta is None:
+                break
+
+            root, changed_addresses = delta
+            if address in changed_addresses:
+                break
+
+            value = self._entries.get((root, address), _MISSING)
+            if value is not _MISSING:
+                self.put(state_root, address, value)
+                return value
+
+        return _MISSING
+
+    def put(self, state_root, address, value):
+        self._entries.set(
+            (state_root, address), value,
+            size=STATE_CACHE_ENTRY_OVERHEAD + len(state_root) + len(address) + len(value or ''),
+        )
+
+    def add_block_commit(self, block_id, previous_block_id, state_root, changed_addresses):
+        """Keep addresses changed by the committed block to look up values of its parent state root.
+        """
+        self._block_roots[block_id] = state_root
+        while len(self._block_roots) > STATE_CACHE_DELTAS_DEPTH:
+            self._block_roots.popitem(last=False)
+
+        previous_state_root = self._block_roots.get(previous_block_id)
+        if previous_state_root is None or previous_state_root == state_root:
+            return
+
+        self._root_deltas[state_root] = (previous_state_root, frozenset(changed_addresses))
+        while len(self._root_deltas) > STATE_CACHE_DELTAS_DEPTH:
+            self._root_deltas.popitem(last=False)
+
+
+class ChainHeadTracker:
+    """Keeps identifier and state root of the chain head.
+
+    Tracker subscribed to block commits takes the head from their events.
+    Until the first event is received, or if the tracker is not subscribed,
+    the head is requested from the validator and reused for `ttl` seconds.
+    If no block is committed for `staleness` seconds, the head is requested
+    as well and the tracker subscribes again if the chain went further.
+    """
+    _instance = None
+
+    def __init__(self, stream, ttl=CHAIN_HEAD_TTL_SEC, subscribe=False, staleness=COMMITTED_HEAD_STALENESS_SEC):
+        self._stream = stream
+        self._ttl = ttl
+        self._subscribe = subscribe
+        self._staleness = staleness
+
+        self._head = None
+        self._head_requested_at = None
+        self._head_committed_at = None
+        self._head_request = None
+
+        self._tracking_task = None
+        self._is_tracking = False
+        self._subscribed_at = None
+        self._commit_listeners = []
+        self._state_delta_prefixes = []
+
+    @classmethod
+    def get_single_tracker(cls, stream):
+        """Get tracker subscribed to block commits over the single connection.
+        """
+        if cls._instance is None:
+            cls._instance = cls(stream, subscribe=True)
+        return cls._instance
+
+    @property
+    def is_tracking(self):
+        return self._is_tracking
+
+    def add_commit_listener(self, listener, address_prefixes=()):
+        """Add function called with identifiers of the committed block and its parent,
+        its state root and addresses under `address_prefixes` changed by it.
+
+        State deltas are subscribed to for addresses under prefixes of the listeners
+        only, so listeners are added before the tracker subscribes.
+        """
+        self._commit_listeners.append(listener)
+        self._state_delta_prefixes.extend(
+            prefix for prefix in address_prefixes if prefix not in self._state_delta_prefixes
+        )
+
+    async def get_head(self):
+        """Get identifier and state root of the chain head.
+        """
+        if self._subscribe:
+            self._ensure_tracking()
+
+        if self._is_head_committed() or self._is_head_requested_recently():
+            return self._head
+
+        # Concurrent callers share a single request
+        if self._head_request is None or self._head_request.done():
+            self._head_request = asyncio.ensure_future(self._request_head())
+
+        return await asyncio.shield(self._head_request)
+
+    def _is_head_committed(self):
+        # Head of the last block commit is current while commits are tracked and keep coming
+        return self._is_tracking and self._head_committed_at is not None \
+            and time.time() - self._head_committed_at < self._staleness
+
+    def _is_head_requested_recently(self):
+        return self._head_requested_at is not None and time.time() - self._head_requested_at < self._ttl
+
+    def set_head(self, head_id, state_root):
+        """Set the head committed to the chain, it is not expired anymore.
+        """
+        self._head = (head_id, state_root)
+        self._head_requested_at = None
+        self._head_committed_at = time.time()
+
+    async def _request_head(self):
+        msg = await self._stream.send(
+            message_type=Message.CLIENT_BLOCK_LIST_REQUEST,
+            message_content=ClientBlockListRequest(
+                paging=ClientPagingControls(limit=1),
+            ).SerializeToString(),
+            timeout=ZMQ_CONNECTION_TIMEOUT)
+
+        resp = ClientBlockListResponse()
+        resp.ParseFromString(msg.content)
+
+        if resp.status == ClientBlockListResponse.NOT_READY:
+            raise ValidatorNotReadyException('Validator is not ready yet')
+        elif resp.status != ClientBlockListResponse.OK or not resp.blocks:
+            raise ClientException('Error occured')
+
+        block = resp.blocks[0]
+        header = BlockHeader()
+        header.ParseFromString(block.header)
+
+        head = (block.header_signature, header.state_root_hash)
+
+        # Head of a block commit received during the request is newer
+        if self._is_head_committed():
+            return head
+
+        if self._is_tracking and self._head_committed_at is not None:
+            committed_head_id, _ = self._head
+
+            # Commits stopped while the chain went further, the validator has dropped the subscription
+            if committed_head_id != head[0]:
+                LOGGER.warning(f'No block commits received since {committed_head_id}, subscribing again')
+                self._resubscribe(last_known_block_id=committed_head_id)
+
+            # The chain has not gone further, the committed head is current
+            else:
+                self._head_committed_at = time.time()
+                return head
+
+        self._head = head
+        self._head_requested_at = time.time()
+        self._head_committed_at = None
+
+        return head
+
+    def _ensure_tracking(self):
+        if self._tracking_task is not None and not self._tracking_task.done():
+            return
+
+        if self._subscribed_at is not None and time.time() - self._subscribed_at < RESUBSCRIBE_INTERVAL_SEC:
+            return
+
+        self._subscribed_at = time.time()
+        self._tracking_task = asyncio.ensure_future(self._track())
+
+    def _resubscribe(self, last_known_block_id):
+        # Commits of blocks after the last known one are sent by the validator on subscription
+        self.close()
+        self._is_tracking = False
+
+        self._subscribed_at = time.time()
+        self._tracking_task = asyncio.ensure_future(self._track(last_known_block_ids=[last_known_block_id]))
+
+    async def _track(self, last_known_block_ids=()):
+        subscriptions = [EventSubscription(event_type=Events.SAWTOOTH_BLOCK_COMMIT.value)]
+
+        # Without filters the validator sends values of all state changes of every block
+        if self._state_delta_prefixes:
+            subscriptions.append(EventSubscription(event_type=Events.SAWTOOTH_STATE_DELTA.value, filters=[
+                EventFilter(
+                    key='address',
+                    match_string=f'^({"|".join(self._state_delta_prefixes)})',
+                    filter_type=EventFilter.REGEX_ANY,
+                ),
+            ]))
+
+        request = ClientEventsSubscribeRequest(
+            subscriptions=subscriptions, last_known_block_ids=last_known_block_ids,
+        )
+
+        try:
+            msg = await self._stream.send(
+                message_type=Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+                message_content=request.SerializeToString(),
+                timeout=ZMQ_CONNECTION_TIMEOUT)
+
+            response = ClientEventsSubscribeResponse()
+            response.ParseFromString(msg.content)
+        except asyncio.CancelledError:  # pylint: disable=try-except-raise
+            raise
+        except Exception as e:
+            LOGGER.warning(f'Unable to subscribe to block commits: {e}')
+            return
+
+        if msg.message_type != Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE \
+                or response.status != ClientEventsSubscribeResponse.OK:
+            LOGGER.warning(f'Unable to subscribe to block commits: {msg.message_type}')
+            return
+
+        self._is_tracking = True
+        try:
+            while True:
+                msg = await self._stream.receive()
+                if msg.message_type != Message.CLIENT_EVENTS:
+                    continue
+
+                events = EventList()
+                try:
+                    events.ParseFromString(msg.content)
+                except DecodeError as e:
+                    LOGGER.warning(f'Unable to decode: {e}')
+                    continue
+
+                self._process_events(events)
+        finally:
+            self._is_tracking = False
+
+    def _process_events(self, events):
+        """Process events of a committed block, the state delta is sent along with the block commit.
+        """
+        block_commit = None
+        changed_addresses = set()
+
+        for event in events.events:
+            if event.event_type == Events.SAWTOOTH_BLOCK_COMMIT.value:
+                block_commit = {attribute.key: attribute.value for attribute in event.attributes}
+
+            elif event.event_type == Events.SAWTOOTH_STATE_DELTA.value:
+                state_changes = StateChangeList()
+                state_changes.ParseFromString(event.data)
+                changed_addresses.update(state_change.address for state_change in state_changes.state_changes)
+
+        if block_commit is None:
+            return
+
+        self.set_head(block_commit['block_id'], block_commit['state_root_hash'])
+
+        for listener in self._commit_listeners:
+            listener(
+                block_commit['block_id'],
+                block_commit.get('previous_block_id'),
+                block_commit['state_root_hash'],
+                changed_addresses,
+            )
+
+    def close(self):
+        if self._tracking_task is not None:
+            self._tracking_task.cancel()
+
 
 class Router:
 
-    def __init__(self, stream):
+    def __init__(self, stream, head_tracker=None, state_cache=None):
         self._stream = stream
+        self._head_tracker = head_tracker or ChainHeadTracker(stream)
+        self._state_cache = state_cache
 
     async def _handle_response(self, msg_type, resp_proto, req):
+        data = message_to_dict(await self._send_request(msg_type, resp_proto, req))
+        LOGGER.debug('The response parsed data: %s', data)
+        return data
+
+    async def _send_request(self, msg_type, resp_proto, req):
         try:
             msg = await self._stream.send(
                 message_type=msg_type,
@@ -102,10 +479,7 @@ class Router:
             LOGGER.exception(e)
             raise ClientException('Unexpected validator error')
 
-        data = message_to_dict(resp)
-
         with suppress(AttributeError):
-            LOGGER.debug(f'The response parsed data: {data}')
             if resp.status == resp_proto.NO_RESOURCE:
                 raise KeyNotFound('Resource not found')
             elif resp.status == resp_proto.NOT_READY:
@@ -113,7 +487,7 @@ class Router:
             elif resp.status != resp_proto.OK:
                 raise ClientException('Error occured')
 
-        return data
+        return resp
 
     @classmethod
     def _get_metadata(cls, response, head=None):
@@ -150,6 +524,36 @@ class Router:
                 'paging': paging
             })
 
+    @staticmethod
+    def _wrap_json_response(data, metadata=None):
+        """Wrap JSON encoded data to JSON of the envelope `_wrap_response` builds.
+        """
+        if not metadata:
+            return f'{{"data": {data}}}'
+
+        return f'{json.dumps(metadata)[:-1]}, "data": {data}}}'
+
+    @classmethod
+    def _wrap_paginated_json_response(cls, response, controls, data):
+        return cls._wrap_json_response(
+            data=resources_to_json(data),
+            metadata={
+                'head': response.head_id,
+                'paging': {
+                    'limit': controls.get('limit'),
+                    'start': controls.get('start'),
+                    'next': response.paging.next,
+                },
+            })
+
+    @classmethod
+    def _wrap_single_json_response(cls, response, resource):
+        metadata = {}
+        if getattr(response, 'head_id', None):
+            metadata['head'] = response.head_id
+
+        return cls._wrap_json_response(data=resource_to_json(resource), metadata=metadata)
+
     async def _head_to_root(self, block_id):
         if block_id:
             resp = await self._handle_response(
@@ -158,19 +562,21 @@ class Router:
                 ClientBlockGetByIdRequest(block_id=block_id)
             )
             block = expand_block(resp['block'])
-        else:
-            resp = await self._handle_response(
-                Message.CLIENT_BLOCK_LIST_REQUEST,
-                ClientBlockListResponse,
-                ClientBlockListRequest(
-                    paging=ClientPagingControls(limit=1)
-                )
+            return (
+                block['header_signature'],
+                block['header']['state_root_hash'],
             )
-            block = expand_block(resp['blocks'][0])
-        return (
-            block['header_signature'],
-            block['header']['state_root_hash'],
-        )
+
+        try:
+            return await self._head_tracker.get_head()
+        except (DecodeError, AttributeError):
+            raise ClientException(
+                'Failed to parse "content" string from validator')
+        except ValidatorConnectionError as vce:
+            raise ClientException(
+                'Failed with ZMQ interaction: {0}'.format(vce))
+        except (asyncio.TimeoutError, FutureTimeoutError):
+            raise ClientException('Validator connection timeout')
 
     async def list_state(self, address, start=None, limit=None, head=None,
                          reverse=None):
@@ -194,9 +600,46 @@ class Router:
             head=head
         )
 
-    async def fetch_state(self, address, head=None):
-        head, root = await self._head_to_root(head)
+    async def get_state_root(self, head=None):
+        """Get state root of the block `head`, of the chain head by default.
+        """
+        _, root = await self._head_to_root(head)
+        return root
 
+    async def fetch_state(self, address, head=None, state_root=None):
+        """Fetch state of the address at `state_root`, or at the state root of the block `head`.
+
+        Several addresses fetched at the state root got once are read from the same state,
+        even if a block is committed meanwhile.
+        """
+        if state_root is None:
+            head, root = await self._head_to_root(head)
+        else:
+            root = state_root
+
+        if self._state_cache is None:
+            value = await self._fetch_state_value(root, address)
+        else:
+            value = self._state_cache.get(root, address)
+
+            if value is _MISSING:
+                try:
+                    value = await self._fetch_state_value(root, address)
+                except KeyNotFound:
+                    self._state_cache.put(root, address, None)
+                    raise
+
+                self._state_cache.put(root, address, value)
+
+            elif value is None:
+                raise KeyNotFound('Resource not found')
+
+        return self._wrap_response(
+            data=value,
+            metadata=self._get_metadata({}, head=head)
+        )
+
+    async def _fetch_state_value(self, root, address):
         response = await self._handle_response(
             Message.CLIENT_STATE_GET_REQUEST,
             ClientStateGetResponse,
@@ -204,17 +647,14 @@ class Router:
                 state_root=root, address=address
             )
         )
-        return self._wrap_response(
-            data=response['value'],
-            metadata=self._get_metadata(response, head=head)
-        )
+        return response['value']
 
     async def list_blocks(self, block_ids=None, start=None, limit=None,
-                          head=None, reverse=None):
+                          head=None, reverse=None, as_json=False):
         paging_controls = get_paging_controls(start, limit)
         id_query = ','.join(block_ids) if block_ids else None
 
-        response = await self._handle_response(
+        response = await self._send_request(
             Message.CLIENT_BLOCK_LIST_REQUEST,
             ClientBlockListResponse,
             ClientBlockListRequest(
@@ -224,33 +664,41 @@ class Router:
                 paging=make_paging_message(paging_controls)
             )
         )
+        if as_json:
+            return self._wrap_paginated_json_response(response, paging_controls, response.blocks)
+
+        response = message_to_dict(response)
         return self._wrap_paginated_response(
             response=response,
             controls=paging_controls,
             data=[expand_block(b) for b in response['blocks']]
         )
 
-    async def fetch_block(self, block_id):
+    async def fetch_block(self, block_id, as_json=False):
         validate_id(block_id)
 
-        response = await self._handle_response(
+        response = await self._send_request(
             Message.CLIENT_BLOCK_GET_BY_ID_REQUEST,
             ClientBlockGetResponse,
             ClientBlockGetByIdRequest(
                 block_id=block_id
             )
         )
+        if as_json:
+            return self._wrap_single_json_response(response, response.block)
+
+        response = message_to_dict(response)
         return self._wrap_response(
             data=expand_block(response['block']),
             metadata=self._get_metadata(response)
         )
 
     async def list_batches(self, batch_ids=None, start=None, limit=None,
-                           head=None, reverse=None):
+                           head=None, reverse=None, as_json=False):
         paging_controls = get_paging_controls(start, limit)
         id_query = ','.join(batch_ids) if batch_ids else None
 
-        response = await self._handle_response(
+        response = await self._send_request(
             Message.CLIENT_BATCH_LIST_REQUEST,
             ClientBatchListResponse,
             ClientBatchListRequest(
@@ -260,22 +708,30 @@ class Router:
                 paging=make_paging_message(paging_controls)
             )
         )
+        if as_json:
+            return self._wrap_paginated_json_response(response, paging_controls, response.batches)
+
+        response = message_to_dict(response)
         return self._wrap_paginated_response(
             response=response,
             controls=paging_controls,
             data=[expand_batch(b) for b in response['batches']]
         )
 
-    async def fetch_batch(self, batch_id):
+    async def fetch_batch(self, batch_id, as_json=False):
         validate_id(batch_id)
 
-        response = await self._handle_response(
+        response = await self._send_request(
             Message.CLIENT_BATCH_GET_REQUEST,
             ClientBatchGetResponse,
             ClientBatchGetRequest(
                 batch_id=batch_id
             )
         )
+        if as_json:
+            return self._wrap_single_json_response(response, response.batch)
+
+        response = message_to_dict(response)
         return self._wrap_response(
             data=expand_batch(response['batch']),
             metadata=self._get_metadata(response)
@@ -283,11 +739,11 @@ class Router:
 
     async def list_transactions(self, transaction_ids=None, start=None,
                                 limit=None, head=None, reverse=None,
-                                family_name=None):
+                                family_name=None, as_json=False):
         paging_controls = get_paging_controls(start, limit)
         id_query = ','.join(transaction_ids) if transaction_ids else None
 
-        response = await self._handle_response(
+        response = await self._send_request(
             Message.CLIENT_TRANSACTION_LIST_REQUEST,
             ClientTransactionListResponse,
             ClientTransactionListRequest(
@@ -297,6 +753,17 @@ class Router:
                 paging=make_paging_message(paging_controls)
             )
         )
+        if as_json:
+            transactions = response.transactions
+            if family_name is not None:
+                transactions = [
+                    t for t in transactions
+                    if parse_header_proto(TransactionHeader, t.header).family_name == family_name
+                ]
+
+            return self._wrap_paginated_json_response(response, paging_controls, transactions)
+
+        response = message_to_dict(response)
         data = (expand_transaction(t) for t in response['transactions'])
         if family_name is not None:
             data = filter(lambda t: t['header']['family_name'] == family_name,
@@ -308,16 +775,20 @@ class Router:
             data=data
         )
 
-    async def fetch_transaction(self, transaction_id):
+    async def fetch_transaction(self, transaction_id, as_json=False):
         validate_id(transaction_id)
 
-        response = await self._handle_response(
+        response = await self._send_request(
             Message.CLIENT_TRANSACTION_GET_REQUEST,
             ClientTransactionGetResponse,
             ClientTransactionGetRequest(
                 transaction_id=transaction_id
             )
         )
+        if as_json:
+            return self._wrap_single_json_response(response, response.transaction)
+
+        response = message_to_dict(response)
         return self._wrap_response(
             data=expand_transaction(response['transaction']),
             metadata=self._get_metadata(response)
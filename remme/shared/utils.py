@@ -17,16 +17,21 @@ import logging
 import hashlib
 import base64
 import codecs
+import json
+import math
 import re
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
 
 import sha3
+from google.protobuf.descriptor import FieldDescriptor
 from google.protobuf.json_format import MessageToDict
 from google.protobuf.message import DecodeError
 from sawtooth_signing import create_context
 from sawtooth_sdk.protobuf import client_list_control_pb2
-from sawtooth_sdk.protobuf.batch_pb2 import BatchHeader
-from sawtooth_sdk.protobuf.block_pb2 import BlockHeader
-from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+from sawtooth_sdk.protobuf.batch_pb2 import Batch, BatchHeader
+from sawtooth_sdk.protobuf.block_pb2 import Block, BlockHeader
+from sawtooth_sdk.protobuf.transaction_pb2 import Transaction, TransactionHeader
 
 from remme.shared import exceptions as errors
 
@@ -64,10 +69,283 @@ def web3_hash(data):
 
 
 def from_proto_to_dict(proto_obj):
+    return _get_proto_dict_serializer(proto_obj.DESCRIPTOR)(proto_obj)
+
+
+def _message_to_dict_with_defaults(proto_obj):
     return MessageToDict(proto_obj, preserving_proto_field_name=True,
                          including_default_value_fields=True)
 
 
+_INT64_CPP_TYPES = (
+    FieldDescriptor.CPPTYPE_INT64,
+    FieldDescriptor.CPPTYPE_UINT64,
+)
+
+# Headers of the resources deserialized by `expand_block`, `expand_batch` and `expand_transaction`
+_EXPANDED_HEADERS = {
+    Block.DESCRIPTOR.full_name: BlockHeader,
+    Batch.DESCRIPTOR.full_name: BatchHeader,
+    Transaction.DESCRIPTOR.full_name: TransactionHeader,
+}
+
+
+def _identity(value):
+    return value
+
+
+def _double_to_json(value):
+    if math.isinf(value):
+        return '-Infinity' if value < 0.0 else 'Infinity'
+    if math.isnan(value):
+        return 'NaN'
+    return value
+
+
+def _get_field_converter(field):
+    """Get function converting field value the same way as `MessageToDict` does,
+    None if the field type is not supported.
+    """
+    cpp_type = field.cpp_type
+
+    if cpp_type in (FieldDescriptor.CPPTYPE_INT32, FieldDescriptor.CPPTYPE_UINT32):
+        return _identity
+    if cpp_type in _INT64_CPP_TYPES:
+        return str
+    if cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+        return bool
+    if cpp_type == FieldDescriptor.CPPTYPE_DOUBLE:
+        return _double_to_json
+    if cpp_type == FieldDescriptor.CPPTYPE_STRING:
+        if field.type == FieldDescriptor.TYPE_BYTES:
+            return lambda value: base64.b64encode(value).decode('utf-8')
+        return _identity
+    if cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        if field.enum_type.full_name == 'google.protobuf.NullValue':
+            return None
+        names = {number: value.name for number, value in field.enum_type.values_by_number.items()}
+        return lambda value: names.get(value, value)
+    if cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        if field.message_type.GetOptions().map_entry or \
+                field.message_type.full_name.startswith('google.protobuf.'):
+            return None
+        return lambda value: _get_proto_dict_serializer(value.DESCRIPTOR)(value)
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def _get_proto_dict_serializer(descriptor):
+    """Compile function converting messages of the descriptor to dict.
+
+    The result is the same as of `MessageToDict` with preserved proto field names and
+    default values: set fields go in order of their numbers, then unset fields
+    in order of declaration. Messages with fields of types the function is not
+    compiled for (maps, floats, well known types, extensions) fall back to `MessageToDict`.
+    """
+    if descriptor.full_name.startswith('google.protobuf.') or descriptor.is_extendable:
+        return _message_to_dict_with_defaults
+
+    # (name, converter, presence is tracked explicitly, repeated) in order of numbers
+    fields = []
+    # (name, repeated, default value) in order of declaration
+    defaults = []
+
+    for field in descriptor.fields:
+        converter = _get_field_converter(field)
+        if converter is None:
+            return _message_to_dict_with_defaults
+
+        is_repeated = field.label == FieldDescriptor.LABEL_REPEATED
+        has_presence = not is_repeated and (
+            field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE or
+            field.containing_oneof is not None or
+            descriptor.file.syntax != 'proto3'
+        )
+        fields.append((field.number, field.name, converter, has_presence, is_repeated))
+
+        if is_repeated:
+            defaults.append((field.name, True, None))
+        elif not field.containing_oneof and field.cpp_type != FieldDescriptor.CPPTYPE_MESSAGE:
+            defaults.append((field.name, False, converter(field.default_value)))
+
+    fields = [field[1:] for field in sorted(fields)]
+
+    def serialize(proto_obj):
+        js = {}
+        for name, converter, has_presence, is_repeated in fields:
+            if has_presence:
+                if proto_obj.HasField(name):
+                    js[name] = converter(getattr(proto_obj, name))
+                continue
+
+            value = getattr(proto_obj, name)
+            if value:
+                js[name] = [converter(v) for v in value] if is_repeated else converter(value)
+
+        for name, is_repeated, default in defaults:
+            if name not in js:
+                js[name] = [] if is_repeated else default
+
+        return js
+
+    return serialize
+
+
+# The same string encoding `json.dumps` does with default `ensure_ascii`
+_encode_json_string = json.encoder.encode_basestring_ascii
+
+
+def _encode_json_bool(value):
+    return 'true' if value else 'false'
+
+
+def _get_field_json_encoder(field):
+    """Get function encoding field value to JSON the same way `json.dumps` encodes the value
+    `MessageToDict` converts it to, None if the field type is not supported.
+    """
+    cpp_type = field.cpp_type
+
+    if cpp_type in (FieldDescriptor.CPPTYPE_INT32, FieldDescriptor.CPPTYPE_UINT32):
+        return str
+    if cpp_type in _INT64_CPP_TYPES:
+        return lambda value: f'"{value}"'
+    if cpp_type == FieldDescriptor.CPPTYPE_BOOL:
+        return _encode_json_bool
+    if cpp_type == FieldDescriptor.CPPTYPE_DOUBLE:
+        return lambda value: json.dumps(_double_to_json(value))
+    if cpp_type == FieldDescriptor.CPPTYPE_STRING:
+        if field.type == FieldDescriptor.TYPE_BYTES:
+            return lambda value: f'"{base64.b64encode(value).decode("utf-8")}"'
+        return _encode_json_string
+    if cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        if field.enum_type.full_name == 'google.protobuf.NullValue':
+            return None
+        names = {number: _encode_json_string(value.name) for number, value in field.enum_type.values_by_number.items()}
+        return lambda value: names.get(value) or str(value)
+    if cpp_type == FieldDescriptor.CPPTYPE_MESSAGE:
+        if field.message_type.GetOptions().map_entry or \
+                field.message_type.full_name.startswith('google.protobuf.'):
+            return None
+        return lambda value: _get_proto_json_serializer(value.DESCRIPTOR)(value)
+
+    return None
+
+
+def _get_header_json_encoder(header_proto):
+    """Get function encoding serialized header to JSON of the header deserialized the way `parse_header` does.
+    """
+    serialize_header = _get_proto_json_serializer(header_proto.DESCRIPTOR)
+
+    def encode_header(header_bytes):
+        return serialize_header(parse_header_proto(header_proto, header_bytes))
+
+    return encode_header
+
+
+def _message_to_json_with_defaults(proto_obj):
+    return json.dumps(_message_to_dict_with_defaults(proto_obj))
+
+
+@lru_cache(maxsize=None)
+def _get_proto_json_serializer(descriptor):
+    """Compile function encoding messages of the descriptor to JSON in a single pass.
+
+    The result is the same as `json.dumps` gives for the dict `_get_proto_dict_serializer`
+    compiles the function for, except headers of blocks, batches and transactions
+    are deserialized in place as `expand_block`, `expand_batch` and `expand_transaction` do.
+    """
+    if descriptor.full_name.startswith('google.protobuf.') or descriptor.is_extendable:
+        return _message_to_json_with_defaults
+
+    header_proto = _EXPANDED_HEADERS.get(descriptor.full_name)
+
+    # (name, encoded key, encoder, presence is tracked explicitly, repeated) in order of numbers
+    fields = []
+    # (name, encoded key, encoded default value) in order of declaration
+    defaults = []
+
+    for field in descriptor.fields:
+        if header_proto is not None and field.name == 'header':
+            encoder = _get_header_json_encoder(header_proto)
+        else:
+            encoder = _get_field_json_encoder(field)
+
+        if encoder is None:
+            return _message_to_json_with_defaults
+
+        key = f'{_encode_json_string(field.name)}: '
+        is_repeated = field.label == FieldDescriptor.LABEL_REPEATED
+        has_presence = not is_repeated and (
+            field.cpp_type == FieldDescriptor.CPPTYPE_MESSAGE or
+            field.containing_oneof is not None or
+            descriptor.file.syntax != 'proto3'
+        )
+        fields.append((field.number, field.name, key, encoder, has_presence, is_repeated))
+
+        if is_repeated:
+            defaults.append((field.name, key, '[]'))
+        elif not field.containing_oneof and field.cpp_type != FieldDescriptor.CPPTYPE_MESSAGE:
+            defaults.append((field.name, key, encoder(field.default_value)))
+
+    fields = [field[1:] for field in sorted(fields)]
+
+    def serialize(proto_obj):
+        items = []
+        set_names = set()
+
+        for name, key, encoder, has_presence, is_repeated in fields:
+            if has_presence:
+                if proto_obj.HasField(name):
+                    items.append(key + encoder(getattr(proto_obj, name)))
+                    set_names.add(name)
+                continue
+
+            value = getattr(proto_obj, name)
+            if value:
+                items.append(key + (f'[{", ".join(map(encoder, value))}]' if is_repeated else encoder(value)))
+                set_names.add(name)
+
+        for name, key, default in defaults:
+            if name not in set_names:
+                items.append(key + default)
+
+        return f'{{{", ".join(items)}}}'
+
+    return serialize
+
+
+def resource_to_json(resource):
+    """Encode a block, batch or transaction protobuf to JSON with deserialized headers.
+
+    The result is the same as of `json.dumps` for the resource converted
+    with `message_to_dict` and then expanded with `expand_block`, `expand_batch`
+    or `expand_transaction`, but no intermediate dictionaries are built.
+    """
+    return _get_proto_json_serializer(resource.DESCRIPTOR)(resource)
+
+
+def resources_to_json(resources):
+    """Encode a list of blocks, batches or transactions to JSON array the way `resource_to_json` does.
+    """
+    return f'[{", ".join(map(resource_to_json, resources))}]'
+
+
+def parse_header_proto(header_proto, header_bytes):
+    """Deserializes a resource's Protobuf header as `parse_header` does.
+    """
+    header = header_proto()
+    try:
+        header.ParseFromString(header_bytes)
+    except DecodeError:
+        LOGGER.error(
+            'The validator sent a resource with %s %s',
+            'an invalid header:', base64.b64encode(header_bytes).decode('utf-8'))
+        raise errors.ResourceHeaderInvalid()
+
+    return header
+
+
 class AttrDict(dict):
     def __init__(self, *args, **kwargs):
         super(AttrDict, self).__init__(*args, **kwargs)
@@ -237,6 +515,70 @@ def drop_id_prefixes(item):
     return item
 
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    """Mapping bounded by the total size of entries, least recently used entries are evicted first.
+
+    Size of an entry is 1 unless other is passed on setting, so by default `maxsize` limits
+    the number of entries. Counts lookups hits and misses the same way as `functools.lru_cache` does.
+    """
+
+    def __init__(self, maxsize):
+        self._maxsize = maxsize
+        self._currsize = 0
+        self._data = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        try:
+            value, _ = self._data[key]
+        except KeyError:
+            self._misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self._hits += 1
+        return value
+
+    def set(self, key, value, size=1):
+        if size > self._maxsize:
+            return
+
+        self.pop(key)
+
+        self._data[key] = value, size
+        self._currsize += size
+
+        while self._currsize > self._maxsize:
+            _, (_, evicted_size) = self._data.popitem(last=False)
+            self._currsize -= evicted_size
+
+    def pop(self, key, default=None):
+        try:
+            value, size = self._data.pop(key)
+        except KeyError:
+            return default
+
+        self._currsize -= size
+        return value
+
+    def clear(self):
+        self._data.clear()
+        self._currsize = self._hits = self._misses = 0
+
+    def info(self):
+        return CacheInfo(self._hits, self._misses, self._maxsize, self._currsize)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
 class Singleton(type):
 
     _instances = {}
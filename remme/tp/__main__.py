@@ -16,35 +16,65 @@
 # pylint: disable=invalid-name
 
 import argparse
+import signal
 
-from sawtooth_sdk.processor.core import TransactionProcessor
-
-from remme.tp.atomic_swap import AtomicSwapHandler
-from remme.tp.pub_key import PubKeyHandler
-from remme.tp.account import AccountHandler
+from remme.tp.handlers import TP_HANDLERS
+from remme.tp.pub_key import VERIFICATION_ENGINES
+from remme.tp.supervisor import WorkersSupervisor
+from remme.tp.worker import raise_keyboard_interrupt, run_processor
 from remme.shared.logging_setup import setup_logging
 from remme.settings.default import load_toml_with_defaults
 
 
-TP_HANDLERS = {
-    handler._family_name: handler
-    for handler in (AccountHandler(), PubKeyHandler(), AtomicSwapHandler())
-}
+def parse_families(value):
+    families = [family.strip() for family in value.split(',') if family.strip()]
+    unknown_families = set(families) - TP_HANDLERS.keys()
+    if unknown_families or not families:
+        raise argparse.ArgumentTypeError(
+            f'Families should be comma separated names of {", ".join(TP_HANDLERS)}, got "{value}".'
+        )
+    return families
+
 
 if __name__ == '__main__':
-    config = load_toml_with_defaults('/config/remme-client-config.toml')['remme']['client']
+    config = load_toml_with_defaults('/config/remme-client-config.toml')['remme']
+    cfg_client, cfg_tp = config['client'], config['tp']
     parser = argparse.ArgumentParser(description='Transaction processor.')
     parser.add_argument('-v', '--verbosity', type=int, default=2)
+    parser.add_argument('--verification-engine', choices=VERIFICATION_ENGINES.keys(),
+                        default=cfg_tp['verification_engine'])
+    parser.add_argument('--verification-workers', type=int, default=cfg_tp['verification_workers'])
+    parser.add_argument('--verification-single-inline', action='store_true',
+                        default=cfg_tp['verification_single_inline'],
+                        help='Verify a single signature in the handler process with the process pool engine.')
+    parser.add_argument('--workers', type=int, default=cfg_tp['workers'],
+                        help='Number of transaction processor processes, 0 to process in this one.')
+    # String default is parsed by the type, so families of the config are validated as the command line ones
+    config_families = cfg_tp['families']
+    if not isinstance(config_families, str):
+        config_families = ','.join(map(str, config_families))
+    parser.add_argument('--families', type=parse_families, default=config_families or ','.join(TP_HANDLERS),
+                        help='Comma separated transaction families to process, all by default.')
     args = parser.parse_args()
     setup_logging('remme-tp', args.verbosity)
 
-    processor = TransactionProcessor(url=f'tcp://{ config["validator_ip"] }:{ config["validator_port"] }')
+    processor_args = (
+        f'tcp://{ cfg_client["validator_ip"] }:{ cfg_client["validator_port"] }',
+        args.families,
+        args.verbosity,
+        args.verification_engine,
+        args.verification_workers,
+        args.verification_single_inline,
+    )
 
-    for handler in TP_HANDLERS.values():
-        processor.add_handler(handler)
-    try:
-        processor.start()
-    except KeyboardInterrupt:
-        pass
-    finally:
-        processor.stop()
+    if not args.workers:
+        run_processor(*processor_args)
+    else:
+        supervisor = WorkersSupervisor(run_processor, args.workers, args=processor_args)
+        signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+        try:
+            supervisor.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            supervisor.stop()
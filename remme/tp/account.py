@@ -18,12 +18,12 @@ from sawtooth_sdk.processor.exceptions import InvalidTransaction
 
 from remme.protos.account_pb2 import (
     Account, GenesisStatus, AccountMethod, GenesisPayload,
-    TransferPayload
+    TransferPayload, BulkTransferPayload
 )
 from remme.settings import (
     GENESIS_ADDRESS, ZERO_ADDRESS
 )
-from remme.shared.forms import TransferPayloadForm, GenesisPayloadForm
+from remme.shared.forms import TransferPayloadForm, BulkTransferPayloadForm, GenesisPayloadForm
 from remme.shared.constants import Events, EMIT_EVENT
 
 from .basic import (
@@ -34,7 +34,8 @@ from .basic import (
 LOGGER = logging.getLogger(__name__)
 
 FAMILY_NAME = 'account'
-FAMILY_VERSIONS = ['0.1']
+# Bulk transfer is processed since 0.2, nodes processing 0.1 only do not know the method
+FAMILY_VERSIONS = ['0.1', '0.2']
 
 
 def get_account_by_address(context, address):
@@ -49,8 +50,8 @@ class AccountHandler(BasicHandler):
     def __init__(self):
         super().__init__(FAMILY_NAME, FAMILY_VERSIONS)
 
-    def get_state_processor(self):
-        return {
+    def get_state_processor(self, family_version=None):
+        state_processor = {
             AccountMethod.TRANSFER: {
                 PB_CLASS: TransferPayload,
                 PROCESSOR: self._transfer,
@@ -61,9 +62,19 @@ class AccountHandler(BasicHandler):
                 PB_CLASS: GenesisPayload,
                 PROCESSOR: self._genesis,
                 VALIDATOR: GenesisPayloadForm,
-            }
+            },
         }
 
+        if family_version != FAMILY_VERSIONS[0]:
+            state_processor[AccountMethod.BULK_TRANSFER] = {
+                PB_CLASS: BulkTransferPayload,
+                PROCESSOR: self._bulk_transfer,
+                EMIT_EVENT: Events.ACCOUNT_BULK_TRANSFER.value,
+                VALIDATOR: BulkTransferPayloadForm,
+            }
+
+        return state_processor
+
     def _genesis(self, context, pub_key, genesis_payload):
         signer_key = self.make_address_from_data(pub_key)
         genesis_status = get_data(context, GenesisStatus, GENESIS_ADDRESS)
@@ -101,7 +112,52 @@ class AccountHandler(BasicHandler):
 
         return self._transfer_from_address(context, address, transfer_payload)
 
-    def _transfer_from_address(self, context, address_from, transfer_payload):
+    def _bulk_transfer(self, context, public_key, bulk_transfer_payload):
+        """
+        Make public transfers from the signer address to several receivers atomically.
+
+        Every transfer is checked as a single one is, accounts of the sender and all receivers
+        are loaded in a single state round trip, so the whole bulk is applied or rejected at once.
+        """
+        address_from = self.make_address_from_data(public_key)
+
+        total_value = 0
+        for transfer_payload in bulk_transfer_payload.transfers:
+            self._check_transfer(address_from, transfer_payload)
+            total_value += transfer_payload.value
+
+        addresses_to = list(dict.fromkeys(transfer.address_to for transfer in bulk_transfer_payload.transfers))
+
+        signer_account, *receivers_accounts = get_multiple_data(context, [
+            (address, Account) for address in [address_from] + addresses_to
+        ])
+
+        if signer_account is None:
+            signer_account = Account()
+
+        if signer_account.balance < total_value:
+            raise InvalidTransaction(
+                f'Not enough transferable balance. Sender\'s current balance: {signer_account.balance}.',
+            )
+
+        state = {
+            address_from: signer_account,
+        }
+        for address_to, receiver_account in zip(addresses_to, receivers_accounts):
+            state[address_to] = Account() if receiver_account is None else receiver_account
+
+        for transfer_payload in bulk_transfer_payload.transfers:
+            state[transfer_payload.address_to].balance += transfer_payload.value
+
+        signer_account.balance -= total_value
+
+        LOGGER.info(
+            f'Transferred {total_value} tokens from {address_from} to {len(addresses_to)} receivers.',
+        )
+
+        return state
+
+    def _check_transfer(self, address_from, transfer_payload):
         if not transfer_payload.value:
             raise InvalidTransaction('Could not transfer with zero amount.')
 
@@ -112,10 +168,21 @@ class AccountHandler(BasicHandler):
         if address_from == transfer_payload.address_to:
             raise InvalidTransaction('Account cannot send tokens to itself.')
 
-        signer_account, receiver_account = get_multiple_data(context, [
-            (address_from, Account),
-            (transfer_payload.address_to, Account),
-        ])
+    def _transfer_from_address(self, context, address_from, transfer_payload, signer_account=None):
+        """
+        Transfer tokens from the address.
+
+        Already loaded sender account could be passed to not parse it again, it is changed in place then.
+        """
+        self._check_transfer(address_from, transfer_payload)
+
+        if signer_account is None:
+            signer_account, receiver_account = get_multiple_data(context, [
+                (address_from, Account),
+                (transfer_payload.address_to, Account),
+            ])
+        else:
+            receiver_account = get_data(context, Account, transfer_payload.address_to)
 
         if signer_account is None:
             signer_account = Account()
@@ -21,23 +21,24 @@ from sawtooth_sdk.protobuf.setting_pb2 import Setting
 from remme.protos.account_pb2 import Account
 from remme.protos.atomic_swap_pb2 import (
     AtomicSwapMethod, AtomicSwapInitPayload, AtomicSwapInfo,
-    AtomicSwapApprovePayload, AtomicSwapExpirePayload,
+    AtomicSwapApprovePayload, AtomicSwapExpirePayload, AtomicSwapExpireManyPayload,
     AtomicSwapSetSecretLockPayload, AtomicSwapClosePayload
 )
 from remme.settings import SETTINGS_SWAP_COMMISSION, ZERO_ADDRESS
 from remme.settings.helper import _get_setting_value, _make_settings_key
 
 
-from remme.shared.utils import web3_hash
+from remme.shared.utils import LRUCache, web3_hash
 from remme.clients.account import AccountClient
-from remme.clients.block_info import BlockInfoClient, CONFIG_ADDRESS
 from remme.protos.block_info_pb2 import BlockInfo, BlockInfoConfig
 
+from remme.shared.block_info import CONFIG_ADDRESS, create_block_address
 from remme.shared.constants import Events, EMIT_EVENT
 from remme.shared.forms import (
     AtomicSwapInitPayloadForm,
     AtomicSwapApprovePayloadForm,
     AtomicSwapExpirePayloadForm,
+    AtomicSwapExpireManyPayloadForm,
     AtomicSwapSetSecretLockPayloadForm,
     AtomicSwapClosePayloadForm,
 )
@@ -46,6 +47,7 @@ from .account import AccountHandler
 from .basic import (
     BasicHandler,
     get_data,
+    get_multiple_data,
     PROCESSOR,
     PB_CLASS,
     VALIDATOR,
@@ -55,7 +57,8 @@ from .basic import (
 LOGGER = logging.getLogger(__name__)
 
 FAMILY_NAME = 'AtomicSwap'
-FAMILY_VERSIONS = ['0.1']
+# Expiration of many swaps is processed since 0.2, nodes processing 0.1 only do not know the method
+FAMILY_VERSIONS = ['0.1', '0.2']
 
 
 RANGE_ACCEPTANCE = 1
@@ -69,6 +72,11 @@ NON_INITIATOR_TIME_DELTA_LOCK = datetime.timedelta(hours=NON_INTIATOR_TIME_LOCK)
 
 NOT_PERMITTED_TO_CHANGE_SWAP_STATUSES = (AtomicSwapInfo.CLOSED, AtomicSwapInfo.EXPIRED)
 
+# Serialized and parsed latest block info by block number, so transactions of
+# the same block share the parsed info. Info of a block number differs between
+# forks, so it is reused only if equal to the entry of the transaction state.
+_latest_block_infos = LRUCache(maxsize=2)
+
 
 class AtomicSwapHandler(BasicHandler):
 
@@ -81,8 +89,8 @@ class AtomicSwapHandler(BasicHandler):
     def __init__(self):
         super().__init__(FAMILY_NAME, FAMILY_VERSIONS)
 
-    def get_state_processor(self):
-        return {
+    def get_state_processor(self, family_version=None):
+        state_processor = {
             AtomicSwapMethod.INIT: {
                 PB_CLASS: AtomicSwapInitPayload,
                 PROCESSOR: self._swap_init,
@@ -115,6 +123,16 @@ class AtomicSwapHandler(BasicHandler):
             },
         }
 
+        if family_version != FAMILY_VERSIONS[0]:
+            state_processor[AtomicSwapMethod.EXPIRE_MANY] = {
+                PB_CLASS: AtomicSwapExpireManyPayload,
+                PROCESSOR: self._swap_expire_many,
+                EMIT_EVENT: Events.SWAP_EXPIRE_MANY.value,
+                VALIDATOR: AtomicSwapExpireManyPayloadForm,
+            }
+
+        return state_processor
+
     @staticmethod
     def get_datetime_from_timestamp(timestamp):
         return datetime.datetime.fromtimestamp(timestamp)
@@ -128,7 +146,19 @@ class AtomicSwapHandler(BasicHandler):
 
         LOGGER.debug(f'Current latest block number: {block_info_config.latest_block + 1}')
 
-        block_info = get_data(context, BlockInfo, BlockInfoClient.create_block_address(block_info_config.latest_block))
+        block_num = block_info_config.latest_block
+        block_info_address = create_block_address(block_num)
+        block_info_data = context.get_cached_raw_data(block_info_address)
+
+        block_info = None
+        cached = _latest_block_infos.get(block_num)
+        if cached is not None and cached[0] == block_info_data:
+            block_info = cached[1]
+
+        elif block_info_data:
+            block_info = next(context.get_cached_data([(block_info_address, BlockInfo)]))
+            if block_info:
+                _latest_block_infos.set(block_num, (block_info_data, block_info))
 
         if not block_info:
             raise InvalidTransaction(f'Block {block_info_config.latest_block + 1} not found.')
@@ -270,6 +300,71 @@ class AtomicSwapHandler(BasicHandler):
         address_swap_info_is_stored_by = self.make_address_from_data(swap_identifier)
         swap_information = get_data(context, AtomicSwapInfo, address_swap_info_is_stored_by)
 
+        signer_address = AccountHandler().make_address_from_data(signer_pubkey)
+
+        self._check_swap_expiration_permitted(swap_identifier, swap_information, signer_address)
+
+        block = self._get_latest_block_info(context)
+        self._check_swap_time_lock(swap_information, self.get_datetime_from_timestamp(block.timestamp))
+
+        account = get_data(context, Account, swap_information.sender_address)
+        if account is None:
+            account = Account()
+        account.balance += swap_information.amount
+
+        swap_information.state = AtomicSwapInfo.EXPIRED
+
+        return {
+            address_swap_info_is_stored_by: swap_information,
+            swap_information.sender_address: account,
+        }
+
+    def _swap_expire_many(self, context, signer_pubkey, swap_expire_many_payload):
+        """
+        Expire several swaps of the signer at once, each of them is checked as a single expired one.
+
+        Latest block is resolved once, swaps and the signer account are read with a single state request,
+        the signer account is credited with the total amount of the swaps.
+        """
+        swap_identifiers = swap_expire_many_payload.swap_ids
+
+        if len(set(swap_identifiers)) != len(swap_identifiers):
+            raise InvalidTransaction('Atomic swap identifiers should be unique.')
+
+        signer_address = AccountHandler().make_address_from_data(signer_pubkey)
+        addresses_swap_infos_are_stored_by = [
+            self.make_address_from_data(swap_identifier) for swap_identifier in swap_identifiers
+        ]
+
+        *swap_informations, account = get_multiple_data(context, [
+            *((address, AtomicSwapInfo) for address in addresses_swap_infos_are_stored_by),
+            (signer_address, Account),
+        ])
+
+        for swap_identifier, swap_information in zip(swap_identifiers, swap_informations):
+            self._check_swap_expiration_permitted(swap_identifier, swap_information, signer_address)
+
+        block = self._get_latest_block_info(context)
+        block_time = self.get_datetime_from_timestamp(block.timestamp)
+
+        for swap_information in swap_informations:
+            self._check_swap_time_lock(swap_information, block_time)
+
+        if account is None:
+            account = Account()
+
+        state = {}
+        for address, swap_information in zip(addresses_swap_infos_are_stored_by, swap_informations):
+            account.balance += swap_information.amount
+            swap_information.state = AtomicSwapInfo.EXPIRED
+            state[address] = swap_information
+
+        state[signer_address] = account
+
+        return state
+
+    @staticmethod
+    def _check_swap_expiration_permitted(swap_identifier, swap_information, signer_address):
         if not swap_information:
             raise InvalidTransaction(f'Atomic swap was not initiated for identifier {swap_identifier}!')
 
@@ -278,13 +373,10 @@ class AtomicSwapHandler(BasicHandler):
                 f'No operations can be done upon the swap: {swap_identifier} as it is already closed or expired.',
             )
 
-        signer_address = AccountHandler().make_address_from_data(signer_pubkey)
-
         if signer_address != swap_information.sender_address:
             raise InvalidTransaction('Signer is not the one who opened the swap.')
 
-        block = self._get_latest_block_info(context)
-        block_time = self.get_datetime_from_timestamp(block.timestamp)
+    def _check_swap_time_lock(self, swap_information, block_time):
         created_at = self.get_datetime_from_timestamp(swap_information.created_at)
 
         time_delta = INITIATOR_TIME_DELTA_LOCK if swap_information.is_initiator else NON_INITIATOR_TIME_DELTA_LOCK
@@ -298,18 +390,6 @@ class AtomicSwapHandler(BasicHandler):
                 f'timestamp {swap_information.created_at} to withdraw.'
             )
 
-        account = get_data(context, Account, swap_information.sender_address)
-        if account is None:
-            account = Account()
-        account.balance += swap_information.amount
-
-        swap_information.state = AtomicSwapInfo.EXPIRED
-
-        return {
-            address_swap_info_is_stored_by: swap_information,
-            swap_information.sender_address: account,
-        }
-
     def _swap_close(self, context, signer_pubkey, swap_close_payload):
         """
         Close atomic swap.
@@ -15,6 +15,8 @@
 import logging
 import json
 import warnings
+from collections import namedtuple
+from types import MappingProxyType
 
 from google.protobuf.message import DecodeError
 from google.protobuf.text_format import ParseError
@@ -23,6 +25,7 @@ from sawtooth_sdk.processor.exceptions import InternalError, InvalidTransaction
 from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
 
 from remme.protos.transaction_pb2 import TransactionPayload
+from remme.shared.forms import get_proto_validator
 from remme.shared.utils import hash512, Singleton, from_proto_to_dict
 from remme.shared.metrics import METRICS_SENDER
 
@@ -37,6 +40,12 @@ PB_CLASS = 'pb_class'
 PROCESSOR = 'processor'
 VALIDATOR = 'validator'
 
+# Compiled entry of `get_state_processor` for a single method,
+# `proto_validator` is the validator form compiled for the protobuf class
+MethodDispatch = namedtuple('MethodDispatch', [
+    'pb_class', 'processor', 'validator', 'proto_validator', 'emit_event', 'metric',
+])
+
 
 def is_address(address):
     try:
@@ -86,6 +95,9 @@ class BasicHandler(metaclass=Singleton):
         self._family_name = name
         self._family_versions = versions
         self._prefix = hash512(self._family_name)[:6]
+        self._dispatch_tables = {}
+        # block info addresses of the latest block are predicted by the number read by previous transactions
+        self._latest_block_num = None
 
     @property
     def family_name(self):
@@ -102,9 +114,41 @@ class BasicHandler(metaclass=Singleton):
     def namespaces(self):
         return [self._prefix]
 
-    def get_state_processor(self):
+    def get_state_processor(self, family_version=None):
+        """
+        Get methods processed by the family version, the latest one by default.
+        """
         raise InternalError('No implementation for `get_state_processor`')
 
+    @property
+    def dispatch_table(self):
+        """
+        Read-only mapping of methods of the latest family version to their compiled dispatch records.
+        """
+        return self.get_dispatch_table(self._family_versions[-1])
+
+    def get_dispatch_table(self, family_version):
+        """
+        Read-only mapping of methods of the family version to their compiled dispatch records.
+
+        Built from `get_state_processor` once per handler instance and family version.
+        """
+        try:
+            return self._dispatch_tables[family_version]
+        except KeyError:
+            dispatch_table = self._dispatch_tables[family_version] = MappingProxyType({
+                method: MethodDispatch(
+                    pb_class=state_processor[PB_CLASS],
+                    processor=state_processor[PROCESSOR],
+                    validator=state_processor[VALIDATOR],
+                    proto_validator=get_proto_validator(state_processor[VALIDATOR], state_processor[PB_CLASS]),
+                    emit_event=state_processor.get(EMIT_EVENT),
+                    metric=f'tp.{self._family_name}.{method}',
+                )
+                for method, state_processor in self.get_state_processor(family_version).items()
+            })
+            return dispatch_table
+
     def get_message_factory(self, signer=None):
         return MessageFactory(
             family_name=self.family_name,
@@ -143,36 +187,40 @@ class BasicHandler(metaclass=Singleton):
         except DecodeError:
             raise InvalidTransaction('Cannot decode transaction payload.')
 
-        state_processor = self.get_state_processor()
+        family_version = transaction.header.family_version
+        if family_version not in self._family_versions:
+            raise InvalidTransaction(f'Invalid family version ({family_version}) has been set.')
+
         try:
-            data_pb = state_processor[transaction_payload.method][PB_CLASS]()
-            data_pb.ParseFromString(transaction_payload.data)
-            processor = state_processor[transaction_payload.method][PROCESSOR]
-            validator_class = state_processor[transaction_payload.method][VALIDATOR]
+            dispatch = self.get_dispatch_table(family_version)[transaction_payload.method]
         except KeyError:
             raise InvalidTransaction(f'Invalid account method value ({transaction_payload.method}) has been set.')
 
-        validator = validator_class.load_proto(data_pb)
-        if not validator.validate():
+        data_pb = dispatch.pb_class()
+        data_pb.ParseFromString(transaction_payload.data)
+
+        errors = dispatch.proto_validator.validate(data_pb)
+        if errors:
             raise InvalidTransaction(f'Invalid protobuf data of '
-                                     f'"{validator._pb_class.__name__}", '
-                                     f'detailed: {validator.errors}')
+                                     f'"{dispatch.pb_class.__name__}", '
+                                     f'detailed: {errors}')
 
-        measurement = METRICS_SENDER.get_time_measurement(
-            f'tp.{self._family_name}.{transaction_payload.method}'
-        )
+        measurement = METRICS_SENDER.get_time_measurement(dispatch.metric)
 
-        context_service = CacheContextService(context=context)
+        context_service = CacheContextService(context=context, latest_block_num=self._latest_block_num)
         context_service.preload_state(transaction.header.inputs)
-        updated_state = processor(context_service, transaction.header.signer_public_key, data_pb)
+        self._latest_block_num = context_service.latest_block_num
+        updated_state = dispatch.processor(context_service, transaction.header.signer_public_key, data_pb)
 
         context_service.set_state({k: v.SerializeToString() for k, v in updated_state.items()})
 
-        event_name = state_processor[transaction_payload.method].get(EMIT_EVENT, None)
-
-        if event_name:
+        if dispatch.emit_event:
             event_attributes = get_event_attributes(updated_state, transaction.signature)
-            add_event(context_service, event_name, event_attributes)
+            add_event(context_service, dispatch.emit_event, event_attributes)
+
+        LOGGER.debug(f'Transaction {transaction.signature} made '
+                     f'{context_service.state_round_trips} state reads round trips, '
+                     f'skipped {context_service.skipped_writes} unchanged state writes')
 
         measurement.done()
 
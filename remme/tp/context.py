@@ -1,10 +1,17 @@
 import logging
+from collections import OrderedDict
 
 from google.protobuf.text_format import ParseError
-from sawtooth_sdk.processor.exceptions import InternalError
+from sawtooth_sdk.processor.exceptions import (
+    AuthorizationException,
+    InternalError,
+    InvalidTransaction,
+)
 from sawtooth_sdk.protobuf import state_context_pb2
 
+from remme.protos.block_info_pb2 import BlockInfoConfig
 from remme.settings import STATE_TIMEOUT_SEC
+from remme.shared.block_info import CONFIG_ADDRESS, create_block_address
 
 
 logger = logging.getLogger(__name__)
@@ -12,37 +19,124 @@ logger = logging.getLogger(__name__)
 
 class CacheContextService:
 
-    def __init__(self, context):
+    def __init__(self, context, latest_block_num=None):
+        """
+        Arguments:
+            context (sawtooth_sdk.processor.context.Context): context to store and retrieve address data.
+            latest_block_num (int): the latest block number read from block info config by previous
+                transactions. Transactions of a block read info of the same latest block and the ones
+                of the next block read the next one, so both are pre-loaded together with the config
+                when inputs contain block info namespace prefix.
+        """
         self._storage = {}
         self._context = context
+        self._latest_block_num = latest_block_num
+        self._state_round_trips = 0
+        self._skipped_writes = 0
+
+    @property
+    def state_round_trips(self):
+        """Number of state reads requests sent to validator by the service.
+        """
+        return self._state_round_trips
+
+    @property
+    def skipped_writes(self):
+        """Number of entries not sent to validator as their data is unchanged.
+        """
+        return self._skipped_writes
+
+    @property
+    def latest_block_num(self):
+        """The latest block number of block info config loaded by the service, or the passed one.
+        """
+        return self._latest_block_num
 
     def preload_state(self, addresses):
+        prefixes = [a for a in addresses if len(a) < 70]
         addresses = list(filter(lambda a: len(a) == 70, addresses))
+
+        addresses.extend(
+            address for address in self._get_predicted_addresses()
+            if address not in addresses and any(address.startswith(p) for p in prefixes)
+        )
+        self._load_state(addresses)
+
+        logger.debug(f'Stored data for addresses: {self._storage}')
+
+    def _load_state(self, addresses):
+        """Fetch addresses data with a single request and store it.
+
+        Addresses validator has no data for are stored as empty
+        to not request them again.
+        """
+        if not addresses:
+            return
+
         entries = self.get_state(addresses)
-        for i, entry in enumerate(entries):
+
+        self._storage.update(dict.fromkeys(addresses))
+        for entry in entries:
             self._storage[entry.address] = entry.data
 
-        logger.debug(f'Stored data for addresses: {self._storage}')
+        if self._storage.get(CONFIG_ADDRESS) and CONFIG_ADDRESS in addresses:
+            self._remember_latest_block(self._storage[CONFIG_ADDRESS])
+
+    def _get_predicted_addresses(self):
+        if self._latest_block_num is None:
+            return [CONFIG_ADDRESS]
+
+        return [
+            CONFIG_ADDRESS,
+            create_block_address(self._latest_block_num),
+            create_block_address(self._latest_block_num + 1),
+        ]
+
+    def _remember_latest_block(self, data):
+        try:
+            block_info_config = BlockInfoConfig()
+            block_info_config.ParseFromString(data)
+        except Exception as e:
+            logger.exception(e)
+            return
+
+        self._latest_block_num = block_info_config.latest_block
+
+    def _load_missed_state(self, addresses):
+        missed_addresses = list(OrderedDict.fromkeys(
+            address for address in addresses
+            if address not in self._storage
+        ))
+
+        if not missed_addresses:
+            return
+
+        try:
+            self._load_state(missed_addresses)
+        except AuthorizationException:
+            raise InvalidTransaction(f'Addresses "{missed_addresses}" are not '
+                                     'declared in transaction inputs')
+        except Exception as e:
+            logger.exception(e)
+            raise InternalError(f'Addresses "{missed_addresses}" do not '
+                                'have access to data')
+
+        logger.debug('Got pre-loaded data for addresses '
+                     f'"{missed_addresses}"')
+
+    def get_cached_raw_data(self, address):
+        """Get serialized data of address, None if there is no data.
+        """
+        self._load_missed_state([address])
+        return self._storage[address]
 
     def get_cached_data(self, resolvers, timeout=STATE_TIMEOUT_SEC):
+        self._load_missed_state(address for address, _ in resolvers)
+
         for address, pb_class in resolvers:
-            try:
-                data = self._storage[address]
-                logger.debug('Got loaded data for address '
-                             f'"{address}": {data}')
-            except KeyError:
-                try:
-                    data = self.get_state([address])[0].data
-                    self._storage[address] = data
-                    logger.debug('Got pre-loaded data for address '
-                                 f'"{address}": {data}')
-                except IndexError:
-                    yield None
-                    continue
-                except Exception as e:
-                    logger.exception(e)
-                    raise InternalError(f'Address "{address}" does not '
-                                        'have access to data')
+            data = self._storage[address]
+            logger.debug('Got loaded data for address '
+                         f'"{address}": {data}')
 
             if data is None:
                 yield data
@@ -59,13 +153,35 @@ class CacheContextService:
                 yield None
 
     def get_state(self, addresses, timeout=STATE_TIMEOUT_SEC):
+        self._state_round_trips += 1
         return self._context.get_state(addresses, timeout)
 
     def set_state(self, entries, timeout=STATE_TIMEOUT_SEC):
-        return self._context.set_state(entries, timeout)
+        """Set addresses data, skipping entries equal to the loaded ones.
+        """
+        changed_entries = {
+            address: data for address, data in entries.items()
+            if data is None or self._storage.get(address) != data
+        }
+
+        skipped_addresses = entries.keys() - changed_entries.keys()
+        self._skipped_writes += len(skipped_addresses)
+
+        if skipped_addresses:
+            logger.debug('Skipped setting unchanged data for addresses '
+                         f'"{sorted(skipped_addresses)}"')
+
+        if not changed_entries:
+            return []
+
+        result = self._context.set_state(changed_entries, timeout)
+        self._storage.update(changed_entries)
+        return result
 
     def delete_state(self, addresses, timeout=STATE_TIMEOUT_SEC):
-        return self._context.delete_state(addresses, timeout)
+        result = self._context.delete_state(addresses, timeout)
+        self._storage.update(dict.fromkeys(addresses))
+        return result
 
     def add_receipt_data(self, data, timeout=STATE_TIMEOUT_SEC):
         return self._context.add_receipt_data(data, timeout)
@@ -13,10 +13,11 @@
 # limitations under the License.
 # ------------------------------------------------------------------------
 
-import copy
 import logging
 import hashlib
 import abc
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
 
 import ed25519
@@ -37,16 +38,21 @@ from remme.settings import ZERO_ADDRESS
 from remme.protos.account_pb2 import Account, TransferPayload
 from remme.protos.pub_key_pb2 import (
     PubKeyStorage,
+    PubKeyOwnerIndex,
+    PubKeyOwnerIndexBucket,
     NewPubKeyPayload,
     NewPubKeyStoreAndPayPayload,
+    NewPubKeyBatchPayload,
     RevokePubKeyPayload,
     PubKeyMethod,
 )
 from remme.settings.helper import _get_setting_value
+from remme.shared.utils import LRUCache, hash512
 from remme.shared.forms import (
     NewPublicKeyPayloadForm,
     RevokePubKeyPayloadForm,
     NewPubKeyStoreAndPayPayloadForm,
+    NewPubKeyBatchPayloadForm,
 )
 from .basic import (
     BasicHandler, PB_CLASS, VALIDATOR, PROCESSOR, get_multiple_data, get_data
@@ -56,7 +62,9 @@ from .account import AccountHandler
 LOGGER = logging.getLogger(__name__)
 
 FAMILY_NAME = 'pub_key'
-FAMILY_VERSIONS = ['0.1']
+# Public keys are linked to the owner's account (`Account.pub_keys`) by 0.1 and to the owner's index since 0.2,
+# public keys are stored in a batch since 0.2 as well
+FAMILY_VERSIONS = ['0.1', '0.2']
 
 PUB_KEY_ORGANIZATION = 'REMME'
 PUB_KEY_MAX_VALIDITY = timedelta(365)
@@ -64,6 +72,47 @@ PUB_KEY_STORE_PRICE = 10
 
 ECONOMY_IS_ENABLED_VALUE = 'true'
 
+# Number of signatures verification results kept for re-executed transactions
+VERIFIED_SIGNATURES_CACHE_SIZE = 4096
+# Total size (in bytes of serialized keys) of deserialized public keys kept for reuse
+PARSED_PUBLIC_KEYS_CACHE_SIZE = 4 * 1024 * 1024
+# Number of public key addresses in a full bucket of the owner's public keys index
+PUB_KEYS_INDEX_BUCKET_SIZE = 64
+# Number of public key addresses linked to the owner account moved to the index by a single transaction
+PUB_KEYS_MIGRATION_SIZE = PUB_KEYS_INDEX_BUCKET_SIZE
+
+# Verify-enabled libsecp256k1 context shared by all ECDSA public keys of the process
+_SECP256K1_VERIFY_CONTEXT = secp256k1.Base(ctx=None, flags=secp256k1.FLAG_VERIFY)
+
+_parsed_public_keys = LRUCache(maxsize=PARSED_PUBLIC_KEYS_CACHE_SIZE)
+
+
+def _load_rsa_public_key(key):
+    return load_der_public_key(key, default_backend())
+
+
+def _load_secp256k1_public_key(key):
+    return secp256k1.PublicKey(key, raw=True, ctx=_SECP256K1_VERIFY_CONTEXT.ctx)
+
+
+def _load_ed25519_public_key(key):
+    return ed25519.VerifyingKey(key)
+
+
+def load_public_key(loader, key):
+    """Get public key object deserialized with loader, objects are reused for the same key bytes.
+
+    Errors of deserialization are not cached and raised to the caller.
+    """
+    cache_key = (loader, key)
+
+    public_key = _parsed_public_keys.get(cache_key)
+    if public_key is None:
+        public_key = loader(key)
+        _parsed_public_keys.set(cache_key, public_key, size=len(key))
+
+    return public_key
+
 
 def detect_processor_cls(config):
     if isinstance(config, NewPubKeyPayload.RSAConfiguration):
@@ -101,13 +150,20 @@ class BasePubKeyProcessor(metaclass=abc.ABCMeta):
         """Verify if signature was successfull
         """
 
+    def get_verification_cache_key(self):
+        """Get key the verification result could be cached by
+        """
+        return (
+            self.__class__.__name__, self.get_public_key(), self._hashing_algorithm,
+            self._entity_hash, self._entity_hash_signature,
+        )
+
 
 class RSAProcessor(BasePubKeyProcessor):
 
     def verify(self):
         try:
-            verifier = load_der_public_key(self.get_public_key(),
-                                           default_backend())
+            verifier = load_public_key(_load_rsa_public_key, self.get_public_key())
         except ValueError:
             raise InvalidTransaction(
                 'Cannot deserialize the provided public key. '
@@ -125,6 +181,9 @@ class RSAProcessor(BasePubKeyProcessor):
             .Name(self._hashing_algorithm)
         return getattr(hashes, alg_name)
 
+    def get_verification_cache_key(self):
+        return super().get_verification_cache_key() + (self._config.padding,)
+
     def _get_padding(self):
         Padding = NewPubKeyPayload.RSAConfiguration.Padding
         if self._config.padding == Padding.Value('PSS'):
@@ -140,15 +199,10 @@ class ECDSAProcessor(BasePubKeyProcessor):
 
     def verify(self):
         try:
-            pub_key = secp256k1.PublicKey()
-            pub_key.deserialize(self.get_public_key())
+            pub_key = load_public_key(_load_secp256k1_public_key, self.get_public_key())
 
             assert pub_key.public_key, "No public key defined"
 
-            if pub_key.flags & lib.SECP256K1_CONTEXT_VERIFY != \
-               lib.SECP256K1_CONTEXT_VERIFY:
-                raise Exception("instance not configured for sig verification")
-
             msg_digest = self.get_hashing_algorithm()(
                 self._entity_hash).digest()
             raw_sig = pub_key.ecdsa_deserialize_compact(
@@ -175,7 +229,7 @@ class Ed25519Processor(BasePubKeyProcessor):
 
     def verify(self):
         try:
-            verifier = ed25519.VerifyingKey(self.get_public_key())
+            verifier = load_public_key(_load_ed25519_public_key, self.get_public_key())
             msg_digest = self.get_hashing_algorithm()(self._entity_hash).digest()
             verifier.verify(self._entity_hash_signature, msg_digest)
             return True
@@ -188,16 +242,193 @@ class Ed25519Processor(BasePubKeyProcessor):
         return getattr(hashlib, alg_name)
 
 
+def _verify_signature(processor):
+    """Run processor's verification, module level to be picklable for process pools.
+    """
+    return processor.verify()
+
+
+class BaseVerificationEngine(metaclass=abc.ABCMeta):
+    """Strategy of running public key processors signatures verification.
+    """
+
+    @abc.abstractmethod
+    def verify(self, *processors):
+        """Return list of verification results in order of given processors
+        """
+
+    def start(self):
+        """Prepare engine resources before transactions processing
+        """
+
+    def stop(self):
+        """Release engine resources
+        """
+
+
+class InlineVerificationEngine(BaseVerificationEngine):
+    """Verify signatures on the caller thread.
+    """
+
+    def verify(self, *processors):
+        return [_verify_signature(processor) for processor in processors]
+
+
+class ProcessPoolVerificationEngine(BaseVerificationEngine):
+    """Verify signatures on a pool of worker processes.
+
+    Heavy verifications (e.g. RSA-4096 PSS) do not hold the GIL of the handler process,
+    several signatures passed to `verify` at once are checked in parallel. With `single_inline`
+    a single signature is verified in the handler process, saving pickling and IPC when cheap
+    keys (e.g. ECDSA) are stored one per transaction.
+    """
+
+    def __init__(self, max_workers=None, single_inline=False):
+        self._max_workers = max_workers
+        self._single_inline = single_inline
+        self._executor = None
+
+    def start(self):
+        """Spawn workers in advance, so they are forked before the validator connection is established.
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+        self._executor.submit(int).result()
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def verify(self, *processors):
+        if self._single_inline and len(processors) < 2:
+            return [_verify_signature(processor) for processor in processors]
+
+        if self._executor is None:
+            self.start()
+
+        futures = [self._executor.submit(_verify_signature, processor) for processor in processors]
+
+        try:
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            LOGGER.exception('Verification process pool is broken, restarting it.')
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            return [_verify_signature(processor) for processor in processors]
+
+
+VERIFICATION_ENGINES = {
+    'inline': InlineVerificationEngine,
+    'process_pool': ProcessPoolVerificationEngine,
+}
+
+
+def create_verification_engine(name, workers=0, single_inline=False):
+    """Create verification engine by its name, `workers` (0 means number of CPUs) and `single_inline`
+    are used by process pool only.
+    """
+    engine_cls = VERIFICATION_ENGINES[name]
+    if engine_cls is ProcessPoolVerificationEngine:
+        return engine_cls(max_workers=workers or None, single_inline=single_inline)
+    return engine_cls()
+
+
 class PubKeyHandler(BasicHandler):
 
     def __init__(self):
         super().__init__(FAMILY_NAME, FAMILY_VERSIONS)
+        self._verification_engine = InlineVerificationEngine()
+        self._verified_signatures = LRUCache(maxsize=VERIFIED_SIGNATURES_CACHE_SIZE)
 
-    def get_state_processor(self):
-        return {
+    @property
+    def verification_engine(self):
+        return self._verification_engine
+
+    def set_verification_engine(self, engine):
+        """
+        Set engine public keys signatures are verified with.
+        """
+        if not isinstance(engine, BaseVerificationEngine):
+            raise ValueError(f'Expected `engine` to be an instance of '
+                             f'BaseVerificationEngine, got type {type(engine)}')
+
+        self._verification_engine.stop()
+        self._verification_engine = engine
+
+    @property
+    def verified_signatures_cache_info(self):
+        """
+        Get hits, misses and size of the verified signatures cache.
+        """
+        return self._verified_signatures.info()
+
+    def _verify_signatures(self, *processors):
+        """
+        Verify public key processors signatures, results of the same signatures verified before are reused.
+
+        The same transaction is executed several times by validator (forks switching, rescheduled batches,
+        resubmitting by client), so its signatures are passed to the verification engine only once.
+        """
+        cache_keys = [processor.get_verification_cache_key() for processor in processors]
+        results = [self._verified_signatures.get(cache_key) for cache_key in cache_keys]
+
+        not_verified = [index for index, result in enumerate(results) if result is None]
+        if not_verified:
+            verified = self._verification_engine.verify(*(processors[index] for index in not_verified))
+
+            for index, result in zip(not_verified, verified):
+                self._verified_signatures.set(cache_keys[index], result)
+                results[index] = result
+
+        LOGGER.debug(f'Verified signatures cache: {self._verified_signatures.info()}')
+
+        return results
+
+    def _verify_owner_signature(self, owner_public_key, signature, message):
+        """
+        Verify secp256k1 signature of public key owner, results of the same signatures verified before are reused.
+        """
+        cache_key = ('Secp256k1', owner_public_key, message, signature)
+
+        is_signature_valid = self._verified_signatures.get(cache_key)
+        if is_signature_valid is None:
+            is_signature_valid = Secp256k1Context().verify(
+                signature=signature.hex(),
+                message=message,
+                public_key=Secp256k1PublicKey.from_hex(owner_public_key.hex()),
+            )
+            self._verified_signatures.set(cache_key, is_signature_valid)
+
+        return is_signature_valid
+
+    def make_owner_index_prefix(self, owner_address):
+        """
+        Get prefix of all addresses of the owner's public keys index.
+
+        Full buckets are appended under the prefix, so transactions storing public keys list it as output.
+        """
+        return self._prefix + hash512(owner_address)[:56]
+
+    def make_owner_index_address(self, owner_address):
+        """
+        Get address of the owner's public keys index, that keeps buckets count and not yet bucketed keys.
+        """
+        return self.make_owner_index_prefix(owner_address) + '0' * 8
+
+    def make_owner_index_bucket_address(self, owner_address, bucket):
+        """
+        Get address of the full bucket of the owner's public keys index by its zero-based number.
+        """
+        return self.make_owner_index_prefix(owner_address) + f'{bucket + 1:08x}'
+
+    def get_state_processor(self, family_version=None):
+        is_account_linked = family_version == FAMILY_VERSIONS[0]
+
+        state_processor = {
             PubKeyMethod.STORE: {
                 PB_CLASS: NewPubKeyPayload,
-                PROCESSOR: self._store_pub_key,
+                PROCESSOR: self._store_pub_key_to_account if is_account_linked else self._store_pub_key,
                 VALIDATOR: NewPublicKeyPayloadForm,
             },
             PubKeyMethod.REVOKE: {
@@ -207,11 +438,23 @@ class PubKeyHandler(BasicHandler):
             },
             PubKeyMethod.STORE_AND_PAY: {
                 PB_CLASS: NewPubKeyStoreAndPayPayload,
-                PROCESSOR: self._store_public_key_for_other,
+                PROCESSOR: (
+                    self._store_public_key_for_other_to_account if is_account_linked
+                    else self._store_public_key_for_other
+                ),
                 VALIDATOR: NewPubKeyStoreAndPayPayloadForm,
-            }
+            },
         }
 
+        if not is_account_linked:
+            state_processor[PubKeyMethod.STORE_BATCH] = {
+                PB_CLASS: NewPubKeyBatchPayload,
+                PROCESSOR: self._store_pub_keys_batch,
+                VALIDATOR: NewPubKeyBatchPayloadForm,
+            }
+
+        return state_processor
+
     @staticmethod
     def _is_public_key_validity_exceeded(valid_from, valid_to):
         """
@@ -227,19 +470,21 @@ class PubKeyHandler(BasicHandler):
         return True
 
     @staticmethod
-    def _charge_tokens_for_storing(context, address_from, address_to):
+    def _charge_tokens_for_storing(context, address_from, address_to, account_from=None, value=PUB_KEY_STORE_PRICE):
         """
         Send fixed tokens value from address that want to store public key to node's storage address.
+
+        Already loaded account of the address is charged in place.
         """
         if ZERO_ADDRESS == address_from:
             raise InvalidTransaction('Transactions from zero address is used only for internal purposes.')
 
         transfer_payload = TransferPayload()
         transfer_payload.address_to = address_to
-        transfer_payload.value = PUB_KEY_STORE_PRICE
+        transfer_payload.value = value
 
         transfer_state = AccountHandler()._transfer_from_address(
-            context=context, address_from=address_from, transfer_payload=transfer_payload,
+            context=context, address_from=address_from, transfer_payload=transfer_payload, signer_account=account_from,
         )
 
         return transfer_state
@@ -267,7 +512,13 @@ class PubKeyHandler(BasicHandler):
 
         return processor
 
-    def _store_pub_key(self, context, signer_pubkey, transaction_payload):
+    def _store_pub_key_to_account(self, context, signer_pubkey, transaction_payload):
+        """
+        Store public key to the blockchain linking it to the sender's account as family version 0.1 does.
+        """
+        return self._store_pub_key(context, signer_pubkey, transaction_payload, use_owner_index=False)
+
+    def _store_pub_key(self, context, signer_pubkey, transaction_payload, use_owner_index=True):
         """
         Store public key to the blockchain.
 
@@ -281,7 +532,8 @@ class PubKeyHandler(BasicHandler):
         try to verify signature, if validity exceeds.
 
         If transaction successfully passed checks, node charges fixed tokens price for storing
-        public keys (if node economy is enabled) and link public key to the account (address).
+        public keys (if node economy is enabled) and link public key to the owner's public keys index
+        (to the account (address), if `use_owner_index` is false as for family version 0.1).
 
         References:
             - https://docs.remme.io/remme-core/docs/family-pub-key.html
@@ -289,7 +541,8 @@ class PubKeyHandler(BasicHandler):
         """
         processor = self._get_public_key_processor(transaction_payload=transaction_payload)
 
-        if not processor.verify():
+        is_signature_valid, = self._verify_signatures(processor)
+        if not is_signature_valid:
             raise InvalidTransaction('Invalid signature')
 
         public_key = processor.get_public_key()
@@ -297,10 +550,14 @@ class PubKeyHandler(BasicHandler):
         public_key_to_store_address = self.make_address_from_data(public_key)
         sender_account_address = AccountHandler().make_address_from_data(signer_pubkey)
 
-        public_key_information, sender_account = get_multiple_data(context, [
+        resolvers = [
             (public_key_to_store_address, PubKeyStorage),
             (sender_account_address, Account),
-        ])
+        ]
+        if use_owner_index:
+            resolvers.append((self.make_owner_index_address(sender_account_address), PubKeyOwnerIndex))
+
+        public_key_information, sender_account, *sender_index = get_multiple_data(context, resolvers)
         if public_key_information:
             raise InvalidTransaction('This public key is already registered.')
 
@@ -318,28 +575,40 @@ class PubKeyHandler(BasicHandler):
         public_key_information.payload.CopyFrom(transaction_payload)
         public_key_information.is_revoked = False
 
-        state = {
-            sender_account_address: sender_account,
-            public_key_to_store_address: public_key_information,
-        }
+        state = {}
+        if not use_owner_index:
+            state[sender_account_address] = sender_account
+        state[public_key_to_store_address] = public_key_information
 
-        charging_state = self._charge_for_storing(context=context, address_from=sender_account_address)
+        charging_state = self._charge_for_storing(
+            context=context, address_from=sender_account_address, account_from=sender_account,
+        )
         if charging_state is not None:
             state.update(charging_state)
-            sender_account = state.get(sender_account_address)
 
-        sender_account = self._store_public_key_to_account(
-            public_key_to_store_address=public_key_to_store_address,
-            public_key_to_store_owner_account=sender_account,
-        )
+        if not use_owner_index:
+            self._store_public_key_to_account(
+                public_key_to_store_address=public_key_to_store_address,
+                public_key_to_store_owner_account=sender_account,
+            )
+            return state
 
-        state.update({
-            sender_account_address: sender_account,
-        })
+        state.update(self._store_public_keys_to_owner_index(
+            public_keys_to_store_addresses=[public_key_to_store_address],
+            owner_address=sender_account_address,
+            owner_account=sender_account,
+            owner_index=sender_index[0],
+        ))
 
         return state
 
-    def _store_public_key_for_other(self, context, signer_pubkey, transaction_payload):
+    def _store_public_key_for_other_to_account(self, context, signer_pubkey, transaction_payload):
+        """
+        Store public key for other account linking it to the owner's account as family version 0.1 does.
+        """
+        return self._store_public_key_for_other(context, signer_pubkey, transaction_payload, use_owner_index=False)
+
+    def _store_public_key_for_other(self, context, signer_pubkey, transaction_payload, use_owner_index=True):
         """
         Store public key for other account.
 
@@ -355,25 +624,25 @@ class PubKeyHandler(BasicHandler):
             context (sawtooth_sdk.processor.context): context to store updated state (blockchain data).
             signer_pubkey: transaction sender public key.
             transaction_payload (pub_key_pb2.NewPubKeyStoreAndPayPayload): payload for storing public key for other.
+            use_owner_index (bool): link public key to the owner's index, to the owner's account otherwise.
         """
         new_public_key_payload = transaction_payload.pub_key_payload
 
         owner_public_key_as_bytes = transaction_payload.owner_public_key
         owner_public_key_as_hex = owner_public_key_as_bytes.hex()
 
-        owner_secp256k1_public_key = Secp256k1PublicKey.from_hex(owner_public_key_as_hex)
-
-        is_owner_public_key_payload_signature_valid = Secp256k1Context().verify(
-            signature=transaction_payload.signature_by_owner.hex(),
+        is_owner_public_key_payload_signature_valid = self._verify_owner_signature(
+            owner_public_key=owner_public_key_as_bytes,
+            signature=transaction_payload.signature_by_owner,
             message=new_public_key_payload.SerializeToString(),
-            public_key=owner_secp256k1_public_key,
         )
         if not is_owner_public_key_payload_signature_valid:
             raise InvalidTransaction('Public key owner\'s signature is invalid.')
 
         processor = self._get_public_key_processor(transaction_payload=transaction_payload.pub_key_payload)
 
-        if not processor.verify():
+        is_signature_valid, = self._verify_signatures(processor)
+        if not is_signature_valid:
             raise InvalidTransaction('Payed public key has invalid signature.')
 
         public_key = processor.get_public_key()
@@ -382,21 +651,35 @@ class PubKeyHandler(BasicHandler):
         public_key_to_store_owner_address = AccountHandler().make_address_from_data(owner_public_key_as_hex)
         payer_for_storing_address = AccountHandler().make_address_from_data(signer_pubkey)
 
-        public_key_information, public_key_to_store_owner_account, payer_for_storing_account = get_multiple_data(context, [
+        resolvers = [
             (public_key_to_store_address, PubKeyStorage),
             (public_key_to_store_owner_address, Account),
             (payer_for_storing_address, Account),
-        ])
+        ]
+        if use_owner_index:
+            resolvers.append((self.make_owner_index_address(public_key_to_store_owner_address), PubKeyOwnerIndex))
+
+        (
+            public_key_information,
+            public_key_to_store_owner_account,
+            payer_for_storing_account,
+            *public_key_to_store_owner_index,
+        ) = get_multiple_data(context, resolvers)
 
         if public_key_information:
             raise InvalidTransaction('This public key is already registered.')
 
-        if public_key_to_store_owner_account is None:
-            public_key_to_store_owner_account = Account()
-
         if payer_for_storing_account is None:
             payer_for_storing_account = Account()
 
+        # The same account is changed by charging and storing if the owner pays for own public key. Family
+        # version 0.1 keeps writing the owner's account parsed apart from the charged one, so it is not charged.
+        if use_owner_index and public_key_to_store_owner_address == payer_for_storing_address:
+            public_key_to_store_owner_account = payer_for_storing_account
+
+        if public_key_to_store_owner_account is None:
+            public_key_to_store_owner_account = Account()
+
         if not self._is_public_key_validity_exceeded(
             valid_from=new_public_key_payload.valid_from,
             valid_to=new_public_key_payload.valid_to,
@@ -408,36 +691,118 @@ class PubKeyHandler(BasicHandler):
         public_key_information.payload.CopyFrom(new_public_key_payload)
         public_key_information.is_revoked = False
 
-        state = {
-            public_key_to_store_owner_address: public_key_to_store_owner_account,
-            payer_for_storing_address: payer_for_storing_account,
-            public_key_to_store_address: public_key_information,
-        }
+        state = {}
+        if not use_owner_index:
+            state[public_key_to_store_owner_address] = public_key_to_store_owner_account
+            state[payer_for_storing_address] = payer_for_storing_account
+        state[public_key_to_store_address] = public_key_information
 
-        charging_state = self._charge_for_storing(context=context, address_from=payer_for_storing_address)
+        charging_state = self._charge_for_storing(
+            context=context, address_from=payer_for_storing_address, account_from=payer_for_storing_account,
+        )
         if charging_state is not None:
             state.update(charging_state)
 
-        public_key_to_store_owner_account = self._store_public_key_to_account(
-            public_key_to_store_address=public_key_to_store_address,
-            public_key_to_store_owner_account=public_key_to_store_owner_account,
+        if not use_owner_index:
+            state[public_key_to_store_owner_address] = self._store_public_key_to_account(
+                public_key_to_store_address=public_key_to_store_address,
+                public_key_to_store_owner_account=public_key_to_store_owner_account,
+            )
+            return state
+
+        state.update(self._store_public_keys_to_owner_index(
+            public_keys_to_store_addresses=[public_key_to_store_address],
+            owner_address=public_key_to_store_owner_address,
+            owner_account=public_key_to_store_owner_account,
+            owner_index=public_key_to_store_owner_index[0],
+        ))
+
+        return state
+
+    def _store_pub_keys_batch(self, context, signer_pubkey, transaction_payload):
+        """
+        Store several public keys of the signer to the blockchain at once.
+
+        Every public key is checked as a single stored one, while signatures are passed to the verification
+        engine together, so the process pool one verifies them in parallel. Public keys storages, the sender's
+        account and index are read with a single state request, the sender is charged once for all of the
+        public keys and its account and index are written once.
+        """
+        new_public_key_payloads = transaction_payload.pub_keys
+
+        processors = [
+            self._get_public_key_processor(transaction_payload=new_public_key_payload)
+            for new_public_key_payload in new_public_key_payloads
+        ]
+
+        for new_public_key_payload in new_public_key_payloads:
+            if not self._is_public_key_validity_exceeded(
+                valid_from=new_public_key_payload.valid_from,
+                valid_to=new_public_key_payload.valid_to,
+            ):
+                raise InvalidTransaction('The public key validity exceeds the maximum value.')
+
+        public_keys_to_store_addresses = [
+            self.make_address_from_data(processor.get_public_key()) for processor in processors
+        ]
+        if len(set(public_keys_to_store_addresses)) != len(public_keys_to_store_addresses):
+            raise InvalidTransaction('Public keys of the batch should be unique.')
+
+        if not all(self._verify_signatures(*processors)):
+            raise InvalidTransaction('Invalid signature')
+
+        sender_account_address = AccountHandler().make_address_from_data(signer_pubkey)
+        sender_index_address = self.make_owner_index_address(sender_account_address)
+
+        *public_keys_information, sender_account, sender_index = get_multiple_data(context, [
+            *((address, PubKeyStorage) for address in public_keys_to_store_addresses),
+            (sender_account_address, Account),
+            (sender_index_address, PubKeyOwnerIndex),
+        ])
+        if any(public_keys_information):
+            raise InvalidTransaction('This public key is already registered.')
+
+        if not sender_account:
+            sender_account = Account()
+
+        state = {}
+
+        for address, new_public_key_payload in zip(public_keys_to_store_addresses, new_public_key_payloads):
+            public_key_information = PubKeyStorage()
+            public_key_information.owner = signer_pubkey
+            public_key_information.payload.CopyFrom(new_public_key_payload)
+            public_key_information.is_revoked = False
+
+            state[address] = public_key_information
+
+        charging_state = self._charge_for_storing(
+            context=context, address_from=sender_account_address, account_from=sender_account,
+            value=PUB_KEY_STORE_PRICE * len(new_public_key_payloads),
         )
+        if charging_state is not None:
+            state.update(charging_state)
 
-        state.update({
-            public_key_to_store_owner_address: public_key_to_store_owner_account,
-        })
+        state.update(self._store_public_keys_to_owner_index(
+            public_keys_to_store_addresses=public_keys_to_store_addresses,
+            owner_address=sender_account_address,
+            owner_account=sender_account,
+            owner_index=sender_index,
+        ))
 
         return state
 
-    def _charge_for_storing(self, context, address_from):
+    def _charge_for_storing(self, context, address_from, account_from=None, value=PUB_KEY_STORE_PRICE):
         """
         Send fixed tokens value from address to zero address.
+
+        Already loaded account of the address is charged in place.
         """
         is_economy_enabled = _get_setting_value(context, 'remme.economy_enabled', 'true').lower()
         if is_economy_enabled == 'true':
 
             transfer_state = self._charge_tokens_for_storing(
-                context=context, address_from=address_from, address_to=ZERO_ADDRESS,
+                context=context, address_from=address_from, address_to=ZERO_ADDRESS, account_from=account_from,
+                value=value,
             )
 
             return transfer_state
@@ -445,15 +810,62 @@ class PubKeyHandler(BasicHandler):
     @staticmethod
     def _store_public_key_to_account(public_key_to_store_address, public_key_to_store_owner_account):
         """
-        Store public keys to account.
+        Store public keys to account in place.
         """
-        account = copy.deepcopy(public_key_to_store_owner_account)
+        account = public_key_to_store_owner_account
 
         if public_key_to_store_address not in account.pub_keys:
             account.pub_keys.append(public_key_to_store_address)
 
         return account
 
+    def _store_public_keys_to_owner_index(
+        self, public_keys_to_store_addresses, owner_address, owner_account, owner_index,
+    ):
+        """
+        Append public keys addresses to the owner's public keys index, get state of the changed addresses.
+
+        Index keeps buckets count and up to a bucket of latest keys, once they fill a bucket, it is written
+        to the next bucket address. So storing reads and writes a fixed amount of data whatever
+        the number of the owner's public keys is.
+
+        Keys linked to the owner account by the previous state layout (`Account.pub_keys`) are moved
+        to the index beforehand, up to `PUB_KEYS_MIGRATION_SIZE` of them per transaction, the account
+        is changed in place then. While the account keeps keys to move, new ones are appended to it,
+        so the keys are listed (the index ones first) in the order they were stored.
+        """
+        if owner_index is None:
+            owner_index = PubKeyOwnerIndex()
+
+        state = {}
+
+        if owner_account is not None and owner_account.pub_keys:
+            migrated_addresses = list(owner_account.pub_keys[:PUB_KEYS_MIGRATION_SIZE])
+            del owner_account.pub_keys[:PUB_KEYS_MIGRATION_SIZE]
+
+            if owner_account.pub_keys:
+                owner_account.pub_keys.extend(public_keys_to_store_addresses)
+                public_keys_to_store_addresses = []
+
+            public_keys_to_store_addresses = migrated_addresses + public_keys_to_store_addresses
+            state[owner_address] = owner_account
+
+        for address in public_keys_to_store_addresses:
+            owner_index.pub_keys.append(address)
+
+            if len(owner_index.pub_keys) == PUB_KEYS_INDEX_BUCKET_SIZE:
+                bucket = PubKeyOwnerIndexBucket()
+                bucket.pub_keys.extend(owner_index.pub_keys)
+
+                state[self.make_owner_index_bucket_address(owner_address, owner_index.buckets_count)] = bucket
+
+                owner_index.buckets_count += 1
+                del owner_index.pub_keys[:]
+
+        state[self.make_owner_index_address(owner_address)] = owner_index
+
+        return state
+
     @staticmethod
     def _revoke_pub_key(context, signer_pubkey, revoke_pub_key_payload):
         public_key_information = get_data(context, PubKeyStorage, revoke_pub_key_payload.address)
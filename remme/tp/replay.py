@@ -0,0 +1,349 @@
+# Copyright 2018 REMME
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------
+
+"""Offline replay of transactions through the transaction processor handlers.
+
+Reads files of serialized `BatchList`s (e.g. the genesis batch or a capture of
+the network), applies every transaction with `TP_HANDLERS` against in-memory
+state and reports throughput, per-method latencies and state operations.
+
+Usage:
+    python3 -m remme.tp.replay batches.batch [batches.batch ...]
+        [--setting KEY=VALUE ...] [--batches-per-block N] [--profile FILE]
+"""
+
+# pylint: disable=invalid-name
+
+import argparse
+import cProfile
+import logging
+import math
+import pstats
+import time
+from collections import Counter, defaultdict
+
+from sawtooth_sdk.processor.exceptions import (
+    AuthorizationException,
+    InternalError,
+    InvalidTransaction,
+)
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateEntry
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from remme.protos.block_info_pb2 import BlockInfo, BlockInfoConfig
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.settings.helper import _make_settings_key, get_setting_from_key_value
+from remme.shared.block_info import CONFIG_ADDRESS, create_block_address
+from remme.tp.handlers import TP_HANDLERS
+
+
+LOGGER = logging.getLogger(__name__)
+
+STATE_OPERATIONS = (
+    'get_state', 'addresses_read', 'set_state', 'addresses_written', 'delete_state', 'events',
+)
+
+
+class ReplayState:
+    """In-memory global state transactions are replayed against.
+
+    Writes of a batch are kept apart until the batch is committed, so a batch
+    with an invalid transaction changes nothing, as on the validator.
+    """
+
+    def __init__(self, initial_state=None):
+        self._state = dict(initial_state or {})
+        self._pending = {}
+
+    @property
+    def state(self):
+        return self._state
+
+    def get(self, address):
+        if address in self._pending:
+            return self._pending[address]
+        return self._state.get(address)
+
+    def set(self, address, data):
+        self._pending[address] = data
+
+    def commit(self):
+        for address, data in self._pending.items():
+            if data is None:
+                self._state.pop(address, None)
+            else:
+                self._state[address] = data
+        self._pending = {}
+
+    def rollback(self):
+        self._pending = {}
+
+
+class ReplayContext:
+    """Context of a single transaction, modelled on `testing.mocks.stub.StubContext`.
+
+    Addresses are authorized by prefixes of inputs and outputs as the validator
+    does it, and state operations are counted.
+    """
+
+    def __init__(self, state, inputs, outputs):
+        self._state = state
+        self._inputs = tuple(inputs)
+        self._outputs = tuple(outputs)
+        self.counters = Counter()
+
+    def get_state(self, addresses, timeout=None):
+        self.counters['get_state'] += 1
+        self.counters['addresses_read'] += len(addresses)
+
+        entries = []
+        for address in addresses:
+            if not address.startswith(self._inputs):
+                raise AuthorizationException(f'Tried to get unauthorized address: {address}')
+
+            data = self._state.get(address)
+            if data:
+                entries.append(TpStateEntry(address=address, data=data))
+
+        return entries
+
+    def set_state(self, entries, timeout=None):
+        self.counters['set_state'] += 1
+        self.counters['addresses_written'] += len(entries)
+
+        for address, data in entries.items():
+            if not address.startswith(self._outputs):
+                raise AuthorizationException(f'Tried to set unauthorized address: {address}')
+
+            self._state.set(address, data)
+
+        return list(entries)
+
+    def delete_state(self, addresses, timeout=None):
+        self.counters['delete_state'] += 1
+
+        for address in addresses:
+            if not address.startswith(self._outputs):
+                raise AuthorizationException(f'Tried to delete unauthorized address: {address}')
+
+            self._state.set(address, None)
+
+        return list(addresses)
+
+    def add_receipt_data(self, data, timeout=None):
+        pass
+
+    def add_event(self, event_type, attributes=None, data=None, timeout=None):
+        self.counters['events'] += 1
+
+
+class MethodStats:
+    """Latencies and state operations of applied transactions of a method.
+    """
+
+    def __init__(self):
+        self.latencies = []
+        self.invalid = 0
+        self.counters = Counter()
+
+    def percentile(self, percent):
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return 0.0
+        return latencies[max(math.ceil(percent / 100 * len(latencies)), 1) - 1]
+
+
+class Replayer:
+    """Apply transactions of batches with transaction processor handlers.
+
+    Block info of a new block is written to the state every `batches_per_block`
+    batches, so atomic swap transactions find the latest block.
+    """
+
+    def __init__(self, handlers=None, initial_state=None, batches_per_block=100, block_interval=5,
+                 start_timestamp=None):
+        self._handlers = TP_HANDLERS if handlers is None else handlers
+        self._state = ReplayState(initial_state)
+        self._batches_per_block = batches_per_block
+        self._block_interval = block_interval
+        self._start_timestamp = int(time.time()) if start_timestamp is None else start_timestamp
+        self._block_num = None
+
+        self.stats = defaultdict(MethodStats)
+        self.batches = 0
+        self.invalid_batches = 0
+        self.skipped_transactions = 0
+
+    @property
+    def state(self):
+        return self._state.state
+
+    def replay(self, batch_list):
+        for batch in batch_list.batches:
+            if self.batches % self._batches_per_block == 0:
+                self._write_block_info(self.batches // self._batches_per_block)
+
+            self.batches += 1
+            if self._apply_batch(batch):
+                self._state.commit()
+            else:
+                self._state.rollback()
+                self.invalid_batches += 1
+
+    def _apply_batch(self, batch):
+        for transaction in batch.transactions:
+            header = TransactionHeader()
+            header.ParseFromString(transaction.header)
+
+            handler = self._handlers.get(header.family_name)
+            if handler is None:
+                self.skipped_transactions += 1
+                continue
+
+            payload = TransactionPayload()
+            payload.ParseFromString(transaction.payload)
+            stats = self.stats[self._get_method_name(handler, payload.method)]
+
+            request = TpProcessRequest(
+                header=header, payload=transaction.payload, signature=transaction.header_signature,
+            )
+            context = ReplayContext(self._state, header.inputs, header.outputs)
+
+            start_time = time.perf_counter()
+            try:
+                handler.apply(request, context)
+            except (InvalidTransaction, InternalError, AuthorizationException) as error:
+                LOGGER.debug(f'Transaction {transaction.header_signature} is invalid: {error}')
+                stats.invalid += 1
+                return False
+            finally:
+                stats.counters.update(context.counters)
+
+            stats.latencies.append(time.perf_counter() - start_time)
+
+        return True
+
+    @staticmethod
+    def _get_method_name(handler, method):
+        dispatch = handler.dispatch_table.get(method)
+        if dispatch is None:
+            return f'{handler.family_name}.{method}'
+        return f'{handler.family_name}.{dispatch.processor.__name__.lstrip("_")}'
+
+    def _write_block_info(self, block_num):
+        block_info_config = BlockInfoConfig()
+        block_info_config.latest_block = block_num
+        block_info_config.oldest_block = 0
+        block_info_config.target_count = block_num + 1
+
+        block_info = BlockInfo()
+        block_info.block_num = block_num
+        block_info.timestamp = self._start_timestamp + block_num * self._block_interval
+
+        self._state.set(CONFIG_ADDRESS, block_info_config.SerializeToString())
+        self._state.set(create_block_address(block_num), block_info.SerializeToString())
+        self._state.commit()
+
+    def report(self, elapsed):
+        applied = sum(len(stats.latencies) for stats in self.stats.values())
+        applying_time = sum(sum(stats.latencies) for stats in self.stats.values())
+
+        lines = [
+            f'Batches: {self.batches}, invalid: {self.invalid_batches}',
+            f'Transactions applied: {applied}, skipped (unknown family): {self.skipped_transactions}',
+            f'Throughput: {applied / elapsed if elapsed else 0:.1f} tx/s overall, '
+            f'{applied / applying_time if applying_time else 0:.1f} tx/s in handlers',
+            '',
+            f'{"method":<28} {"count":>7} {"invalid":>7} {"mean, ms":>9} {"p50, ms":>9} {"p90, ms":>9} '
+            f'{"p99, ms":>9} {"max, ms":>9}',
+        ]
+
+        for name, stats in sorted(self.stats.items()):
+            count = len(stats.latencies)
+            mean = sum(stats.latencies) / count if count else 0.0
+            lines.append(
+                f'{name:<28} {count:>7} {stats.invalid:>7} {mean * 1000:>9.3f} '
+                f'{stats.percentile(50) * 1000:>9.3f} {stats.percentile(90) * 1000:>9.3f} '
+                f'{stats.percentile(99) * 1000:>9.3f} {max(stats.latencies, default=0) * 1000:>9.3f}'
+            )
+
+        lines.extend(['', f'{"state operations per tx":<28} ' + ' '.join(f'{op:>17}' for op in STATE_OPERATIONS)])
+        for name, stats in sorted(self.stats.items()):
+            count = len(stats.latencies) + stats.invalid
+            lines.append(
+                f'{name:<28} ' + ' '.join(f'{stats.counters[op] / count:>17.2f}' for op in STATE_OPERATIONS)
+            )
+
+        return '\n'.join(lines)
+
+
+def read_batch_lists(filenames):
+    for filename in filenames:
+        with open(filename, 'rb') as batch_file:
+            batch_list = BatchList()
+            batch_list.ParseFromString(batch_file.read())
+            yield batch_list
+
+
+def parse_setting(value):
+    try:
+        key, setting_value = value.split('=', 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'Setting should be in KEY=VALUE format, got "{value}".')
+    return key, setting_value
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay batches through transaction processor handlers.')
+    parser.add_argument('files', nargs='+', help='Files with serialized BatchList.')
+    parser.add_argument('--setting', type=parse_setting, action='append', default=[],
+                        help='Setting stored in the initial state, e.g. remme.settings.swap_comission=100.')
+    parser.add_argument('--batches-per-block', type=int, default=100)
+    parser.add_argument('--block-interval', type=int, default=5, help='Seconds between blocks timestamps.')
+    parser.add_argument('--profile', help='File to write cProfile statistics to.')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    replayer = Replayer(
+        initial_state={
+            _make_settings_key(key): get_setting_from_key_value(key, value).SerializeToString()
+            for key, value in args.setting
+        },
+        batches_per_block=args.batches_per_block,
+        block_interval=args.block_interval,
+    )
+    batch_lists = list(read_batch_lists(args.files))
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+
+    start = time.perf_counter()
+    for batch_list in batch_lists:
+        replayer.replay(batch_list)
+    elapsed = time.perf_counter() - start
+
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    print(replayer.report(elapsed))
+
+    if profiler:
+        print()
+        pstats.Stats(args.profile).sort_stats('cumulative').print_stats(20)
@@ -0,0 +1,149 @@
+# Copyright 2018 REMME
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------
+import logging
+import multiprocessing
+import threading
+import time
+
+from remme.shared.metrics import METRICS_SENDER
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class WorkersSupervisor:
+    """Run a function in several worker processes and restart the dead ones.
+
+    Workers are spawned, not forked, so they do not share sockets and threads
+    (e.g. the metrics sender one) with the supervisor.
+
+    A dead worker is restarted at once, if it dies again soon, the delay before
+    its restart is doubled each time, up to `max_restart_delay` seconds.
+    """
+
+    def __init__(self, target, workers, args=(), check_interval=1, restart_delay=1, max_restart_delay=60):
+        """
+        Arguments:
+            target (callable): function run in workers, called with `args` and index of the worker.
+            workers (int): number of worker processes.
+            args (tuple): arguments passed to the function.
+            check_interval (float): number of seconds between workers liveness checks.
+            restart_delay (float): number of seconds to wait before the second restart of a worker dying soon.
+            max_restart_delay (float): maximum number of seconds to wait before a restart, a worker alive
+                for longer is restarted at once.
+        """
+        if workers < 1:
+            raise ValueError(f'Number of workers should be positive, got {workers}.')
+
+        self._target = target
+        self._args = tuple(args)
+        self._check_interval = check_interval
+        self._restart_delay = restart_delay
+        self._max_restart_delay = max_restart_delay
+        self._context = multiprocessing.get_context('spawn')
+        self._processes = [None] * workers
+        self._restarts = [0] * workers
+        self._started_at = [None] * workers
+        self._restart_at = [None] * workers
+        self._failures = [0] * workers
+        self._stopped = threading.Event()
+
+    @property
+    def restarts(self):
+        """Number of restarts of each worker.
+        """
+        return list(self._restarts)
+
+    @property
+    def alive(self):
+        """Number of alive workers.
+        """
+        return sum(1 for process in self._processes if process is not None and process.is_alive())
+
+    def start(self):
+        self._stopped.clear()
+        for index in range(len(self._processes)):
+            self._start_worker(index)
+
+    def run(self):
+        """Start workers and check them until `stop()` is called.
+        """
+        self.start()
+        while not self._stopped.wait(self._check_interval):
+            self.check()
+
+    def check(self):
+        """Restart dead workers and send their metrics.
+        """
+        for index, process in enumerate(self._processes):
+            if self._stopped.is_set():
+                return
+
+            if not process.is_alive():
+                if self._restart_at[index] is None:
+                    delay = self._get_restart_delay(index)
+                    self._restart_at[index] = time.monotonic() + delay
+                    LOGGER.warning(
+                        f'Worker {index} (pid {process.pid}) exited with code {process.exitcode}, '
+                        f'restarting in {delay} seconds.'
+                    )
+
+                if time.monotonic() >= self._restart_at[index]:
+                    self._restart_at[index] = None
+                    self._restarts[index] += 1
+                    self._start_worker(index)
+
+            METRICS_SENDER.send_metric('tp.worker', {
+                'alive': self._processes[index].is_alive(),
+                'restarts': self._restarts[index],
+            }, tags={'worker': str(index)})
+
+    def stop(self, timeout=10):
+        """Terminate workers and wait for them to exit.
+        """
+        self._stopped.set()
+
+        for process in self._processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+
+        for process in self._processes:
+            if process is not None:
+                process.join(timeout)
+
+    def _get_restart_delay(self, index):
+        # Worker alive for long enough is not failing repeatedly
+        if time.monotonic() - self._started_at[index] >= self._max_restart_delay:
+            self._failures[index] = 0
+
+        failures = self._failures[index]
+        self._failures[index] += 1
+
+        if not failures:
+            return 0
+
+        return min(self._restart_delay * 2 ** (failures - 1), self._max_restart_delay)
+
+    def _start_worker(self, index):
+        process = self._context.Process(
+            target=self._target,
+            args=self._args + (index,),
+            name=f'remme-tp-worker-{index}',
+        )
+        process.start()
+        self._processes[index] = process
+        self._started_at[index] = time.monotonic()
+
+        LOGGER.info(f'Started worker {index} (pid {process.pid}).')
@@ -0,0 +1,57 @@
+# Copyright 2018 REMME
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------
+import signal
+
+from sawtooth_sdk.processor.core import TransactionProcessor
+
+from remme.tp.handlers import TP_HANDLERS
+from remme.tp.pub_key import PubKeyHandler, create_verification_engine
+from remme.shared.logging_setup import setup_logging
+from remme.shared.metrics import METRICS_SENDER
+
+
+def raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def run_processor(url, families, verbosity, verification_engine_name, verification_workers,
+                  verification_single_inline=False, worker=None):
+    """Register handlers of the families with the validator and process transactions until interrupted.
+
+    Spawned supervisor workers import the function by its module, so it is kept out of `remme.tp.__main__`.
+    """
+    if worker is not None:
+        setup_logging(f'remme-tp-{worker}', verbosity)
+        METRICS_SENDER.add_tags(worker=str(worker))
+        signal.signal(signal.SIGTERM, raise_keyboard_interrupt)
+
+    verification_engine = create_verification_engine(
+        verification_engine_name, verification_workers, verification_single_inline,
+    )
+    # start before the validator connection is opened to fork the workers without ZMQ sockets
+    verification_engine.start()
+    PubKeyHandler().set_verification_engine(verification_engine)
+
+    processor = TransactionProcessor(url=url)
+
+    for family in families:
+        processor.add_handler(TP_HANDLERS[family])
+    try:
+        processor.start()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        processor.stop()
+        verification_engine.stop()
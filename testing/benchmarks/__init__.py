@@ -0,0 +1,11 @@
+"""
+Provide throughput benchmarks of the transaction processor handlers.
+
+Synthetic workloads (transfer storms, public keys storing, atomic swap lifecycles) are applied
+with handlers `apply()` against `StubContext`, so any hot path change could be judged by
+comparison with a stored baseline.
+
+Usage:
+    python3 -m testing.benchmarks --output baseline.json
+    python3 -m testing.benchmarks --compare baseline.json [--threshold 0.1]
+"""
@@ -0,0 +1,217 @@
+"""
+Provide runner of the handlers throughput benchmarks.
+
+Every workload is applied `--repeat` times to a fresh copy of its initial state with handlers caches cleared,
+throughput of the fastest round is reported. Allocations are traced in a separate round,
+so tracing does not slow down the measured ones.
+"""
+import argparse
+import datetime
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+
+from remme.settings.helper import _setting_values
+from remme.tp import atomic_swap, pub_key
+from remme.tp.handlers import TP_HANDLERS
+from remme.tp.pub_key import PubKeyHandler
+from testing.benchmarks.workloads import get_workloads
+from testing.mocks.stub import StubContext
+
+# Metrics compared with the baseline and whether their higher values are better,
+# retained blocks are too noisy for small workloads to be compared
+COMPARED_METRICS = {
+    'tx_per_second': True,
+    'peak_memory_kib': False,
+}
+
+
+def reset_caches():
+    """
+    Clear module level caches of handlers, so every round is applied as by a fresh transaction processor.
+    """
+    pub_key._parsed_public_keys.clear()
+    PubKeyHandler()._verified_signatures.clear()
+    atomic_swap._latest_block_infos.clear()
+    _setting_values.clear()
+    for handler in TP_HANDLERS.values():
+        handler._latest_block_num = None
+
+
+def apply_workload(workload, latencies=None):
+    state = dict(workload.initial_state)
+
+    for request in workload.requests:
+        context = StubContext(inputs=request.header.inputs, outputs=request.header.outputs, initial_state=state)
+
+        start = time.perf_counter()
+        workload.handler.apply(transaction=request, context=context)
+
+        if latencies is not None:
+            latencies.append(time.perf_counter() - start)
+
+    return state
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    return values[max(math.ceil(percent / 100 * len(values)), 1) - 1]
+
+
+def measure_allocations(workload):
+    reset_caches()
+
+    tracemalloc.start()
+    try:
+        blocks_before = sys.getallocatedblocks()
+        apply_workload(workload)
+        allocated_blocks = sys.getallocatedblocks() - blocks_before
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'peak_memory_kib': round(peak_memory / 1024, 1),
+        'allocated_blocks_per_tx': round(allocated_blocks / len(workload.requests), 1),
+    }
+
+
+def run_workload(workload, repeat):
+    """
+    Apply workload and get its throughput, latencies and allocations.
+    """
+    rounds = []
+    latencies = []
+
+    for _ in range(repeat):
+        reset_caches()
+
+        start = time.perf_counter()
+        apply_workload(workload, latencies)
+        rounds.append(time.perf_counter() - start)
+
+    return {
+        'transactions': len(workload.requests),
+        'tx_per_second': round(len(workload.requests) / min(rounds), 1),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 4),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 4),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 4),
+        **measure_allocations(workload),
+    }
+
+
+def compare_results(baseline, results, threshold):
+    """
+    Get regressions of results against the baseline.
+
+    Regression is a metric of a workload presented in both results, that is worse than
+    the baseline one by more than `threshold` share of the baseline value.
+
+    Returns list of (workload, metric, baseline value, value) tuples.
+    """
+    regressions = []
+
+    for name, workload_results in sorted(results['workloads'].items()):
+        baseline_results = baseline['workloads'].get(name)
+        if baseline_results is None:
+            continue
+
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            baseline_value, value = baseline_results.get(metric), workload_results.get(metric)
+            if baseline_value is None or value is None:
+                continue
+
+            change = (value - baseline_value) / abs(baseline_value) if baseline_value else 0
+            if (-change if higher_is_better else change) > threshold:
+                regressions.append((name, metric, baseline_value, value))
+
+    return regressions
+
+
+def format_results(results, baseline=None):
+    lines = [
+        f'{"workload":<30} {"txs":>6} {"tx/s":>10} {"mean, ms":>9} {"p50, ms":>9} {"p99, ms":>9} '
+        f'{"peak, KiB":>10} {"blocks/tx":>10}'
+    ]
+
+    for name, workload_results in sorted(results['workloads'].items()):
+        lines.append(
+            f'{name:<30} {workload_results["transactions"]:>6} {workload_results["tx_per_second"]:>10.1f} '
+            f'{workload_results["mean_ms"]:>9.3f} {workload_results["p50_ms"]:>9.3f} '
+            f'{workload_results["p99_ms"]:>9.3f} {workload_results["peak_memory_kib"]:>10.1f} '
+            f'{workload_results["allocated_blocks_per_tx"]:>10.1f}'
+        )
+
+        baseline_results = baseline and baseline['workloads'].get(name)
+        if baseline_results:
+            lines.append(
+                f'{"  baseline":<30} {baseline_results["transactions"]:>6} '
+                f'{baseline_results["tx_per_second"]:>10.1f} {baseline_results["mean_ms"]:>9.3f} '
+                f'{baseline_results["p50_ms"]:>9.3f} {baseline_results["p99_ms"]:>9.3f} '
+                f'{baseline_results["peak_memory_kib"]:>10.1f} {baseline_results["allocated_blocks_per_tx"]:>10.1f}'
+            )
+
+    return '\n'.join(lines)
+
+
+def main(args=None):
+    workloads = get_workloads()
+
+    parser = argparse.ArgumentParser(description='Handlers throughput benchmarks.')
+    parser.add_argument('--workload', action='append', choices=sorted(workloads),
+                        help='Workload to run, all of them are run by default.')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier of workloads sizes.')
+    parser.add_argument('--repeat', type=int, default=3, help='Rounds of each workload, the fastest is reported.')
+    parser.add_argument('--output', help='File to write results to, e.g. a new baseline.')
+    parser.add_argument('--compare', help='Baseline file to compare results with.')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Share of a baseline value a metric could worsen by before it is flagged.')
+    args = parser.parse_args(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    workloads = get_workloads(scale=args.scale)
+
+    results = {
+        'created_at': datetime.datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workloads': {},
+    }
+
+    for name in args.workload or sorted(workloads):
+        print(f'Generating {name}...', file=sys.stderr)
+        workload = workloads[name]()
+
+        print(f'Running {name}...', file=sys.stderr)
+        results['workloads'][name] = run_workload(workload, args.repeat)
+
+    print(format_results(results, baseline))
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare_results(baseline, results, args.threshold)
+    if not regressions:
+        print(f'\nNo regressions beyond {args.threshold:.0%} of the baseline.')
+        return 0
+
+    print(f'\nRegressions beyond {args.threshold:.0%} of the baseline:')
+    for name, metric, baseline_value, value in regressions:
+        print(f'  {name}: {metric} {baseline_value} -> {value}')
+
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
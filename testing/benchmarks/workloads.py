@@ -0,0 +1,495 @@
+"""
+Provide synthetic workloads of transaction processor handlers.
+
+Workload is a list of transaction requests and the initial state they are valid against,
+requests are expected to be applied in order.
+"""
+import datetime
+import random
+import time
+from collections import Counter, namedtuple
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.setting_pb2 import Setting
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+from sawtooth_signing import CryptoFactory, create_context
+
+from remme.clients.block_info import CONFIG_ADDRESS, BlockInfoClient
+from remme.protos.account_pb2 import Account, AccountMethod, BulkTransferPayload, TransferPayload
+from remme.protos.atomic_swap_pb2 import (
+    AtomicSwapApprovePayload,
+    AtomicSwapClosePayload,
+    AtomicSwapExpireManyPayload,
+    AtomicSwapExpirePayload,
+    AtomicSwapInfo,
+    AtomicSwapInitPayload,
+    AtomicSwapMethod,
+    AtomicSwapSetSecretLockPayload,
+)
+from remme.protos.block_info_pb2 import BlockInfo, BlockInfoConfig
+from remme.protos.pub_key_pb2 import NewPubKeyBatchPayload, NewPubKeyPayload, PubKeyMethod, PubKeyOwnerIndex
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.settings import SETTINGS_SWAP_COMMISSION, ZERO_ADDRESS
+from remme.settings.helper import _make_settings_key
+from remme.shared.utils import hash256, hash512, web3_hash
+from remme.tp.account import AccountHandler
+from remme.tp.atomic_swap import AtomicSwapHandler
+from remme.tp.pub_key import PUB_KEY_MAX_VALIDITY, PUB_KEYS_INDEX_BUCKET_SIZE, PubKeyHandler
+from testing.utils.client import (
+    generate_ecdsa_keys,
+    generate_ecdsa_signature,
+    generate_ed25519_keys,
+    generate_ed25519_signature,
+    generate_entity_hash,
+    generate_message,
+    generate_rsa_signature,
+)
+
+Workload = namedtuple('Workload', ['name', 'handler', 'requests', 'initial_state'])
+
+BATCHER_PUBLIC_KEY = '039d6881f0a71d05659e1f40b443684b93c7b7c504ea23ea8949ef5216a2236940'
+
+INITIAL_BALANCE = 10 ** 9
+SWAP_AMOUNT = 200
+SWAP_COMMISSION_AMOUNT = 100
+
+IS_NODE_ECONOMY_ENABLED_ADDRESS = _make_settings_key('remme.economy_enabled')
+SWAP_COMMISSION_ADDRESS = _make_settings_key(SETTINGS_SWAP_COMMISSION)
+
+LATEST_BLOCK_NUMBER = 1000
+LATEST_BLOCK_ADDRESS = BlockInfoClient.create_block_address(LATEST_BLOCK_NUMBER)
+
+
+def generate_signers(number):
+    context = create_context('secp256k1')
+    factory = CryptoFactory(context)
+    return [factory.new_signer(context.new_random_private_key()) for _ in range(number)]
+
+
+def get_account_address(signer):
+    return AccountHandler().make_address_from_data(signer.get_public_key().as_hex())
+
+
+def get_accounts_state(signers, balance=INITIAL_BALANCE):
+    account = Account()
+    account.balance = balance
+    serialized_account = account.SerializeToString()
+
+    return {get_account_address(signer): serialized_account for signer in signers}
+
+
+def create_request(handler, signer, method, data, inputs, outputs):
+    """
+    Create transaction request of the handler's method as the validator sends it.
+    """
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = method
+    transaction_payload.data = data.SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = TransactionHeader(
+        signer_public_key=signer.get_public_key().as_hex(),
+        family_name=handler.family_name,
+        family_version=handler.family_versions[-1],
+        inputs=inputs,
+        outputs=outputs,
+        dependencies=[],
+        payload_sha512=hash512(data=serialized_transaction_payload),
+        batcher_public_key=BATCHER_PUBLIC_KEY,
+        nonce=time.time().hex().encode(),
+    )
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=signer.sign(transaction_header.SerializeToString()),
+    )
+
+
+def transfer_storm(accounts=100, transactions=1000, seed=0):
+    """
+    Transfer tokens between random pairs of accounts.
+    """
+    randomizer = random.Random(seed)
+    signers = generate_signers(accounts)
+    addresses = [get_account_address(signer) for signer in signers]
+
+    requests = []
+    for _ in range(transactions):
+        sender_index, receiver_index = randomizer.sample(range(accounts), 2)
+        inputs = outputs = [addresses[sender_index], addresses[receiver_index]]
+
+        requests.append(create_request(
+            AccountHandler(), signers[sender_index], AccountMethod.TRANSFER,
+            TransferPayload(address_to=addresses[receiver_index], value=randomizer.randint(1, 100)),
+            inputs, outputs,
+        ))
+
+    return Workload(
+        name=f'account.transfer_storm.{accounts}',
+        handler=AccountHandler(),
+        requests=requests,
+        initial_state=get_accounts_state(signers),
+    )
+
+
+def bulk_transfer(accounts=100, transactions=100, transfers=50, seed=0):
+    """
+    Transfer tokens from random accounts to random sets of other accounts with a bulk transfer each.
+    """
+    randomizer = random.Random(seed)
+    signers = generate_signers(accounts)
+    addresses = [get_account_address(signer) for signer in signers]
+
+    requests = []
+    for _ in range(transactions):
+        sender_index, *receivers_indexes = randomizer.sample(range(accounts), transfers + 1)
+        inputs = outputs = [addresses[index] for index in [sender_index] + receivers_indexes]
+
+        requests.append(create_request(
+            AccountHandler(), signers[sender_index], AccountMethod.BULK_TRANSFER,
+            BulkTransferPayload(transfers=[
+                TransferPayload(address_to=addresses[index], value=randomizer.randint(1, 100))
+                for index in receivers_indexes
+            ]),
+            inputs, outputs,
+        ))
+
+    return Workload(
+        name=f'account.bulk_transfer.{transfers}',
+        handler=AccountHandler(),
+        requests=requests,
+        initial_state=get_accounts_state(signers),
+    )
+
+
+def generate_rsa_key_pair(key_size):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size, backend=default_backend())
+    public_key = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    return private_key, public_key
+
+
+def generate_rsa_configuration(key_size, entity_hash):
+    private_key, public_key = generate_rsa_key_pair(key_size)
+
+    configuration = NewPubKeyPayload.RSAConfiguration(
+        padding=NewPubKeyPayload.RSAConfiguration.Padding.Value('PKCS1v15'),
+        key=public_key,
+    )
+    return {'rsa': configuration}, generate_rsa_signature(entity_hash, private_key), 'SHA512'
+
+
+def generate_ecdsa_configuration(entity_hash):
+    private_key, public_key = generate_ecdsa_keys()
+
+    configuration = NewPubKeyPayload.ECDSAConfiguration(
+        key=public_key,
+        ec=NewPubKeyPayload.ECDSAConfiguration.EC.Value('SECP256k1'),
+    )
+    return {'ecdsa': configuration}, generate_ecdsa_signature(entity_hash, private_key), 'SHA256'
+
+
+def generate_ed25519_configuration(entity_hash):
+    private_key, public_key = generate_ed25519_keys()
+
+    configuration = NewPubKeyPayload.Ed25519Configuration(key=public_key)
+    return {'ed25519': configuration}, generate_ed25519_signature(entity_hash, private_key), 'SHA512'
+
+
+PUB_KEY_CONFIGURATIONS = {
+    'rsa2048': lambda entity_hash: generate_rsa_configuration(2048, entity_hash),
+    'rsa4096': lambda entity_hash: generate_rsa_configuration(4096, entity_hash),
+    'ecdsa': generate_ecdsa_configuration,
+    'ed25519': generate_ed25519_configuration,
+}
+
+
+def get_owner_index_state(signer, stored_keys):
+    """
+    Get state of the owner's public keys index with `stored_keys` public keys, buckets are not read by storing,
+    so only the index itself is presented.
+    """
+    address = get_account_address(signer)
+
+    owner_index = PubKeyOwnerIndex()
+    owner_index.buckets_count = stored_keys // PUB_KEYS_INDEX_BUCKET_SIZE
+    owner_index.pub_keys.extend(
+        PubKeyHandler().make_address_from_data(f'benchmark-stored-key-{index}')
+        for index in range(stored_keys % PUB_KEYS_INDEX_BUCKET_SIZE)
+    )
+
+    return {PubKeyHandler().make_owner_index_address(address): owner_index.SerializeToString()}
+
+
+def generate_pub_key_payload(key_type, index):
+    """
+    Generate payload storing a distinct public key of a type, that is valid for the maximum validity.
+    """
+    valid_from = int(datetime.datetime.now().timestamp())
+    valid_to = valid_from + int(PUB_KEY_MAX_VALIDITY.total_seconds())
+
+    entity_hash = generate_entity_hash(generate_message(f'benchmark-{key_type}-{index}'))
+    configuration, entity_hash_signature, hashing_algorithm = PUB_KEY_CONFIGURATIONS[key_type](entity_hash)
+
+    return NewPubKeyPayload(
+        entity_hash=entity_hash,
+        entity_hash_signature=entity_hash_signature,
+        valid_from=valid_from,
+        valid_to=valid_to,
+        hashing_algorithm=NewPubKeyPayload.HashingAlgorithm.Value(hashing_algorithm),
+        **configuration,
+    )
+
+
+def pub_key_store(key_type, keys=50, owners=5, stored_keys=0):
+    """
+    Store distinct public keys of a type, owners store keys in turn.
+
+    Every owner already has `stored_keys` public keys in its index. Keys are generated here,
+    so only the keys verification and storing are measured.
+    """
+    signers = generate_signers(owners)
+
+    owners_keys = Counter({signer: stored_keys for signer in signers})
+
+    requests = []
+    for index in range(keys):
+        signer = signers[index % owners]
+
+        payload = generate_pub_key_payload(key_type, index)
+
+        account_address = get_account_address(signer)
+
+        public_key = getattr(payload, payload.WhichOneof('configuration'))
+        inputs = outputs = [
+            PubKeyHandler().make_address_from_data(public_key.key),
+            account_address,
+            PubKeyHandler().make_owner_index_address(account_address),
+            ZERO_ADDRESS,
+            IS_NODE_ECONOMY_ENABLED_ADDRESS,
+        ]
+
+        # Stub context authorizes exact addresses only, so the bucket the key fills is listed instead of the prefix
+        owners_keys[signer] += 1
+        if owners_keys[signer] % PUB_KEYS_INDEX_BUCKET_SIZE == 0:
+            bucket = owners_keys[signer] // PUB_KEYS_INDEX_BUCKET_SIZE - 1
+            outputs = inputs + [PubKeyHandler().make_owner_index_bucket_address(account_address, bucket)]
+
+        requests.append(create_request(PubKeyHandler(), signer, PubKeyMethod.STORE, payload, inputs, outputs))
+
+    initial_state = get_accounts_state(signers)
+    if stored_keys:
+        for signer in signers:
+            initial_state.update(get_owner_index_state(signer, stored_keys))
+
+    return Workload(
+        name=f'pub_key.store.{key_type}',
+        handler=PubKeyHandler(),
+        requests=requests,
+        initial_state=initial_state,
+    )
+
+
+def pub_key_store_to_account(stored_keys, keys=10, key_type='ecdsa'):
+    """
+    Store public keys of an owner that already has `stored_keys` public keys.
+
+    Shows whether the cost of storing depends on the number of the owner's public keys.
+    """
+    workload = pub_key_store(key_type, keys=keys, owners=1, stored_keys=stored_keys)
+
+    return workload._replace(name=f'pub_key.store.stored_keys.{stored_keys}')
+
+
+def pub_key_store_batch(key_type, keys=200, batch_size=50):
+    """
+    Store distinct public keys of a type by an owner in batches of `batch_size` keys.
+
+    Throughput is reported in transactions, so it is compared with `pub_key.store` one multiplied by batch size.
+    """
+    signer, = generate_signers(1)
+    account_address = get_account_address(signer)
+
+    requests = []
+    for batch_start in range(0, keys, batch_size):
+        payloads = [
+            generate_pub_key_payload(key_type, index)
+            for index in range(batch_start, min(batch_start + batch_size, keys))
+        ]
+
+        inputs = [
+            *(PubKeyHandler().make_address_from_data(getattr(payload, payload.WhichOneof('configuration')).key)
+              for payload in payloads),
+            account_address,
+            PubKeyHandler().make_owner_index_address(account_address),
+            ZERO_ADDRESS,
+            IS_NODE_ECONOMY_ENABLED_ADDRESS,
+        ]
+
+        # Stub context authorizes exact addresses only, so buckets the keys fill are listed instead of the prefix
+        outputs = inputs + [
+            PubKeyHandler().make_owner_index_bucket_address(account_address, bucket)
+            for bucket in range(
+                batch_start // PUB_KEYS_INDEX_BUCKET_SIZE,
+                (batch_start + len(payloads)) // PUB_KEYS_INDEX_BUCKET_SIZE,
+            )
+        ]
+
+        requests.append(create_request(
+            PubKeyHandler(), signer, PubKeyMethod.STORE_BATCH, NewPubKeyBatchPayload(pub_keys=payloads),
+            inputs, outputs,
+        ))
+
+    return Workload(
+        name=f'pub_key.store_batch.{key_type}',
+        handler=PubKeyHandler(),
+        requests=requests,
+        initial_state=get_accounts_state([signer]),
+    )
+
+
+def get_atomic_swap_state(signers):
+    swap_commission_setting = Setting()
+    swap_commission_setting.entries.add(key=SETTINGS_SWAP_COMMISSION, value=str(SWAP_COMMISSION_AMOUNT))
+
+    block_info_config = BlockInfoConfig()
+    block_info_config.latest_block = LATEST_BLOCK_NUMBER
+
+    block_info = BlockInfo()
+    block_info.block_num = LATEST_BLOCK_NUMBER
+    block_info.timestamp = int(datetime.datetime.now().timestamp())
+
+    return {
+        SWAP_COMMISSION_ADDRESS: swap_commission_setting.SerializeToString(),
+        CONFIG_ADDRESS: block_info_config.SerializeToString(),
+        LATEST_BLOCK_ADDRESS: block_info.SerializeToString(),
+        **get_accounts_state(signers),
+    }
+
+
+def atomic_swap_lifecycle(swaps=250, accounts=20, seed=0):
+    """
+    Run swaps initiated on REMchain through init, set lock, approve and close.
+
+    Initiator (Alice) opens the swap, the other party (Bob) sets the secret lock,
+    Alice approves the swap and Bob closes it with the secret key.
+    """
+    randomizer = random.Random(seed)
+    signers = generate_signers(accounts)
+    addresses = [get_account_address(signer) for signer in signers]
+
+    requests = []
+    for index in range(swaps):
+        initiator_index, receiver_index = randomizer.sample(range(accounts), 2)
+        initiator, receiver = signers[initiator_index], signers[receiver_index]
+        initiator_address, receiver_address = addresses[initiator_index], addresses[receiver_index]
+
+        swap_id = hash256(f'benchmark-swap-{seed}-{index}')
+        swap_address = AtomicSwapHandler().make_address_from_data(swap_id)
+        secret_key = hash256(f'benchmark-secret-{seed}-{index}')
+
+        init_inputs = [
+            SWAP_COMMISSION_ADDRESS, CONFIG_ADDRESS, LATEST_BLOCK_ADDRESS, initiator_address, ZERO_ADDRESS, swap_address,
+        ]
+        init_outputs = [swap_address, ZERO_ADDRESS, initiator_address]
+
+        requests.extend([
+            create_request(AtomicSwapHandler(), initiator, AtomicSwapMethod.INIT, AtomicSwapInitPayload(
+                receiver_address=receiver_address,
+                sender_address_non_local='0xe6ca0e7c974f06471759e9a05d18b538c5ced11e',
+                amount=SWAP_AMOUNT,
+                swap_id=swap_id,
+                created_at=int(datetime.datetime.now().timestamp()),
+            ), init_inputs, init_outputs),
+            create_request(AtomicSwapHandler(), receiver, AtomicSwapMethod.SET_SECRET_LOCK, AtomicSwapSetSecretLockPayload(
+                swap_id=swap_id,
+                secret_lock=web3_hash(secret_key),
+            ), [swap_address], [swap_address]),
+            create_request(AtomicSwapHandler(), initiator, AtomicSwapMethod.APPROVE, AtomicSwapApprovePayload(
+                swap_id=swap_id,
+            ), [swap_address], [swap_address]),
+            create_request(AtomicSwapHandler(), receiver, AtomicSwapMethod.CLOSE, AtomicSwapClosePayload(
+                swap_id=swap_id,
+                secret_key=secret_key,
+            ), [swap_address, receiver_address], [swap_address, receiver_address]),
+        ])
+
+    return Workload(
+        name='atomic_swap.lifecycle',
+        handler=AtomicSwapHandler(),
+        requests=requests,
+        initial_state=get_atomic_swap_state(signers),
+    )
+
+
+def atomic_swap_expire(swaps=200, batch_size=1):
+    """
+    Expire stale swaps of a single sender, one per transaction or `batch_size` swaps per bulk expiry.
+    """
+    signer, = generate_signers(1)
+    sender_address = get_account_address(signer)
+
+    initial_state = get_atomic_swap_state([signer])
+    created_at = int(datetime.datetime.now().timestamp()) - 2 * 24 * 60 * 60 - 1
+
+    swap_ids = [hash256(f'benchmark-stale-swap-{index}') for index in range(swaps)]
+    for swap_id in swap_ids:
+        swap_info = AtomicSwapInfo(
+            swap_id=swap_id, state=AtomicSwapInfo.OPENED, amount=SWAP_AMOUNT, created_at=created_at,
+            sender_address=sender_address, receiver_address=ZERO_ADDRESS, is_initiator=False,
+        )
+        initial_state[AtomicSwapHandler().make_address_from_data(swap_id)] = swap_info.SerializeToString()
+
+    requests = []
+    for batch_start in range(0, swaps, batch_size):
+        batch_swap_ids = swap_ids[batch_start:batch_start + batch_size]
+        swap_addresses = [AtomicSwapHandler().make_address_from_data(swap_id) for swap_id in batch_swap_ids]
+
+        inputs = [CONFIG_ADDRESS, LATEST_BLOCK_ADDRESS, sender_address, *swap_addresses]
+        outputs = [sender_address, *swap_addresses]
+
+        if batch_size == 1:
+            method, payload = AtomicSwapMethod.EXPIRE, AtomicSwapExpirePayload(swap_id=batch_swap_ids[0])
+        else:
+            method, payload = AtomicSwapMethod.EXPIRE_MANY, AtomicSwapExpireManyPayload(swap_ids=batch_swap_ids)
+
+        requests.append(create_request(AtomicSwapHandler(), signer, method, payload, inputs, outputs))
+
+    return Workload(
+        name=f'atomic_swap.expire.{batch_size}',
+        handler=AtomicSwapHandler(),
+        requests=requests,
+        initial_state=initial_state,
+    )
+
+
+def get_workloads(scale=1.0):
+    """
+    Get workload factories by their names, sizes are multiplied by scale.
+    """
+    def size(number):
+        return max(int(number * scale), 2)
+
+    return {
+        'account.transfer_storm.10': lambda: transfer_storm(accounts=10, transactions=size(1000)),
+        'account.transfer_storm.1000': lambda: transfer_storm(accounts=1000, transactions=size(1000)),
+        'account.bulk_transfer.50': lambda: bulk_transfer(transactions=size(100)),
+        'pub_key.store.rsa2048': lambda: pub_key_store('rsa2048', keys=size(50)),
+        'pub_key.store.rsa4096': lambda: pub_key_store('rsa4096', keys=size(20)),
+        'pub_key.store.ecdsa': lambda: pub_key_store('ecdsa', keys=size(200)),
+        'pub_key.store.ed25519': lambda: pub_key_store('ed25519', keys=size(200)),
+        'pub_key.store_batch.ecdsa': lambda: pub_key_store_batch('ecdsa', keys=size(200)),
+        'pub_key.store.stored_keys.10': lambda: pub_key_store_to_account(10, keys=size(10)),
+        'pub_key.store.stored_keys.1000': lambda: pub_key_store_to_account(1000, keys=size(10)),
+        'pub_key.store.stored_keys.100000': lambda: pub_key_store_to_account(100000, keys=size(10)),
+        'atomic_swap.lifecycle': lambda: atomic_swap_lifecycle(swaps=size(250)),
+        'atomic_swap.expire.1': lambda: atomic_swap_expire(swaps=size(200)),
+        'atomic_swap.expire.100': lambda: atomic_swap_expire(swaps=size(200), batch_size=100),
+    }
@@ -0,0 +1,117 @@
+"""
+Provide tests for handlers throughput benchmarks implementation.
+"""
+import json
+
+from remme.protos.account_pb2 import Account
+from remme.protos.atomic_swap_pb2 import AtomicSwapInfo
+from remme.tp.atomic_swap import AtomicSwapHandler
+from testing.benchmarks.__main__ import apply_workload, compare_results, main, run_workload
+from testing.benchmarks.workloads import (
+    INITIAL_BALANCE,
+    SWAP_AMOUNT,
+    atomic_swap_lifecycle,
+    pub_key_store,
+    transfer_storm,
+)
+
+
+def create_results(tx_per_second, peak_memory_kib):
+    return {
+        'workloads': {
+            'account.transfer_storm.10': {
+                'tx_per_second': tx_per_second,
+                'peak_memory_kib': peak_memory_kib,
+            },
+        },
+    }
+
+
+def test_transfer_storm_keeps_total_balance():
+    """
+    Case: apply transfer storm workload.
+    Expect: all transfers are valid, total balance of accounts is not changed.
+    """
+    workload = transfer_storm(accounts=5, transactions=20)
+
+    state = apply_workload(workload)
+
+    balances = [Account.FromString(state[address]).balance for address in workload.initial_state]
+    assert INITIAL_BALANCE * 5 == sum(balances)
+
+
+def test_atomic_swap_lifecycle_closes_swaps():
+    """
+    Case: apply atomic swap lifecycle workload.
+    Expect: all swaps are closed.
+    """
+    workload = atomic_swap_lifecycle(swaps=3, accounts=2)
+
+    state = apply_workload(workload)
+
+    swap_addresses = {request.header.outputs[0] for request in workload.requests}
+    swaps = [AtomicSwapInfo.FromString(state[address]) for address in swap_addresses]
+
+    assert 3 == len(swaps)
+    assert all(AtomicSwapInfo.CLOSED == swap.state and SWAP_AMOUNT == swap.amount for swap in swaps)
+    assert all(address.startswith(AtomicSwapHandler().namespaces[0]) for address in swap_addresses)
+
+
+def test_run_workload_results():
+    """
+    Case: run public keys storing workload.
+    Expect: throughput, latencies and allocations are measured for all transactions.
+    """
+    results = run_workload(pub_key_store('ed25519', keys=4, owners=2), repeat=2)
+
+    assert 4 == results['transactions']
+    assert results['tx_per_second'] > 0
+    assert results['p99_ms'] >= results['p50_ms'] > 0
+    assert results['peak_memory_kib'] > 0
+
+
+def test_compare_results_flags_regressions():
+    """
+    Case: compare results, which throughput and memory are worse than the baseline ones by more than threshold.
+    Expect: both metrics are flagged as regressions.
+    """
+    regressions = compare_results(create_results(1000, 100), create_results(800, 120), threshold=0.1)
+
+    assert [
+        ('account.transfer_storm.10', 'tx_per_second', 1000, 800),
+        ('account.transfer_storm.10', 'peak_memory_kib', 100, 120),
+    ] == regressions
+
+
+def test_compare_results_within_threshold():
+    """
+    Case: compare results, which are better than the baseline ones or worse by less than threshold.
+    Expect: no regressions, workloads missed in the baseline are not compared.
+    """
+    results = create_results(950, 50)
+    results['workloads']['atomic_swap.lifecycle'] = {'tx_per_second': 1, 'peak_memory_kib': 10 ** 6}
+
+    assert [] == compare_results(create_results(1000, 100), results, threshold=0.1)
+
+
+def test_main_writes_and_compares_baseline(tmpdir):
+    """
+    Case: run benchmarks writing a baseline, then compare with a baseline of much higher throughput.
+    Expect: the baseline is written, the comparison exits with regressions code.
+    """
+    baseline_path = str(tmpdir.join('baseline.json'))
+    args = ['--workload', 'account.transfer_storm.10', '--scale', '0.01', '--repeat', '1']
+
+    assert 0 == main(args + ['--output', baseline_path])
+
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    assert 10 == baseline['workloads']['account.transfer_storm.10']['transactions']
+
+    baseline['workloads']['account.transfer_storm.10']['tx_per_second'] *= 1000
+
+    with open(baseline_path, 'w') as baseline_file:
+        json.dump(baseline, baseline_file)
+
+    assert 1 == main(args + ['--compare', baseline_path])
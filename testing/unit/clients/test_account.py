@@ -0,0 +1,184 @@
+"""
+Provide tests for account client public keys listing implementation.
+"""
+import pytest
+
+from remme.clients.account import AccountClient
+from remme.clients.basic import BasicClient
+from remme.protos.account_pb2 import Account
+from remme.protos.pub_key_pb2 import PubKeyOwnerIndex, PubKeyOwnerIndexBucket
+from remme.shared.exceptions import KeyNotFound
+from remme.tp.pub_key import PUB_KEYS_INDEX_BUCKET_SIZE, PubKeyHandler
+
+ACCOUNT_ADDRESS = '112007b9433e1da5c624ff926477141abedfd57585a36590b0a8edc4104ef28093ee30'
+
+ACCOUNT_PUBLIC_KEY_ADDRESSES = [PubKeyHandler().make_address_from_data(f'account-key-{index}') for index in range(3)]
+INDEX_PUBLIC_KEY_ADDRESSES = [
+    PubKeyHandler().make_address_from_data(f'index-key-{index}') for index in range(2 * PUB_KEYS_INDEX_BUCKET_SIZE + 5)
+]
+
+
+def create_state(account_public_key_addresses, index_public_key_addresses):
+    account = Account(balance=100, pub_keys=account_public_key_addresses)
+    state = {ACCOUNT_ADDRESS: account.SerializeToString()}
+
+    buckets_count = len(index_public_key_addresses) // PUB_KEYS_INDEX_BUCKET_SIZE
+    for bucket in range(buckets_count):
+        bucket_public_key_addresses = index_public_key_addresses[
+            bucket * PUB_KEYS_INDEX_BUCKET_SIZE:(bucket + 1) * PUB_KEYS_INDEX_BUCKET_SIZE
+        ]
+        address = PubKeyHandler().make_owner_index_bucket_address(ACCOUNT_ADDRESS, bucket)
+        state[address] = PubKeyOwnerIndexBucket(pub_keys=bucket_public_key_addresses).SerializeToString()
+
+    if index_public_key_addresses:
+        owner_index = PubKeyOwnerIndex(
+            buckets_count=buckets_count,
+            pub_keys=index_public_key_addresses[buckets_count * PUB_KEYS_INDEX_BUCKET_SIZE:],
+        )
+        state[PubKeyHandler().make_owner_index_address(ACCOUNT_ADDRESS)] = owner_index.SerializeToString()
+
+    return state
+
+
+@pytest.fixture
+def account_client(mocker):
+    """
+    Get account client reading values from the state, that is set by `client.state = {...}`, with fetched addresses
+    and state roots they are read at.
+    """
+    mocker.patch.object(BasicClient, '__init__', return_value=None)
+
+    client = AccountClient()
+    client.state = {}
+    client.fetched_addresses = []
+    client.fetched_state_roots = []
+    client.state_roots = iter(f'state-root-{number}' for number in range(1000))
+
+    async def get_state_root():
+        return next(client.state_roots)
+
+    async def get_value(address, state_root=None):
+        client.fetched_addresses.append(address)
+        client.fetched_state_roots.append(state_root)
+        try:
+            return client.state[address]
+        except KeyError:
+            raise KeyNotFound(f'Block for address `{address}` not found.')
+
+    client.get_state_root = get_state_root
+    client.get_value = get_value
+    return client
+
+
+@pytest.mark.asyncio
+async def test_get_pub_keys_of_account_and_index(account_client):
+    """
+    Case: get all public keys of the account with keys linked to the account and stored in the index.
+    Expect: index public keys followed by the account ones in order of storing.
+    """
+    account_client.state = create_state(ACCOUNT_PUBLIC_KEY_ADDRESSES, INDEX_PUBLIC_KEY_ADDRESSES)
+
+    assert INDEX_PUBLIC_KEY_ADDRESSES + ACCOUNT_PUBLIC_KEY_ADDRESSES == \
+        await account_client.get_pub_keys(ACCOUNT_ADDRESS)
+
+
+@pytest.mark.asyncio
+async def test_get_pub_keys_pages(account_client):
+    """
+    Case: get public keys of the account page by page with different limits.
+    Expect: pages joined are all public keys of the account, pages out of range are empty.
+    """
+    account_client.state = create_state(ACCOUNT_PUBLIC_KEY_ADDRESSES, INDEX_PUBLIC_KEY_ADDRESSES)
+    expected_public_key_addresses = INDEX_PUBLIC_KEY_ADDRESSES + ACCOUNT_PUBLIC_KEY_ADDRESSES
+
+    for limit in (1, 2, 7, PUB_KEYS_INDEX_BUCKET_SIZE, PUB_KEYS_INDEX_BUCKET_SIZE + 1, 1000):
+        public_key_addresses = []
+        for start in range(0, len(expected_public_key_addresses), limit):
+            public_key_addresses.extend(await account_client.get_pub_keys(ACCOUNT_ADDRESS, start, limit))
+
+        assert expected_public_key_addresses == public_key_addresses
+
+    assert [] == await account_client.get_pub_keys(ACCOUNT_ADDRESS, len(expected_public_key_addresses), 10)
+    assert [] == await account_client.get_pub_keys(ACCOUNT_ADDRESS, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_get_pub_keys_page_fetches_its_buckets_only(account_client):
+    """
+    Case: get page of public keys of the account, that falls into a single bucket of the index.
+    Expect: only the account, the index and the bucket of the page are fetched.
+    """
+    account_client.state = create_state([], INDEX_PUBLIC_KEY_ADDRESSES)
+
+    start = PUB_KEYS_INDEX_BUCKET_SIZE + 1
+
+    assert INDEX_PUBLIC_KEY_ADDRESSES[start:start + 10] == \
+        await account_client.get_pub_keys(ACCOUNT_ADDRESS, start, 10)
+
+    assert sorted([
+        ACCOUNT_ADDRESS,
+        PubKeyHandler().make_owner_index_address(ACCOUNT_ADDRESS),
+        PubKeyHandler().make_owner_index_bucket_address(ACCOUNT_ADDRESS, 1),
+    ]) == sorted(account_client.fetched_addresses)
+
+
+@pytest.mark.asyncio
+async def test_get_pub_keys_reads_at_single_state_root(account_client):
+    """
+    Case: get page of public keys of the account, that spans several buckets of the index and the account.
+    Expect: the account, the index and the buckets are read at the same state root.
+    """
+    account_client.state = create_state(ACCOUNT_PUBLIC_KEY_ADDRESSES, INDEX_PUBLIC_KEY_ADDRESSES)
+
+    await account_client.get_pub_keys(ACCOUNT_ADDRESS)
+
+    assert 5 == len(account_client.fetched_addresses)
+    assert {'state-root-0'} == set(account_client.fetched_state_roots)
+
+
+@pytest.mark.asyncio
+async def test_get_pub_keys_pages_keep_positions_after_account_stores(account_client):
+    """
+    Case: get pages of public keys of the account with the index, after family version 0.1 stores append keys
+        to the account and after the next 0.2 store moves them to the index.
+    Expect: public keys listed before keep their positions, the new ones follow them.
+    """
+    limit = 7
+    index_public_key_addresses = INDEX_PUBLIC_KEY_ADDRESSES[:PUB_KEYS_INDEX_BUCKET_SIZE + 3]
+    stored_public_key_address = PubKeyHandler().make_address_from_data('stored-key')
+
+    account_client.state = create_state([], index_public_key_addresses)
+    pages = [
+        await account_client.get_pub_keys(ACCOUNT_ADDRESS, start, limit)
+        for start in range(0, len(index_public_key_addresses), limit)
+    ]
+
+    account_client.state = create_state(ACCOUNT_PUBLIC_KEY_ADDRESSES, index_public_key_addresses)
+    pages_after_account_stores = [
+        await account_client.get_pub_keys(ACCOUNT_ADDRESS, start, limit)
+        for start in range(0, len(index_public_key_addresses) + len(ACCOUNT_PUBLIC_KEY_ADDRESSES), limit)
+    ]
+
+    account_client.state = create_state(
+        [], index_public_key_addresses + ACCOUNT_PUBLIC_KEY_ADDRESSES + [stored_public_key_address],
+    )
+    pages_after_index_store = [
+        await account_client.get_pub_keys(ACCOUNT_ADDRESS, start, limit)
+        for start in range(0, len(index_public_key_addresses) + len(ACCOUNT_PUBLIC_KEY_ADDRESSES) + 1, limit)
+    ]
+
+    assert pages[:-1] == pages_after_account_stores[:len(pages) - 1]
+    assert index_public_key_addresses + ACCOUNT_PUBLIC_KEY_ADDRESSES == \
+        [address for page in pages_after_account_stores for address in page]
+    assert pages_after_account_stores[:-1] == pages_after_index_store[:len(pages_after_account_stores) - 1]
+    assert index_public_key_addresses + ACCOUNT_PUBLIC_KEY_ADDRESSES + [stored_public_key_address] == \
+        [address for page in pages_after_index_store for address in page]
+
+
+@pytest.mark.asyncio
+async def test_get_pub_keys_of_not_existing_account(account_client):
+    """
+    Case: get public keys of the account that does not exist.
+    Expect: empty list.
+    """
+    assert [] == await account_client.get_pub_keys(ACCOUNT_ADDRESS)
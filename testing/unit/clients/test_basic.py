@@ -0,0 +1,45 @@
+"""
+Provide tests for basic client transactions family version implementation.
+"""
+import pytest
+
+from remme.clients.basic import BasicClient
+from remme.protos.account_pb2 import AccountMethod
+from remme.protos.atomic_swap_pb2 import AtomicSwapMethod
+from remme.shared.exceptions import ClientException
+from remme.tp.account import AccountHandler
+from remme.tp.atomic_swap import AtomicSwapHandler
+
+
+@pytest.mark.parametrize('family_handler, method, expected_family_version', [
+    (AccountHandler, AccountMethod.GENESIS, '0.1'),
+    (AccountHandler, AccountMethod.TRANSFER, '0.1'),
+    (AccountHandler, AccountMethod.BULK_TRANSFER, '0.2'),
+    (AtomicSwapHandler, AtomicSwapMethod.EXPIRE, '0.1'),
+    (AtomicSwapHandler, AtomicSwapMethod.EXPIRE_MANY, '0.2'),
+])
+def test_get_family_version_of_method(mocker, family_handler, method, expected_family_version):
+    """
+    Case: get family version transactions of the method are sent with.
+    Expect: the earliest family version processing the method.
+    """
+    mocker.patch.object(BasicClient, '__init__', return_value=None)
+
+    client = BasicClient()
+    client._family_handler = family_handler()
+
+    assert expected_family_version == client.get_family_version(method)
+
+
+def test_get_family_version_of_not_processed_method(mocker):
+    """
+    Case: get family version transactions of a method not processed by the family are sent with.
+    Expect: client exception is raised.
+    """
+    mocker.patch.object(BasicClient, '__init__', return_value=None)
+
+    client = BasicClient()
+    client._family_handler = AccountHandler()
+
+    with pytest.raises(ClientException):
+        client.get_family_version(100)
@@ -94,3 +94,29 @@ def test_validate_atomic_swap_invalid_from_block(invalid_atomic_swap_from_block_
     assert 'Invalid params' == str(error.value)
 
 
+
+
+def test_prepare_response_expire_many():
+    """
+    Case: prepare response of bulk expiry event, changing several swaps, with and without swap identifier filter.
+    Expect: every swap is a separate notification, only the subscribed one is returned if identifier is specified.
+    """
+    other_swap_id = 'f' * VALID_SWAP_ID_LENGTH
+
+    def get_state():
+        return [
+            {'address': 'swap-address', 'type': 'AtomicSwapInfo', 'swap_id': VALID_SWAP_ID, 'state': 'EXPIRED'},
+            {'address': 'other-swap-address', 'type': 'AtomicSwapInfo', 'swap_id': other_swap_id, 'state': 'EXPIRED'},
+            {'address': 'sender-address', 'type': 'Account', 'balance': '400'},
+        ]
+
+    assert [
+        {'address': 'swap-address', 'swap_id': VALID_SWAP_ID, 'state': 'EXPIRED'},
+        {'address': 'other-swap-address', 'swap_id': other_swap_id, 'state': 'EXPIRED'},
+    ] == atomic_swap_event_handler.prepare_response(get_state(), {'id': None})
+
+    assert {
+        'address': 'other-swap-address', 'swap_id': other_swap_id, 'state': 'EXPIRED',
+    } == atomic_swap_event_handler.prepare_response(get_state(), {'id': other_swap_id})
+
+    assert not atomic_swap_event_handler.prepare_response(get_state(), {'id': '0' * VALID_SWAP_ID_LENGTH})
@@ -59,3 +59,32 @@ def test_validate_invalid_id(invalid_transfer_address):
         })
 
     assert 'Invalid params' == str(error.value)
+
+
+def test_prepare_response_bulk_transfer():
+    """
+    Case: prepare response of bulk transfer event for the sender and for one of the receivers.
+    Expect: sender gets the list of receivers, receiver gets its own transfer only.
+    """
+    sender, first_receiver, second_receiver = ['112007' + str(index) * 64 for index in range(3)]
+
+    state = [
+        {'address': sender, 'balance': '700'},
+        {'address': first_receiver, 'balance': '100'},
+        {'address': second_receiver, 'balance': '200'},
+    ]
+
+    assert {
+        'from': {'address': sender, 'balance': 700.0},
+        'to': [
+            {'address': first_receiver, 'balance': 100.0},
+            {'address': second_receiver, 'balance': 200.0},
+        ],
+    } == transfer_event_handler.prepare_response(state, {'address': sender})
+
+    assert {
+        'from': {'address': sender, 'balance': 700.0},
+        'to': {'address': second_receiver, 'balance': 200.0},
+    } == transfer_event_handler.prepare_response(state, {'address': second_receiver})
+
+    assert transfer_event_handler.prepare_response(state, {'address': VALID_ADDRESS}) is None
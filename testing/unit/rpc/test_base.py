@@ -0,0 +1,293 @@
+"""
+Provide tests for JSON-RPC server batch requests handling implementation.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from aiohttp_json_rpc.exceptions import (
+    RpcInvalidParamsError,
+    RpcInvalidRequestError,
+)
+from aiohttp_json_rpc.protocol import (
+    decode_msg,
+    encode_result,
+)
+
+from remme.rpc_api._base import JsonRpc, decode_batch_entry
+from remme.shared.messaging import ConnectionPool
+from remme.rpc_api.utils import (
+    encode_raw_result,
+    raw_response,
+)
+
+ZMQ_URL = 'tcp://localhost:4004'
+
+
+async def echo(request):
+    return request.params
+
+
+async def fail(request):
+    raise RpcInvalidParamsError(message='Invalid params')
+
+
+def create_rpc(*methods, batch_concurrency=10, batch_max_size=100):
+    rpc = JsonRpc(zmq_url=ZMQ_URL, batch_concurrency=batch_concurrency, batch_max_size=batch_max_size)
+    rpc.add_methods(*(('', method) for method in (echo, fail, *methods)))
+    return rpc, SimpleNamespace(methods=rpc.methods)
+
+
+def create_request(msg_id, method, params=None):
+    return {'jsonrpc': '2.0', 'id': msg_id, 'method': method, 'params': params}
+
+
+@pytest.mark.asyncio
+async def test_rpc_startup_and_shutdown(mocker):
+    """
+    Case: start up and shut down the application of the JSON-RPC server.
+    Expect: connection pool and metrics reporting exist between start up and shut down only, the pool is closed.
+    """
+    mock_close = mocker.patch.object(ConnectionPool, 'close')
+
+    rpc, _ = create_rpc()
+
+    assert rpc._zmq_pool is None
+    assert rpc._report_metrics_task is None
+
+    await rpc.on_startup(app=None)
+    report_metrics_task = rpc._report_metrics_task
+
+    assert isinstance(rpc._zmq_pool, ConnectionPool)
+    assert not report_metrics_task.done()
+
+    await rpc.on_shutdown(app=None)
+
+    assert report_metrics_task.cancelled()
+    assert rpc._zmq_pool is None
+    assert rpc._report_metrics_task is None
+    mock_close.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_handle_rpc_batch():
+    """
+    Case: send batch of requests, some of which are failed, and an invalid entry.
+    Expect: array of results and errors of the entries is returned in the order of the entries.
+    """
+    rpc, http_request = create_rpc()
+
+    response = await rpc._handle_rpc_batch(http_request, json.dumps([
+        create_request(1, 'echo', {'address': '112007'}),
+        create_request(2, 'fail'),
+        create_request(3, 'unknown'),
+        'invalid',
+        create_request(4, 'echo', ['112007']),
+    ]))
+
+    assert [
+        {'jsonrpc': '2.0', 'id': 1, 'result': {'address': '112007'}},
+        {'jsonrpc': '2.0', 'id': 2, 'error': {'code': -32602, 'message': 'Invalid params'}},
+        {'jsonrpc': '2.0', 'id': 3, 'error': {'code': -32601, 'message': 'Method not found'}},
+        {'jsonrpc': '2.0', 'error': {'code': -32600, 'message': 'Invalid request'}},
+        {'jsonrpc': '2.0', 'id': 4, 'result': ['112007']},
+    ] == json.loads(response)
+
+
+@pytest.mark.asyncio
+async def test_handle_rpc_batch_with_notifications():
+    """
+    Case: send batch of requests and notifications, one of which is failed.
+    Expect: notifications are processed, array of results of the requests only is returned.
+    """
+    notified = []
+
+    async def notify(request):
+        notified.append(request.params)
+
+    rpc, http_request = create_rpc(notify)
+
+    response = await rpc._handle_rpc_batch(http_request, json.dumps([
+        create_request(1, 'echo', ['112007']),
+        {'jsonrpc': '2.0', 'method': 'notify', 'params': ['112007']},
+        {'jsonrpc': '2.0', 'method': 'fail'},
+        create_request(2, 'notify'),
+    ]))
+
+    assert [
+        {'jsonrpc': '2.0', 'id': 1, 'result': ['112007']},
+        {'jsonrpc': '2.0', 'id': 2, 'result': None},
+    ] == json.loads(response)
+    assert [['112007'], None] == notified
+
+
+@pytest.mark.asyncio
+async def test_handle_rpc_batch_of_notifications():
+    """
+    Case: send batch of notifications only.
+    Expect: notifications are processed, nothing is returned.
+    """
+    notified = []
+
+    async def notify(request):
+        notified.append(request.params)
+
+    rpc, http_request = create_rpc(notify)
+
+    response = await rpc._handle_rpc_batch(http_request, json.dumps([
+        {'jsonrpc': '2.0', 'method': 'notify', 'params': [1]},
+        {'jsonrpc': '2.0', 'method': 'notify', 'params': [2], 'id': None},
+    ]))
+
+    assert response is None
+    assert [[1], [2]] == sorted(notified)
+
+
+@pytest.mark.asyncio
+async def test_handle_rpc_batch_notifications_results_are_not_encoded(mocker):
+    """
+    Case: send batch of notifications to the method returning JSON encoded result itself and to the failing one.
+    Expect: methods are called, their results and errors are neither encoded nor returned.
+    """
+    notified = []
+
+    @raw_response
+    async def notify_raw(request):
+        notified.append(request.params)
+        return encode_raw_result(request.msg.data['id'], json.dumps(request.params))
+
+    rpc, http_request = create_rpc(notify_raw)
+    mock_process_rpc_msg = mocker.spy(rpc, '_process_rpc_msg')
+
+    response = await rpc._handle_rpc_batch(http_request, json.dumps([
+        {'jsonrpc': '2.0', 'method': 'notify_raw', 'params': [1]},
+        {'jsonrpc': '2.0', 'method': 'fail'},
+        {'jsonrpc': '2.0', 'method': 'unknown'},
+    ]))
+
+    assert response is None
+    assert [[1]] == notified
+    mock_process_rpc_msg.assert_not_called()
+
+
+@pytest.mark.parametrize('entry', [
+    create_request(1, 'echo', ['112007']),
+    {'jsonrpc': '2.0', 'method': 'echo'},
+    {'jsonrpc': '2.0', 'method': 'echo', 'id': None},
+    {'jsonrpc': '2.0', 'id': 1, 'result': ['112007']},
+])
+def test_decode_batch_entry(entry):
+    """
+    Case: decode already parsed entries of a batch.
+    Expect: messages are the ones decoded from entries serialized to JSON.
+    """
+    expected_msg = decode_msg(json.dumps(entry))
+
+    msg = decode_batch_entry(dict(entry))
+
+    assert expected_msg.type == msg.type
+    assert expected_msg.data == msg.data
+
+
+@pytest.mark.parametrize('entry', [
+    'invalid',
+    ['112007'],
+    {'id': 1, 'method': 'echo'},
+    {'jsonrpc': '1.0', 'id': 1, 'method': 'echo'},
+    {'jsonrpc': '2.0', 'id': 1},
+    {'jsonrpc': '2.0', 'id': 1, 'method': 'echo', 'result': None},
+])
+def test_decode_invalid_batch_entry(entry):
+    """
+    Case: decode invalid entries of a batch.
+    Expect: invalid request error is raised.
+    """
+    with pytest.raises(RpcInvalidRequestError):
+        decode_batch_entry(entry)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('raw_msg, expected_error', [
+    ('[', {'code': -32700, 'message': 'Invalid JSON was received'}),
+    ('[]', {'code': -32600, 'message': 'Invalid request'}),
+])
+async def test_handle_invalid_rpc_batch(raw_msg, expected_error):
+    """
+    Case: send batch request, which is not a valid JSON or is an empty array.
+    Expect: single error is returned.
+    """
+    rpc, http_request = create_rpc()
+
+    response = await rpc._handle_rpc_batch(http_request, raw_msg)
+
+    assert {'jsonrpc': '2.0', 'error': expected_error} == json.loads(response)
+
+
+@pytest.mark.asyncio
+async def test_handle_rpc_batch_exceeding_max_size():
+    """
+    Case: send batch of three requests to the server with the maximum batch size of two entries.
+    Expect: none of requests is processed, single invalid request error is returned.
+    """
+    processed = []
+
+    async def process(request):
+        processed.append(request.msg.data['id'])
+
+    rpc, http_request = create_rpc(process, batch_max_size=2)
+
+    response = await rpc._handle_rpc_batch(http_request, json.dumps([
+        create_request(msg_id, 'process') for msg_id in range(3)
+    ]))
+
+    assert {
+        'jsonrpc': '2.0',
+        'error': {'code': -32600, 'message': 'Batch should not have more than 2 entries'},
+    } == json.loads(response)
+    assert [] == processed
+
+
+@pytest.mark.asyncio
+async def test_handle_rpc_batch_concurrently():
+    """
+    Case: send batch of requests to the server with the batch concurrency of two entries.
+    Expect: entries are processed concurrently, no more than two at once.
+    """
+    processing = []
+    max_processing = []
+
+    async def sleep(request):
+        processing.append(request.msg.data['id'])
+        max_processing.append(len(processing))
+        await asyncio.sleep(0.01)
+        processing.remove(request.msg.data['id'])
+        return request.msg.data['id']
+
+    rpc, http_request = create_rpc(sleep, batch_concurrency=2)
+
+    response = await rpc._handle_rpc_batch(http_request, json.dumps([
+        create_request(msg_id, 'sleep') for msg_id in range(5)
+    ]))
+
+    assert list(range(5)) == [entry['result'] for entry in json.loads(response)]
+    assert 2 == max(max_processing)
+
+
+@pytest.mark.asyncio
+async def test_process_raw_response_rpc_msg():
+    """
+    Case: send request to the method, which result is encoded to JSON by the method itself.
+    Expect: response is identical to the one of the method returning not encoded result.
+    """
+    @raw_response
+    async def echo_raw(request):
+        return encode_raw_result(request.msg.data['id'], json.dumps(request.params))
+
+    rpc, http_request = create_rpc(echo_raw)
+
+    response = await rpc._process_rpc_msg(http_request, decode_msg(json.dumps(
+        create_request('1', 'echo_raw', {'data': ['✓']}),
+    )))
+
+    assert encode_result('1', {'data': ['✓']}) == response
@@ -0,0 +1,36 @@
+"""
+Provide tests for RPC API raw transaction payload validation implementation.
+"""
+import pytest
+
+from remme.protos.pub_key_pb2 import NewPubKeyBatchPayload, PubKeyMethod
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.rpc_api.transaction import _get_proto_errors
+from remme.tp.pub_key import FAMILY_VERSIONS, PubKeyHandler
+
+
+def create_store_batch_payload():
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = PubKeyMethod.STORE_BATCH
+    transaction_payload.data = NewPubKeyBatchPayload().SerializeToString()
+    return transaction_payload
+
+
+def test_get_proto_errors_of_family_version_method():
+    """
+    Case: get validation errors of payload of the method processed by the transaction family version.
+    Expect: protobuf class of the method and errors of the payload data are returned.
+    """
+    pb_class, errors = _get_proto_errors(PubKeyHandler(), FAMILY_VERSIONS[-1], create_store_batch_payload())
+
+    assert NewPubKeyBatchPayload is pb_class
+    assert errors
+
+
+@pytest.mark.parametrize('family_version', [FAMILY_VERSIONS[0], '100.0'])
+def test_get_proto_errors_of_method_not_processed_by_family_version(family_version):
+    """
+    Case: get validation errors of payload of the method not processed by the transaction family version.
+    Expect: payload is not validated, as it is rejected by the transaction processor.
+    """
+    assert (None, None) == _get_proto_errors(PubKeyHandler(), family_version, create_store_batch_payload())
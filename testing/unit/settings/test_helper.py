@@ -0,0 +1,87 @@
+"""
+Provide tests for settings helper values cache implementation.
+"""
+import pytest
+
+from remme.settings import SETTINGS_SWAP_COMMISSION
+from remme.settings.helper import (
+    SETTINGS_CACHE_SIZE,
+    _get_setting_value,
+    _make_settings_key,
+    get_setting_from_key_value,
+)
+from remme.settings import helper
+from remme.shared.utils import LRUCache
+from remme.tp.context import CacheContextService
+from testing.mocks.stub import StubContext
+
+SWAP_COMMISSION_ADDRESS = _make_settings_key(SETTINGS_SWAP_COMMISSION)
+
+
+@pytest.fixture
+def setting_values(monkeypatch):
+    """
+    Replace setting values cache with an empty one for the test duration.
+    """
+    cache = LRUCache(maxsize=SETTINGS_CACHE_SIZE)
+    monkeypatch.setattr(helper, '_setting_values', cache)
+    return cache
+
+
+def create_context_service(swap_commission):
+    mock_context = StubContext(inputs=[SWAP_COMMISSION_ADDRESS], outputs=[SWAP_COMMISSION_ADDRESS], initial_state={
+        SWAP_COMMISSION_ADDRESS: get_setting_from_key_value(
+            SETTINGS_SWAP_COMMISSION, swap_commission,
+        ).SerializeToString(),
+    })
+
+    return CacheContextService(context=mock_context)
+
+
+def test_get_setting_value_reuses_parsed_values(setting_values):
+    """
+    Case: get setting value in contexts of different transactions with the same setting entry.
+    Expect: setting entry is parsed once, the value is got from the cache afterwards.
+    """
+    assert '100' == _get_setting_value(create_context_service(100), SETTINGS_SWAP_COMMISSION)
+    assert '100' == _get_setting_value(create_context_service(100), SETTINGS_SWAP_COMMISSION)
+
+    assert 1 == setting_values.info().hits
+
+
+def test_get_setting_value_of_different_state(setting_values):
+    """
+    Case: get setting value in contexts of transactions executed against different states (e.g. forks).
+    Expect: value of the setting entry in the context state is returned.
+    """
+    assert '100' == _get_setting_value(create_context_service(100), SETTINGS_SWAP_COMMISSION)
+    assert '200' == _get_setting_value(create_context_service(200), SETTINGS_SWAP_COMMISSION)
+    assert '100' == _get_setting_value(create_context_service(100), SETTINGS_SWAP_COMMISSION)
+
+
+def test_get_setting_value_default(setting_values):
+    """
+    Case: get value of the setting, that is not presented in state.
+    Expect: default value is returned.
+    """
+    context_service = CacheContextService(context=StubContext(
+        inputs=[SWAP_COMMISSION_ADDRESS], outputs=[SWAP_COMMISSION_ADDRESS], initial_state={},
+    ))
+
+    assert 'default' == _get_setting_value(context_service, SETTINGS_SWAP_COMMISSION, 'default')
+
+
+def test_get_setting_value_after_set_settings_address(setting_values):
+    """
+    Case: set setting entry through the context service after its value is got.
+    Expect: new value is returned, as the written entry differs from the one cached values were parsed from.
+    """
+    context_service = create_context_service(100)
+
+    assert '100' == _get_setting_value(context_service, SETTINGS_SWAP_COMMISSION)
+
+    context_service.set_state({
+        SWAP_COMMISSION_ADDRESS: get_setting_from_key_value(SETTINGS_SWAP_COMMISSION, 200).SerializeToString(),
+    })
+
+    assert '200' == _get_setting_value(context_service, SETTINGS_SWAP_COMMISSION)
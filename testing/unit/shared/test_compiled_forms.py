@@ -0,0 +1,132 @@
+"""
+Provide tests for protobuf validators compiled from forms implementation.
+"""
+import pytest
+from wtforms import fields, validators
+
+from remme.protos.account_pb2 import BulkTransferPayload, TransferPayload
+from remme.protos.atomic_swap_pb2 import AtomicSwapExpireManyPayload, AtomicSwapInitPayload
+from remme.protos.pub_key_pb2 import NewPubKeyBatchPayload, NewPubKeyPayload, NewPubKeyStoreAndPayPayload
+from remme.settings import ZERO_ADDRESS
+from remme.shared.forms import (
+    AtomicSwapExpireManyPayloadForm,
+    AtomicSwapInitPayloadForm,
+    BulkTransferPayloadForm,
+    NewPubKeyBatchPayloadForm,
+    NewPubKeyStoreAndPayPayloadForm,
+    NewPublicKeyPayloadForm,
+    ProtoForm,
+    TransferPayloadForm,
+    get_proto_validator,
+)
+from remme.shared.forms.compiled import CompiledProtoValidator, FormProtoValidator
+from remme.tp.handlers import TP_HANDLERS
+
+ADDRESS = '112007' + 'a' * 64
+
+RSA_CONFIGURATION = NewPubKeyPayload.RSAConfiguration(key=b'\x30\x82\x01\x22', padding=1)
+
+NEW_PUB_KEY_PAYLOAD = NewPubKeyPayload(
+    entity_hash=b'entity-hash',
+    entity_hash_signature=b'entity-hash-signature',
+    valid_from=1540000000,
+    valid_to=1570000000,
+    rsa=RSA_CONFIGURATION,
+)
+
+PAYLOADS = [
+    (TransferPayloadForm, TransferPayload(address_to=ADDRESS, value=100)),
+    (TransferPayloadForm, TransferPayload(address_to=ADDRESS[:-1], value=0)),
+    (TransferPayloadForm, TransferPayload(address_to=ZERO_ADDRESS, value=1)),
+    (TransferPayloadForm, TransferPayload(address_to=' ', value=1)),
+    (BulkTransferPayloadForm, BulkTransferPayload(transfers=[
+        TransferPayload(address_to=ADDRESS, value=100), TransferPayload(address_to=ZERO_ADDRESS, value=1),
+    ])),
+    (BulkTransferPayloadForm, BulkTransferPayload(transfers=[
+        TransferPayload(address_to=ADDRESS, value=100), TransferPayload(address_to=ADDRESS[:-1], value=0),
+    ])),
+    (BulkTransferPayloadForm, BulkTransferPayload()),
+    (BulkTransferPayloadForm, BulkTransferPayload(transfers=[TransferPayload(address_to=' ')] * 101)),
+    (AtomicSwapInitPayloadForm, AtomicSwapInitPayload(
+        receiver_address=ADDRESS, sender_address_non_local='0xe6ca0e7c974f06471759e9a05d18b538c5ced11e',
+        amount=200, swap_id='f' * 64, created_at=1540000000,
+    )),
+    (AtomicSwapInitPayloadForm, AtomicSwapInitPayload(swap_id='swap', secret_lock_by_solicitor='0')),
+    (AtomicSwapExpireManyPayloadForm, AtomicSwapExpireManyPayload(swap_ids=['f' * 64, 'e' * 64])),
+    (AtomicSwapExpireManyPayloadForm, AtomicSwapExpireManyPayload(swap_ids=['f' * 64, '', ' ', 'swap'])),
+    (AtomicSwapExpireManyPayloadForm, AtomicSwapExpireManyPayload()),
+    (NewPublicKeyPayloadForm, NEW_PUB_KEY_PAYLOAD),
+    (NewPublicKeyPayloadForm, NewPubKeyPayload(valid_from=1, hashing_algorithm=5)),
+    (NewPublicKeyPayloadForm, NewPubKeyPayload(
+        ecdsa=NewPubKeyPayload.ECDSAConfiguration(key=b'', ec=3),
+    )),
+    (NewPublicKeyPayloadForm, NewPubKeyPayload(ed25519=NewPubKeyPayload.Ed25519Configuration(key=b'key'))),
+    (NewPubKeyStoreAndPayPayloadForm, NewPubKeyStoreAndPayPayload(
+        pub_key_payload=NEW_PUB_KEY_PAYLOAD, owner_public_key=b'owner', signature_by_owner=b'signature',
+    )),
+    (NewPubKeyStoreAndPayPayloadForm, NewPubKeyStoreAndPayPayload(owner_public_key=b'owner')),
+    (NewPubKeyBatchPayloadForm, NewPubKeyBatchPayload(pub_keys=[NEW_PUB_KEY_PAYLOAD] * 2)),
+    (NewPubKeyBatchPayloadForm, NewPubKeyBatchPayload(pub_keys=[
+        NEW_PUB_KEY_PAYLOAD, NewPubKeyPayload(valid_from=1, hashing_algorithm=5),
+    ])),
+    (NewPubKeyBatchPayloadForm, NewPubKeyBatchPayload()),
+]
+
+
+def validate_with_form(form_class, pb):
+    form = form_class.load_proto(pb)
+    return form.validate(), form.errors
+
+
+@pytest.mark.parametrize('form_class, pb', PAYLOADS)
+def test_compiled_validator_errors_match_form(form_class, pb):
+    """
+    Case: validate valid and invalid payloads with compiled validator.
+    Expect: validator is compiled, its errors are the same as the form ones.
+    """
+    validator = get_proto_validator(form_class, pb.__class__)
+
+    is_valid, errors = validate_with_form(form_class, pb)
+
+    assert isinstance(validator, CompiledProtoValidator)
+    assert str(errors) == str(validator.validate(pb))
+    assert is_valid is not bool(validator.validate(pb))
+
+
+def test_handlers_validators_are_compiled():
+    """
+    Case: get validators of all methods of transaction processor handlers.
+    Expect: all of them are compiled, empty payloads errors are the same as the forms ones.
+    """
+    for handler in TP_HANDLERS.values():
+        for dispatch in handler.dispatch_table.values():
+            assert isinstance(dispatch.proto_validator, CompiledProtoValidator)
+
+            pb = dispatch.pb_class()
+            assert str(validate_with_form(dispatch.validator, pb)[1]) == str(dispatch.proto_validator.validate(pb))
+
+
+def test_validator_is_cached_per_message_class():
+    """
+    Case: get validator of the same form and protobuf class twice.
+    Expect: validator is compiled once.
+    """
+    assert get_proto_validator(TransferPayloadForm, TransferPayload) \
+        is get_proto_validator(TransferPayloadForm, TransferPayload)
+
+
+def test_uncompilable_form_is_validated_with_form():
+    """
+    Case: get validator of form with validator that could not be compiled.
+    Expect: message is validated with the form itself.
+    """
+    class LengthTransferPayloadForm(ProtoForm):
+        address_to = fields.StringField(validators=[validators.Length(max=4)])
+        value = fields.IntegerField()
+
+    validator = get_proto_validator(LengthTransferPayloadForm, TransferPayload)
+
+    assert isinstance(validator, FormProtoValidator)
+    assert {'address_to': ['Field cannot be longer than 4 characters.']} == validator.validate(
+        TransferPayload(address_to=ADDRESS, value=1),
+    )
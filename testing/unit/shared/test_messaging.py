@@ -0,0 +1,258 @@
+"""
+Provide tests for connection pool shared by many clients implementation.
+"""
+import asyncio
+
+import pytest
+from sawtooth_sdk.protobuf.client_event_pb2 import (
+    ClientEventsSubscribeRequest,
+    ClientEventsSubscribeResponse,
+    ClientEventsUnsubscribeResponse,
+)
+from sawtooth_sdk.protobuf.events_pb2 import (
+    Event,
+    EventList,
+    EventSubscription,
+)
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+from remme.shared.messaging import ConnectionPool
+
+ZMQ_URL = 'tcp://localhost:4004'
+
+BLOCK_COMMIT_EVENT = 'sawtooth/block-commit'
+TRANSFER_EVENT = 'remme/account/transfer'
+
+BLOCK_ID = '5cae0c8f4b67f7dc91d2b06a583d8d49ac126be221b9a34f661094cb4c12db94' \
+           '011ecda7d0754f271bf48b63f9501da2a78a4bf67be8634f3ed9c43badafbc4b'
+
+
+class FakeConnection:
+    """
+    Connection impostor, which requests are replied to by the test.
+    """
+
+    instances = []
+
+    def __init__(self, url, *, loop=None):
+        self.has_transport = True
+        self.requests = []
+        self.incoming = asyncio.Queue()
+        self.instances.append(self)
+
+    async def open(self):
+        pass
+
+    async def send(self, message_type, message_content, timeout=None):
+        reply = asyncio.get_event_loop().create_future()
+        self.requests.append((message_type, message_content, reply))
+        return await reply
+
+    async def receive(self):
+        return await self.incoming.get()
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_connection(mocker):
+    FakeConnection.instances = []
+    mocker.patch('remme.shared.messaging.Connection', FakeConnection)
+
+
+async def open_pool():
+    pool = ConnectionPool(ZMQ_URL, size=3)
+    await pool.open()
+    return pool
+
+
+def create_subscribe_request(event_types, last_known_block_ids=()):
+    return ClientEventsSubscribeRequest(
+        subscriptions=[EventSubscription(event_type=event_type) for event_type in event_types],
+        last_known_block_ids=last_known_block_ids,
+    ).SerializeToString()
+
+
+def create_subscribe_reply(status=ClientEventsSubscribeResponse.OK):
+    return Message(
+        message_type=Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE,
+        content=ClientEventsSubscribeResponse(status=status).SerializeToString(),
+    )
+
+
+def create_events_message(*event_types):
+    return Message(
+        message_type=Message.CLIENT_EVENTS,
+        content=EventList(events=[Event(event_type=event_type) for event_type in event_types]).SerializeToString(),
+    )
+
+
+async def wait_for_requests():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_send_over_least_loaded_connection(fake_connection):
+    """
+    Case: send requests of several clients over the pool, while some replies are awaited.
+    Expect: each request is sent over the connection with the fewest replies in flight, in-flight gauges are updated.
+    """
+    pool = await open_pool()
+    first_client, second_client = pool.connect(), pool.connect()
+
+    sending = [
+        asyncio.ensure_future(client.send(Message.CLIENT_BLOCK_LIST_REQUEST, b'', timeout=1))
+        for client in (first_client, second_client, first_client, second_client)
+    ]
+    await wait_for_requests()
+
+    assert [2, 1, 1] == pool.in_flight
+    assert [2, 1, 1] == [len(connection.requests) for connection in FakeConnection.instances]
+
+    for connection in FakeConnection.instances:
+        for _, _, reply in connection.requests:
+            reply.set_result(Message(message_type=Message.CLIENT_BLOCK_LIST_RESPONSE))
+
+    await asyncio.gather(*sending)
+
+    assert [0, 0, 0] == pool.in_flight
+
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_events_are_demultiplexed_to_subscribers(fake_connection):
+    """
+    Case: subscribe clients to different events over the pool and receive events from the validator.
+    Expect: validator is asked for events only when new types are subscribed, clients get only their events.
+    """
+    pool = await open_pool()
+    events_connection = FakeConnection.instances[0]
+    blocks_client, transfers_client, other_blocks_client = pool.connect(), pool.connect(), pool.connect()
+
+    subscribing = asyncio.ensure_future(blocks_client.send(
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, create_subscribe_request([BLOCK_COMMIT_EVENT]),
+    ))
+    await wait_for_requests()
+    events_connection.requests[-1][2].set_result(create_subscribe_reply())
+    await subscribing
+
+    subscribing = asyncio.ensure_future(transfers_client.send(
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, create_subscribe_request([TRANSFER_EVENT]),
+    ))
+    await wait_for_requests()
+    events_connection.requests[-1][2].set_result(create_subscribe_reply())
+    await subscribing
+
+    reply = await other_blocks_client.send(
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, create_subscribe_request([BLOCK_COMMIT_EVENT]),
+    )
+
+    assert Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE == reply.message_type
+    assert 2 == len(events_connection.requests)
+    assert 3 == pool.subscribers_count
+
+    subscribe_request = ClientEventsSubscribeRequest()
+    subscribe_request.ParseFromString(events_connection.requests[-1][1])
+
+    assert sorted([BLOCK_COMMIT_EVENT, TRANSFER_EVENT]) == sorted(
+        subscription.event_type for subscription in subscribe_request.subscriptions
+    )
+
+    events_connection.incoming.put_nowait(create_events_message(BLOCK_COMMIT_EVENT))
+    await wait_for_requests()
+
+    assert create_events_message(BLOCK_COMMIT_EVENT) == blocks_client.receive_nowait()
+    assert create_events_message(BLOCK_COMMIT_EVENT) == other_blocks_client.receive_nowait()
+
+    with pytest.raises(asyncio.QueueEmpty):
+        transfers_client.receive_nowait()
+
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_subscription_is_not_shared(fake_connection):
+    """
+    Case: subscribe client to events over the pool, validator rejects the subscription.
+    Expect: validator reply is returned to the client, client does not get events.
+    """
+    pool = await open_pool()
+    events_connection = FakeConnection.instances[0]
+    client = pool.connect()
+
+    subscribing = asyncio.ensure_future(client.send(
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, create_subscribe_request([BLOCK_COMMIT_EVENT]),
+    ))
+    await wait_for_requests()
+    events_connection.requests[-1][2].set_result(create_subscribe_reply(ClientEventsSubscribeResponse.INVALID_FILTER))
+
+    assert create_subscribe_reply(ClientEventsSubscribeResponse.INVALID_FILTER) == await subscribing
+    assert 0 == pool.subscribers_count
+
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_subscription_since_known_block_uses_own_connection(fake_connection):
+    """
+    Case: subscribe client to events since a known block.
+    Expect: subscription is sent over a connection of the client, its events are received by the client only.
+    """
+    pool = await open_pool()
+    client = pool.connect()
+
+    subscribing = asyncio.ensure_future(client.send(
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, create_subscribe_request([BLOCK_COMMIT_EVENT], [BLOCK_ID]),
+    ))
+    await wait_for_requests()
+
+    pool_connections, (client_connection,) = FakeConnection.instances[:3], FakeConnection.instances[3:]
+    client_connection.requests[-1][2].set_result(create_subscribe_reply())
+    await subscribing
+
+    assert [] == [request for connection in pool_connections for request in connection.requests]
+    assert 0 == pool.subscribers_count
+
+    client_connection.incoming.put_nowait(create_events_message(BLOCK_COMMIT_EVENT))
+    await wait_for_requests()
+
+    assert create_events_message(BLOCK_COMMIT_EVENT) == client.receive_nowait()
+
+    client.close()
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_last_subscriber_close_unsubscribes_pool(fake_connection):
+    """
+    Case: close the only client subscribed to events over the pool.
+    Expect: validator is asked to stop sending events.
+    """
+    pool = await open_pool()
+    events_connection = FakeConnection.instances[0]
+    client = pool.connect()
+
+    subscribing = asyncio.ensure_future(client.send(
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, create_subscribe_request([BLOCK_COMMIT_EVENT]),
+    ))
+    await wait_for_requests()
+    events_connection.requests[-1][2].set_result(create_subscribe_reply())
+    await subscribing
+
+    client.close()
+    await wait_for_requests()
+
+    message_type, _, reply = events_connection.requests[-1]
+    reply.set_result(Message(
+        message_type=Message.CLIENT_EVENTS_UNSUBSCRIBE_RESPONSE,
+        content=ClientEventsUnsubscribeResponse(status=ClientEventsUnsubscribeResponse.OK).SerializeToString(),
+    ))
+    await wait_for_requests()
+
+    assert Message.CLIENT_EVENTS_UNSUBSCRIBE_REQUEST == message_type
+    assert 0 == pool.subscribers_count
+
+    pool.close()
@@ -0,0 +1,113 @@
+"""
+Provide tests for metrics batching sink and histograms implementation.
+"""
+import threading
+
+import pytest
+
+from remme.shared.metrics import _BatchingSink, _Histogram, to_line_protocol
+
+
+def test_to_line_protocol():
+    """
+    Case: format data point with tags and fields of different types.
+    Expect: data point is formatted with InfluxDB line protocol, special characters are escaped.
+    """
+    line = to_line_protocol(
+        'remme.tp.pub_key.0', {'hostname': 'node 1'},
+        {'execution_time': 0.5, 'count': 3, 'ok': True, 'note': 'say "hi"'},
+        1540000000000000000,
+    )
+
+    assert r'remme.tp.pub_key.0,hostname=node\ 1 ' \
+           r'execution_time=0.5,count=3i,ok=true,note="say \"hi\"" 1540000000000000000' == line
+
+
+def test_batching_sink_drops_points_when_queue_is_full():
+    """
+    Case: put more points to the sink, than its queue can hold, while it is not writing.
+    Expect: points over queue size are dropped and counted, put does not block.
+    """
+    sink = _BatchingSink(write=lambda lines: None, queue_size=2)
+
+    for _ in range(5):
+        sink.put('point')
+
+    assert 3 == sink.dropped
+
+
+def test_batching_sink_flushes_by_size():
+    """
+    Case: put number of points equal to batch size to the started sink.
+    Expect: points are written with a single call before flush interval passed.
+    """
+    batches = []
+    written = threading.Event()
+
+    def write(lines):
+        batches.append(lines)
+        written.set()
+
+    sink = _BatchingSink(write=write, batch_size=3, flush_interval=60)
+    sink.start()
+
+    for index in range(3):
+        sink.put(f'point {index}')
+
+    assert written.wait(timeout=5)
+    assert [['point 0', 'point 1', 'point 2']] == batches
+
+    sink.stop()
+
+
+def test_batching_sink_flushes_queued_points_on_stop():
+    """
+    Case: stop the sink with points, which number is less than batch size.
+    Expect: queued points are written.
+    """
+    batches = []
+
+    sink = _BatchingSink(write=batches.append, batch_size=100, flush_interval=60)
+    sink.start()
+    sink.put('point')
+    sink.stop()
+
+    assert [['point']] == batches
+
+
+def test_histogram_summary():
+    """
+    Case: record values to the histogram and get its summary.
+    Expect: count, sum, min, max and mean are exact, percentiles are estimated within histogram precision.
+    """
+    histogram = _Histogram(precision=0.01)
+
+    for value in range(1, 1001):
+        histogram.record(value / 1000)
+
+    summary = histogram.summary(percentiles=(50, 99))
+
+    assert 1000 == summary['count']
+    assert pytest.approx(500.5) == summary['sum']
+    assert 0.001 == summary['min']
+    assert 1.0 == summary['max']
+    assert pytest.approx(0.5005) == summary['mean']
+    assert pytest.approx(0.5, rel=0.01) == summary['p50']
+    assert pytest.approx(0.99, rel=0.01) == summary['p99']
+
+
+def test_batching_sink_collects_aggregated_points_on_stop():
+    """
+    Case: stop the sink, that collects aggregated points.
+    Expect: collected points are written together with queued ones.
+    """
+    batches = []
+
+    sink = _BatchingSink(
+        write=batches.append, batch_size=100, flush_interval=60, collect=lambda: ['summary'],
+    )
+    sink.start()
+    sink.put('point')
+    sink.stop()
+
+    assert [['point', 'summary']] == batches
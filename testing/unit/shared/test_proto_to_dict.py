@@ -0,0 +1,62 @@
+"""
+Provide tests for compiled protobuf messages to dict conversion implementation.
+"""
+import json
+
+import pytest
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.timestamp_pb2 import Timestamp
+from sawtooth_sdk.protobuf.setting_pb2 import Setting
+
+from remme.protos.account_pb2 import Account
+from remme.protos.atomic_swap_pb2 import AtomicSwapInfo
+from remme.protos.pub_key_pb2 import NewPubKeyPayload, PubKeyStorage
+from remme.shared.utils import from_proto_to_dict
+
+
+def create_atomic_swap_info():
+    swap_info = AtomicSwapInfo()
+    swap_info.state = AtomicSwapInfo.OPENED
+    swap_info.amount = 10 ** 18
+    swap_info.swap_id = '033102e41346242476b15a3a7966eb5249271025fc7fb0b37ed3fdb4bcce3884'
+    swap_info.is_initiator = True
+    swap_info.created_at = 1540000000
+
+    return swap_info
+
+
+def create_pub_key_payload():
+    payload = NewPubKeyPayload()
+    payload.rsa.key = b'\x00\x01public-key'
+    payload.entity_hash = b'hash'
+    payload.valid_from = 1540000000
+
+    return payload
+
+
+def create_setting():
+    setting = Setting()
+    setting.entries.add(key='remme.economy_enabled', value='true')
+
+    return setting
+
+
+@pytest.mark.parametrize('message', [
+    Account(),
+    Account(balance=100, pub_keys=['112007' + '1' * 64, '112007' + '2' * 64]),
+    AtomicSwapInfo(),
+    create_atomic_swap_info(),
+    NewPubKeyPayload(),
+    create_pub_key_payload(),
+    PubKeyStorage(owner='02' + '1' * 64, is_revoked=True),
+    create_setting(),
+    Timestamp(seconds=1540000000),
+])
+def test_from_proto_to_dict_is_identical_to_message_to_dict(message):
+    """
+    Case: convert protobuf message to dict.
+    Expect: the result is identical to `MessageToDict` one with default values, including order of keys.
+    """
+    expected = MessageToDict(message, preserving_proto_field_name=True, including_default_value_fields=True)
+
+    assert json.dumps(expected) == json.dumps(from_proto_to_dict(message))
@@ -0,0 +1,131 @@
+"""
+Provide tests for block, batch and transaction protobuf messages to JSON conversion implementation.
+"""
+import json
+
+import pytest
+from sawtooth_sdk.protobuf.batch_pb2 import (
+    Batch,
+    BatchHeader,
+)
+from sawtooth_sdk.protobuf.block_pb2 import (
+    Block,
+    BlockHeader,
+)
+from sawtooth_sdk.protobuf.client_list_control_pb2 import ClientPagingResponse
+from sawtooth_sdk.protobuf.client_transaction_pb2 import ClientTransactionListResponse
+from sawtooth_sdk.protobuf.transaction_pb2 import (
+    Transaction,
+    TransactionHeader,
+)
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+from remme.shared.router import Router
+from remme.shared.utils import (
+    expand_batch,
+    expand_block,
+    expand_transaction,
+    message_to_dict,
+    resource_to_json,
+)
+
+HEAD_ID = '5cae0c8f4b67f7dc91d2b06a583d8d49ac126be221b9a34f661094cb4c12db94' \
+          '011ecda7d0754f271bf48b63f9501da2a78a4bf67be8634f3ed9c43badafbc4b'
+
+PUBLIC_KEY = '03ecc5cb4094eb05319be6c7a63ebf17133d4ffaea48cdcfd1d5fc79dac7db7b6b'
+
+
+def create_transaction(family_name='account', nonce='nonce'):
+    return Transaction(
+        header=TransactionHeader(
+            family_name=family_name,
+            family_version='0.1',
+            inputs=['112007' + '1' * 64],
+            outputs=['112007' + '1' * 64],
+            nonce=nonce,
+            signer_public_key=PUBLIC_KEY,
+        ).SerializeToString(),
+        header_signature='1' * 128,
+        payload=b'\x00\x01payload',
+    )
+
+
+def create_batch(*transactions):
+    return Batch(
+        header=BatchHeader(
+            signer_public_key=PUBLIC_KEY,
+            transaction_ids=[transaction.header_signature for transaction in transactions],
+        ).SerializeToString(),
+        header_signature='2' * 128,
+        transactions=transactions,
+        trace=True,
+    )
+
+
+def create_block(*batches):
+    return Block(
+        header=BlockHeader(
+            block_num=2 ** 40,
+            previous_block_id='0' * 128,
+            signer_public_key=PUBLIC_KEY,
+            batch_ids=[batch.header_signature for batch in batches],
+            consensus='Devmode ✓'.encode(),
+            state_root_hash='3' * 64,
+        ).SerializeToString(),
+        header_signature=HEAD_ID,
+        batches=batches,
+    )
+
+
+@pytest.mark.parametrize('resource, expand', [
+    (Transaction(header=TransactionHeader().SerializeToString()), expand_transaction),
+    (create_transaction(nonce='ноунс'), expand_transaction),
+    (Batch(header=BatchHeader().SerializeToString()), expand_batch),
+    (create_batch(create_transaction(), create_transaction()), expand_batch),
+    (Block(header=BlockHeader().SerializeToString()), expand_block),
+    (create_block(create_batch(create_transaction())), expand_block),
+    (create_block(Batch(header=BatchHeader().SerializeToString())), expand_block),
+])
+def test_resource_to_json_is_identical_to_expanded_dict(resource, expand):
+    """
+    Case: convert block, batch or transaction protobuf message to JSON.
+    Expect: the result is identical to JSON of the message converted to dict and expanded, including order of keys.
+    """
+    assert json.dumps(expand(message_to_dict(resource))) == resource_to_json(resource)
+
+
+class FakeStream:
+    """
+    Connection impostor replying to transaction list requests.
+    """
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+
+    async def send(self, message_type, message_content, timeout=None):
+        return Message(
+            message_type=Message.CLIENT_TRANSACTION_LIST_RESPONSE,
+            content=ClientTransactionListResponse(
+                status=ClientTransactionListResponse.OK,
+                transactions=self.transactions,
+                head_id=HEAD_ID,
+                paging=ClientPagingResponse(next='4' * 128, limit=2),
+            ).SerializeToString(),
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('family_name', [None, 'account', 'unknown'])
+async def test_list_transactions_as_json(family_name):
+    """
+    Case: list transactions, optionally filtered by family name, as JSON.
+    Expect: the result is identical to JSON of the transactions listed as dict.
+    """
+    router = Router(FakeStream([
+        create_transaction(family_name='account'),
+        create_transaction(family_name='pub_key'),
+    ]))
+
+    expected = await router.list_transactions(limit=2, family_name=family_name)
+
+    assert json.dumps(expected) == await router.list_transactions(limit=2, family_name=family_name, as_json=True)
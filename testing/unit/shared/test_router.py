@@ -0,0 +1,405 @@
+"""
+Provide tests for chain head tracker and state cache of the router implementation.
+"""
+import asyncio
+
+import pytest
+from sawtooth_sdk.protobuf.block_pb2 import (
+    Block,
+    BlockHeader,
+)
+from sawtooth_sdk.protobuf.client_block_pb2 import ClientBlockListResponse
+from sawtooth_sdk.protobuf.client_event_pb2 import (
+    ClientEventsSubscribeRequest,
+    ClientEventsSubscribeResponse,
+)
+from sawtooth_sdk.protobuf.client_state_pb2 import (
+    ClientStateGetRequest,
+    ClientStateGetResponse,
+)
+from sawtooth_sdk.protobuf.events_pb2 import (
+    Event,
+    EventFilter,
+    EventList,
+    EventSubscription,
+)
+from sawtooth_sdk.protobuf.transaction_receipt_pb2 import (
+    StateChange,
+    StateChangeList,
+)
+from sawtooth_sdk.protobuf.validator_pb2 import Message
+
+from remme.shared.constants import Events
+from remme.shared.exceptions import KeyNotFound
+from remme.shared.router import (
+    STATE_CACHE_DELTAS_DEPTH,
+    STATE_CACHE_ENTRY_OVERHEAD,
+    ChainHeadTracker,
+    Router,
+    StateCache,
+)
+
+HEAD_ID = '5cae0c8f4b67f7dc91d2b06a583d8d49ac126be221b9a34f661094cb4c12db94' \
+          '011ecda7d0754f271bf48b63f9501da2a78a4bf67be8634f3ed9c43badafbc4b'
+HEAD_STATE_ROOT = '1c3d3f1b4f4d41a6fc25b3ed2c0f64a4c4f5e0a4bfb4e5e4ee2b7f8b2f4d6e1a'
+
+COMMITTED_HEAD_ID = 'aafb03931cf3b7a5cc8eace89f6262733c9b374b8dcc243b7d076a1b7ffe84f2' \
+                    '387c11c1b02537c8d43ff0ecb78c267211e2f8c8ad493a3fe64470ce60233628'
+COMMITTED_HEAD_STATE_ROOT = '6e1a2f4d1c3d3f1b4f4d41a6fc25b3ed2c0f64a4c4f5e0a4bfb4e5e4ee2b7f8b'
+
+ADDRESS = '112007d71fa7e120c60fb392a64fd69de891a60c667d9ea9e5d9d9d617263be6c20202'
+CHANGED_ADDRESS = '1120071db7c02f5731d06df194dc95465e9b277c19e905ce642664a9a0d504a3909e31'
+NOT_FOUND_ADDRESS = '112007' + '0' * 64
+ADDRESS_PREFIXES = ['112007']
+OTHER_PREFIX_ADDRESS = 'a23be1' + '0' * 64
+
+STATE_VALUE = b'value'
+
+
+class FakeStream:
+    """
+    Connection impostor replying to block list, state get and events subscribe requests.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.incoming = asyncio.Queue()
+        self.head = (HEAD_ID, HEAD_STATE_ROOT)
+        self.last_known_block_ids = None
+        self.subscriptions = None
+        self.state_roots = []
+
+    async def send(self, message_type, message_content, timeout=None):
+        self.requests.append(message_type)
+
+        if message_type == Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST:
+            request = ClientEventsSubscribeRequest()
+            request.ParseFromString(message_content)
+            self.last_known_block_ids = list(request.last_known_block_ids)
+            self.subscriptions = list(request.subscriptions)
+
+            return Message(
+                message_type=Message.CLIENT_EVENTS_SUBSCRIBE_RESPONSE,
+                content=ClientEventsSubscribeResponse(status=ClientEventsSubscribeResponse.OK).SerializeToString(),
+            )
+
+        if message_type == Message.CLIENT_STATE_GET_REQUEST:
+            request = ClientStateGetRequest()
+            request.ParseFromString(message_content)
+            self.state_roots.append(request.state_root)
+
+            if request.address == NOT_FOUND_ADDRESS:
+                response = ClientStateGetResponse(status=ClientStateGetResponse.NO_RESOURCE)
+            else:
+                response = ClientStateGetResponse(status=ClientStateGetResponse.OK, value=STATE_VALUE)
+
+            return Message(message_type=Message.CLIENT_STATE_GET_RESPONSE, content=response.SerializeToString())
+
+        head_id, head_state_root = self.head
+        block = Block(
+            header_signature=head_id,
+            header=BlockHeader(state_root_hash=head_state_root).SerializeToString(),
+        )
+        return Message(
+            message_type=Message.CLIENT_BLOCK_LIST_RESPONSE,
+            content=ClientBlockListResponse(status=ClientBlockListResponse.OK, blocks=[block]).SerializeToString(),
+        )
+
+    async def receive(self):
+        return await self.incoming.get()
+
+
+def create_block_commit_message(block_id, state_root_hash, previous_block_id=HEAD_ID, changed_addresses=()):
+    events = [Event(event_type=Events.SAWTOOTH_BLOCK_COMMIT.value, attributes=[
+        Event.Attribute(key='block_id', value=block_id),
+        Event.Attribute(key='block_num', value='2'),
+        Event.Attribute(key='state_root_hash', value=state_root_hash),
+        Event.Attribute(key='previous_block_id', value=previous_block_id),
+    ])]
+
+    if changed_addresses:
+        events.append(Event(
+            event_type=Events.SAWTOOTH_STATE_DELTA.value,
+            data=StateChangeList(state_changes=[
+                StateChange(address=address, value=b'changed', type=StateChange.SET) for address in changed_addresses
+            ]).SerializeToString(),
+        ))
+
+    return Message(message_type=Message.CLIENT_EVENTS, content=EventList(events=events).SerializeToString())
+
+
+@pytest.mark.asyncio
+async def test_get_head_reuses_requested_head():
+    """
+    Case: get chain head several times, including concurrently, from the tracker not subscribed to block commits.
+    Expect: head identifier and state root are requested from the validator once and reused.
+    """
+    stream = FakeStream()
+    head_tracker = ChainHeadTracker(stream, ttl=60)
+
+    heads = await asyncio.gather(head_tracker.get_head(), head_tracker.get_head())
+    heads.append(await head_tracker.get_head())
+
+    assert [(HEAD_ID, HEAD_STATE_ROOT)] * 3 == heads
+    assert [Message.CLIENT_BLOCK_LIST_REQUEST] == stream.requests
+
+
+@pytest.mark.asyncio
+async def test_get_head_requests_expired_head():
+    """
+    Case: get chain head several times from the tracker, which requested head is expired immediately.
+    Expect: head is requested from the validator each time.
+    """
+    stream = FakeStream()
+    head_tracker = ChainHeadTracker(stream, ttl=0)
+
+    await head_tracker.get_head()
+    await head_tracker.get_head()
+
+    assert [Message.CLIENT_BLOCK_LIST_REQUEST] * 2 == stream.requests
+
+
+@pytest.mark.asyncio
+async def test_get_head_of_block_commit():
+    """
+    Case: get chain head from the tracker subscribed to block commits before and after a block is committed.
+    Expect: head is requested until the block commit, then the committed head is got without requests.
+    """
+    stream = FakeStream()
+    head_tracker = ChainHeadTracker(stream, ttl=0, subscribe=True)
+
+    assert (HEAD_ID, HEAD_STATE_ROOT) == await head_tracker.get_head()
+    assert head_tracker.is_tracking
+
+    stream.incoming.put_nowait(create_block_commit_message(COMMITTED_HEAD_ID, COMMITTED_HEAD_STATE_ROOT))
+    await asyncio.sleep(0)
+
+    assert (COMMITTED_HEAD_ID, COMMITTED_HEAD_STATE_ROOT) == await head_tracker.get_head()
+    assert (COMMITTED_HEAD_ID, COMMITTED_HEAD_STATE_ROOT) == await head_tracker.get_head()
+    assert [Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST, Message.CLIENT_BLOCK_LIST_REQUEST] == stream.requests
+
+    head_tracker.close()
+
+
+@pytest.mark.asyncio
+async def test_get_head_after_block_commits_stop():
+    """
+    Case: get chain head from the tracker subscribed to block commits, which do not arrive anymore, while the chain
+        stays and then goes further.
+    Expect: head is requested, the committed head is kept while it is the chain head, then the requested head is got
+        and the tracker subscribes again since the last committed block.
+    """
+    stream = FakeStream()
+    head_tracker = ChainHeadTracker(stream, ttl=0, subscribe=True, staleness=0)
+
+    await head_tracker.get_head()
+    stream.incoming.put_nowait(create_block_commit_message(HEAD_ID, HEAD_STATE_ROOT, previous_block_id=''))
+    await asyncio.sleep(0)
+
+    assert (HEAD_ID, HEAD_STATE_ROOT) == await head_tracker.get_head()
+    assert [] == stream.last_known_block_ids
+
+    stream.head = (COMMITTED_HEAD_ID, COMMITTED_HEAD_STATE_ROOT)
+
+    assert (COMMITTED_HEAD_ID, COMMITTED_HEAD_STATE_ROOT) == await head_tracker.get_head()
+
+    await asyncio.sleep(0)
+
+    assert head_tracker.is_tracking
+    assert [HEAD_ID] == stream.last_known_block_ids
+    assert [
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+        Message.CLIENT_BLOCK_LIST_REQUEST,
+        Message.CLIENT_BLOCK_LIST_REQUEST,
+        Message.CLIENT_BLOCK_LIST_REQUEST,
+        Message.CLIENT_EVENTS_SUBSCRIBE_REQUEST,
+    ] == stream.requests
+
+    head_tracker.close()
+
+
+@pytest.mark.asyncio
+async def test_tracker_subscribes_to_block_commits_only():
+    """
+    Case: get chain head from the tracker subscribed to block commits without listeners of state changes.
+    Expect: block commits are subscribed to, state deltas are not.
+    """
+    stream = FakeStream()
+    head_tracker = ChainHeadTracker(stream, ttl=0, subscribe=True)
+    head_tracker.add_commit_listener(lambda *args: None)
+
+    await head_tracker.get_head()
+    await asyncio.sleep(0)
+
+    assert [EventSubscription(event_type=Events.SAWTOOTH_BLOCK_COMMIT.value)] == stream.subscriptions
+
+    head_tracker.close()
+
+
+@pytest.mark.asyncio
+async def test_tracker_subscribes_to_state_deltas_of_listeners_prefixes():
+    """
+    Case: get chain head from the tracker subscribed to block commits with listeners of changes of address prefixes.
+    Expect: state deltas are subscribed to along with block commits, filtered by prefixes of the listeners.
+    """
+    stream = FakeStream()
+    head_tracker = ChainHeadTracker(stream, ttl=0, subscribe=True)
+    head_tracker.add_commit_listener(lambda *args: None, ['112007', '000000'])
+    head_tracker.add_commit_listener(lambda *args: None, ['112007'])
+
+    await head_tracker.get_head()
+    await asyncio.sleep(0)
+
+    assert [
+        EventSubscription(event_type=Events.SAWTOOTH_BLOCK_COMMIT.value),
+        EventSubscription(event_type=Events.SAWTOOTH_STATE_DELTA.value, filters=[
+            EventFilter(key='address', match_string='^(112007|000000)', filter_type=EventFilter.REGEX_ANY),
+        ]),
+    ] == stream.subscriptions
+
+    head_tracker.close()
+
+
+def test_state_cache_get():
+    """
+    Case: put values, including missing one, of addresses under state root to the cache and get them.
+    Expect: values are got from the cache, missing value is got as None, lookups are counted as hits and misses.
+    """
+    state_cache = StateCache()
+    state_cache.put(HEAD_STATE_ROOT, ADDRESS, 'value')
+    state_cache.put(HEAD_STATE_ROOT, NOT_FOUND_ADDRESS, None)
+
+    assert 'value' == state_cache.get(HEAD_STATE_ROOT, ADDRESS)
+    assert state_cache.get(HEAD_STATE_ROOT, NOT_FOUND_ADDRESS) is None
+    assert 'default' == state_cache.get(COMMITTED_HEAD_STATE_ROOT, ADDRESS, default='default')
+
+    stats = state_cache.stats
+
+    assert (2, 1, 2) == (stats['hits'], stats['misses'], stats['entries'])
+    assert 2 / 3 == stats['hit_rate']
+
+
+def test_state_cache_evicts_least_recently_used():
+    """
+    Case: put values to the cache, which memory budget fits two of them, after the first one is got.
+    Expect: the second value, that is least recently used, is evicted, memory of the cache is within the budget.
+    """
+    entry_size = STATE_CACHE_ENTRY_OVERHEAD + len(HEAD_STATE_ROOT) + len(ADDRESS) + len('value')
+
+    state_cache = StateCache(memory_budget=2 * entry_size)
+    state_cache.put(HEAD_STATE_ROOT, ADDRESS, 'value')
+    state_cache.put(HEAD_STATE_ROOT, CHANGED_ADDRESS, 'value')
+
+    state_cache.get(HEAD_STATE_ROOT, ADDRESS)
+    state_cache.put(HEAD_STATE_ROOT, NOT_FOUND_ADDRESS, 'value')
+
+    assert 'value' == state_cache.get(HEAD_STATE_ROOT, ADDRESS)
+    assert 'value' == state_cache.get(HEAD_STATE_ROOT, NOT_FOUND_ADDRESS)
+    assert state_cache.get(HEAD_STATE_ROOT, CHANGED_ADDRESS, default=None) is None
+    assert 2 * entry_size == state_cache.stats['memory']
+
+
+def test_state_cache_reuses_values_of_previous_state_root():
+    """
+    Case: get values under the state root of a committed block, which are cached under the state root of its parent.
+    Expect: value of the address not changed by the block is reused, value of the changed address is missed.
+    """
+    state_cache = StateCache(address_prefixes=ADDRESS_PREFIXES)
+    state_cache.add_block_commit(HEAD_ID, '', HEAD_STATE_ROOT, set())
+    state_cache.add_block_commit(COMMITTED_HEAD_ID, HEAD_ID, COMMITTED_HEAD_STATE_ROOT, {CHANGED_ADDRESS})
+
+    state_cache.put(HEAD_STATE_ROOT, ADDRESS, 'value')
+    state_cache.put(HEAD_STATE_ROOT, CHANGED_ADDRESS, 'value')
+
+    assert 'value' == state_cache.get(COMMITTED_HEAD_STATE_ROOT, ADDRESS)
+    assert state_cache.get(COMMITTED_HEAD_STATE_ROOT, CHANGED_ADDRESS, default=None) is None
+
+
+def test_state_cache_does_not_reuse_values_of_addresses_out_of_prefixes():
+    """
+    Case: get value under the state root of a committed block, which is cached under the state root of its parent,
+        of the address out of prefixes, which changes are not in state deltas.
+    Expect: value is missed.
+    """
+    state_cache = StateCache(address_prefixes=ADDRESS_PREFIXES)
+    state_cache.add_block_commit(HEAD_ID, '', HEAD_STATE_ROOT, set())
+    state_cache.add_block_commit(COMMITTED_HEAD_ID, HEAD_ID, COMMITTED_HEAD_STATE_ROOT, set())
+
+    state_cache.put(HEAD_STATE_ROOT, OTHER_PREFIX_ADDRESS, 'value')
+
+    assert state_cache.get(COMMITTED_HEAD_STATE_ROOT, OTHER_PREFIX_ADDRESS, default=None) is None
+
+
+def test_state_cache_evicts_deltas_of_oldest_blocks():
+    """
+    Case: commit more blocks than the cache keeps deltas of, while a value not cached under the state root
+        of the first committed block is got, so its delta is walked.
+    Expect: deltas of the oldest blocks are evicted, reading under their roots does not keep them.
+    """
+    state_cache = StateCache(address_prefixes=ADDRESS_PREFIXES)
+    state_cache.add_block_commit('block-0', '', 'root-0', set())
+
+    for number in range(1, STATE_CACHE_DELTAS_DEPTH + 2):
+        state_cache.add_block_commit(f'block-{number}', f'block-{number - 1}', f'root-{number}', set())
+        state_cache.get('root-1', NOT_FOUND_ADDRESS)
+
+    assert [
+        f'root-{number}' for number in range(2, STATE_CACHE_DELTAS_DEPTH + 2)
+    ] == list(state_cache._root_deltas)
+
+
+@pytest.mark.asyncio
+async def test_fetch_state_at_state_root():
+    """
+    Case: get state root of the chain head, then fetch state of addresses at it after another block is committed.
+    Expect: state is read at the state root got, the chain head is not requested again.
+    """
+    stream = FakeStream()
+    router = Router(stream, head_tracker=ChainHeadTracker(stream, ttl=0))
+
+    state_root = await router.get_state_root()
+    stream.head = (COMMITTED_HEAD_ID, COMMITTED_HEAD_STATE_ROOT)
+
+    for address in (ADDRESS, CHANGED_ADDRESS):
+        assert {'data': 'dmFsdWU='} == await router.fetch_state(address, state_root=state_root)
+
+    assert HEAD_STATE_ROOT == state_root
+    assert [HEAD_STATE_ROOT] * 2 == stream.state_roots
+    assert 1 == stream.requests.count(Message.CLIENT_BLOCK_LIST_REQUEST)
+
+
+@pytest.mark.asyncio
+async def test_fetch_state_through_state_cache():
+    """
+    Case: fetch state of existing and not existing addresses twice, then again after a block changing one is committed.
+    Expect: state is requested once per address, until the block commit confirms the address was changed.
+    """
+    stream = FakeStream()
+    head_tracker = ChainHeadTracker(stream, ttl=0, subscribe=True)
+    state_cache = StateCache(address_prefixes=ADDRESS_PREFIXES)
+    head_tracker.add_commit_listener(state_cache.add_block_commit, ADDRESS_PREFIXES)
+    router = Router(stream, head_tracker=head_tracker, state_cache=state_cache)
+
+    stream.incoming.put_nowait(create_block_commit_message(HEAD_ID, HEAD_STATE_ROOT, previous_block_id=''))
+    await head_tracker.get_head()
+    await asyncio.sleep(0)
+
+    for _ in range(2):
+        assert {'head': HEAD_ID, 'data': 'dmFsdWU='} == await router.fetch_state(ADDRESS)
+
+        with pytest.raises(KeyNotFound):
+            await router.fetch_state(NOT_FOUND_ADDRESS)
+
+    stream.incoming.put_nowait(create_block_commit_message(
+        COMMITTED_HEAD_ID, COMMITTED_HEAD_STATE_ROOT, changed_addresses=[NOT_FOUND_ADDRESS],
+    ))
+    await asyncio.sleep(0)
+
+    assert {'head': COMMITTED_HEAD_ID, 'data': 'dmFsdWU='} == await router.fetch_state(ADDRESS)
+
+    with pytest.raises(KeyNotFound):
+        await router.fetch_state(NOT_FOUND_ADDRESS)
+
+    assert 3 == stream.requests.count(Message.CLIENT_STATE_GET_REQUEST)
+
+    head_tracker.close()
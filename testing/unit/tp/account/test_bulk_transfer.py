@@ -0,0 +1,205 @@
+"""
+Provide tests for account handler apply (bulk transfer) method implementation.
+"""
+import json
+import time
+
+import pytest
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from remme.clients.account import AccountClient
+from remme.protos.account_pb2 import (
+    Account,
+    AccountMethod,
+    BulkTransferPayload,
+)
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.shared.constants import Events
+from remme.shared.forms.account import BULK_TRANSFER_MAX_TRANSFERS
+from remme.shared.utils import hash512
+from remme.tp.account import FAMILY_VERSIONS, AccountHandler
+from testing.conftest import create_signer
+from testing.mocks.stub import StubContext
+from testing.utils.client import proto_error_msg
+
+RANDOM_NODE_PUBLIC_KEY = '039d6881f0a71d05659e1f40b443684b93c7b7c504ea23ea8949ef5216a2236940'
+
+ACCOUNT_FROM_BALANCE = 10000
+ACCOUNT_TO_BALANCE = 1000
+
+ACCOUNT_ADDRESS_FROM = '112007d71fa7e120c60fb392a64fd69de891a60c667d9ea9e5d9d9d617263be6c20202'
+ACCOUNT_ADDRESS_TO = '1120071db7c02f5731d06df194dc95465e9b277c19e905ce642664a9a0d504a3909e31'
+ACCOUNT_ADDRESS_TO_NEW = '112007' + hash512('new-receiver')[:64]
+
+ACCOUNT_FROM_PRIVATE_KEY = '1cb15ecfe1b3dc02df0003ac396037f85b98cf9f99b0beae000dc5e9e8b6dab4'
+
+INPUTS = OUTPUTS = [
+    ACCOUNT_ADDRESS_FROM,
+    ACCOUNT_ADDRESS_TO,
+    ACCOUNT_ADDRESS_TO_NEW,
+]
+
+
+def create_bulk_transfer_request(transfers, family_version=FAMILY_VERSIONS[-1]):
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = AccountMethod.BULK_TRANSFER
+    transaction_payload.data = AccountClient.get_bulk_transfer_payload(transfers).SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = TransactionHeader(
+        signer_public_key=RANDOM_NODE_PUBLIC_KEY,
+        family_name=AccountHandler().family_name,
+        family_version=family_version,
+        inputs=INPUTS,
+        outputs=OUTPUTS,
+        dependencies=[],
+        payload_sha512=hash512(data=serialized_transaction_payload),
+        batcher_public_key=RANDOM_NODE_PUBLIC_KEY,
+        nonce=time.time().hex().encode(),
+    )
+
+    serialized_header = transaction_header.SerializeToString()
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=create_signer(private_key=ACCOUNT_FROM_PRIVATE_KEY).sign(serialized_header),
+    )
+
+
+def create_context(account_from_balance=ACCOUNT_FROM_BALANCE):
+    account_from = Account()
+    account_from.balance = account_from_balance
+
+    account_to = Account()
+    account_to.balance = ACCOUNT_TO_BALANCE
+
+    return StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        ACCOUNT_ADDRESS_FROM: account_from.SerializeToString(),
+        ACCOUNT_ADDRESS_TO: account_to.SerializeToString(),
+    })
+
+
+def get_balance(mock_context, address):
+    account = Account()
+    account.ParseFromString(mock_context.state[address])
+    return account.balance
+
+
+def test_bulk_transfer():
+    """
+    Case: send transaction request to transfer tokens to existing and new accounts, one of them twice.
+    Expect: sender balance is decreased by the sum of transfers, receivers balances are increased by their transfers.
+    """
+    mock_context = create_context()
+
+    AccountHandler().apply(transaction=create_bulk_transfer_request([
+        (ACCOUNT_ADDRESS_TO, 100),
+        (ACCOUNT_ADDRESS_TO_NEW, 200),
+        (ACCOUNT_ADDRESS_TO, 300),
+    ]), context=mock_context)
+
+    assert ACCOUNT_FROM_BALANCE - 600 == get_balance(mock_context, ACCOUNT_ADDRESS_FROM)
+    assert ACCOUNT_TO_BALANCE + 400 == get_balance(mock_context, ACCOUNT_ADDRESS_TO)
+    assert 200 == get_balance(mock_context, ACCOUNT_ADDRESS_TO_NEW)
+
+
+def test_bulk_transfer_emits_single_event():
+    """
+    Case: send transaction request to transfer tokens to several accounts.
+    Expect: single bulk transfer event with the sender account followed by receivers accounts is emitted.
+    """
+    mock_context = create_context()
+
+    AccountHandler().apply(transaction=create_bulk_transfer_request([
+        (ACCOUNT_ADDRESS_TO, 100),
+        (ACCOUNT_ADDRESS_TO_NEW, 200),
+    ]), context=mock_context)
+
+    event, = mock_context.events()
+    entities_changed = json.loads(dict(event._attributes)['entities_changed'])
+
+    assert Events.ACCOUNT_BULK_TRANSFER.value == event._event_type
+    assert [
+        {'address': ACCOUNT_ADDRESS_FROM, 'balance': str(ACCOUNT_FROM_BALANCE - 300)},
+        {'address': ACCOUNT_ADDRESS_TO, 'balance': str(ACCOUNT_TO_BALANCE + 100)},
+        {'address': ACCOUNT_ADDRESS_TO_NEW, 'balance': '200'},
+    ] == [{'address': entity['address'], 'balance': entity['balance']} for entity in entities_changed]
+
+
+def test_bulk_transfer_not_enough_balance():
+    """
+    Case: send transaction request to transfer tokens, which sum exceeds the sender balance, while each one does not.
+    Expect: invalid transaction error is raised with not enough balance error message, state is not changed.
+    """
+    mock_context = create_context(account_from_balance=500)
+    initial_state = dict(mock_context.state)
+
+    with pytest.raises(InvalidTransaction) as error:
+        AccountHandler().apply(transaction=create_bulk_transfer_request([
+            (ACCOUNT_ADDRESS_TO, 300),
+            (ACCOUNT_ADDRESS_TO_NEW, 300),
+        ]), context=mock_context)
+
+    assert 'Not enough transferable balance. Sender\'s current balance: 500.' == str(error.value)
+    assert initial_state == mock_context.state
+
+
+def test_bulk_transfer_to_itself():
+    """
+    Case: send transaction request to transfer tokens, which contains a transfer to the sender itself.
+    Expect: invalid transaction error is raised with transfer to itself error message, state is not changed.
+    """
+    mock_context = create_context()
+    initial_state = dict(mock_context.state)
+
+    with pytest.raises(InvalidTransaction) as error:
+        AccountHandler().apply(transaction=create_bulk_transfer_request([
+            (ACCOUNT_ADDRESS_TO, 100),
+            (ACCOUNT_ADDRESS_FROM, 100),
+        ]), context=mock_context)
+
+    assert 'Account cannot send tokens to itself.' == str(error.value)
+    assert initial_state == mock_context.state
+
+
+@pytest.mark.parametrize('transfers_count', [0, BULK_TRANSFER_MAX_TRANSFERS + 1])
+def test_bulk_transfer_with_invalid_transfers_count(transfers_count):
+    """
+    Case: send transaction request with no transfers or with more transfers than allowed.
+    Expect: invalid transaction error is raised with number of transfers error message.
+    """
+    with pytest.raises(InvalidTransaction) as error:
+        AccountHandler().apply(
+            transaction=create_bulk_transfer_request([(ACCOUNT_ADDRESS_TO, 1)] * transfers_count),
+            context=create_context(),
+        )
+
+    assert proto_error_msg(
+        BulkTransferPayload,
+        {
+            'transfers': [f'Number of transfers should be from 1 to {BULK_TRANSFER_MAX_TRANSFERS}.'],
+        }
+    ) == str(error.value)
+
+
+def test_bulk_transfer_of_first_family_version():
+    """
+    Case: send bulk transfer transaction request of family version 0.1, that does not have the method.
+    Expect: invalid transaction error is raised, state is not changed.
+    """
+    mock_context = create_context()
+    initial_state = dict(mock_context.state)
+
+    with pytest.raises(InvalidTransaction) as error:
+        AccountHandler().apply(
+            transaction=create_bulk_transfer_request([(ACCOUNT_ADDRESS_TO, 100)], family_version=FAMILY_VERSIONS[0]),
+            context=mock_context,
+        )
+
+    assert f'Invalid account method value ({AccountMethod.BULK_TRANSFER}) has been set.' == str(error.value)
+    assert initial_state == mock_context.state
@@ -32,8 +32,10 @@ from remme.protos.account_pb2 import Account
 from remme.protos.transaction_pb2 import TransactionPayload
 from remme.settings.helper import _make_settings_key
 from remme.shared.utils import hash512, web3_hash
+from remme.tp import atomic_swap
 from remme.tp.atomic_swap import AtomicSwapHandler
 from remme.tp.basic import BasicHandler
+from remme.tp.context import CacheContextService
 
 from remme.settings import (
     SETTINGS_KEY_ZERO_ADDRESS_OWNERS,
@@ -492,3 +494,45 @@ def test_expire_atomic_swap_before_invalid_withdrawal_by_bot():
 
     assert f'Swap initiator needs to wait 24 hours since timestamp {CURRENT_TIMESTAMP} to withdraw.' == \
            str(error.value)
+
+
+def create_latest_block_context_service(timestamp):
+    latest_block_info = BlockInfo()
+    latest_block_info.timestamp = timestamp
+
+    return CacheContextService(context=StubContext(
+        inputs=[BLOCK_INFO_CONFIG_ADDRESS, BLOCK_INFO_ADDRESS], outputs=[], initial_state={
+            BLOCK_INFO_CONFIG_ADDRESS: SERIALIZED_BLOCK_INFO_CONFIG,
+            BLOCK_INFO_ADDRESS: latest_block_info.SerializeToString(),
+        },
+    ))
+
+
+def test_latest_block_info_is_reused_by_block(mocker):
+    """
+    Case: get the latest block info in transactions of the same block.
+    Expect: the block info parsed by the first transaction is returned without parsing it again.
+    """
+    mocker.patch.object(atomic_swap, '_latest_block_infos', atomic_swap.LRUCache(maxsize=2))
+
+    first_block_info = AtomicSwapHandler._get_latest_block_info(create_latest_block_context_service(CURRENT_TIMESTAMP))
+
+    context_service = create_latest_block_context_service(CURRENT_TIMESTAMP)
+    mock_get_cached_data = mocker.spy(context_service, 'get_cached_data')
+
+    assert first_block_info is AtomicSwapHandler._get_latest_block_info(context_service)
+    assert 1 == mock_get_cached_data.call_count
+
+
+def test_latest_block_info_of_another_fork_is_not_reused(mocker):
+    """
+    Case: get the latest block info of the same number, which differs in another fork.
+    Expect: the block info of the transaction state is returned.
+    """
+    mocker.patch.object(atomic_swap, '_latest_block_infos', atomic_swap.LRUCache(maxsize=2))
+
+    AtomicSwapHandler._get_latest_block_info(create_latest_block_context_service(CURRENT_TIMESTAMP))
+
+    block_info = AtomicSwapHandler._get_latest_block_info(create_latest_block_context_service(CURRENT_TIMESTAMP + 1))
+
+    assert CURRENT_TIMESTAMP + 1 == block_info.timestamp
@@ -0,0 +1,203 @@
+"""
+Provide tests for atomic swap handler expire many method implementation.
+"""
+import datetime
+import json
+import time
+
+import pytest
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from testing.conftest import create_signer
+from testing.mocks.stub import StubContext
+from remme.clients.block_info import (
+    CONFIG_ADDRESS,
+    BlockInfo,
+    BlockInfoConfig,
+    BlockInfoClient,
+)
+from remme.protos.account_pb2 import Account
+from remme.protos.atomic_swap_pb2 import (
+    AtomicSwapExpireManyPayload,
+    AtomicSwapInfo,
+    AtomicSwapMethod,
+)
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.shared.constants import Events
+from remme.shared.utils import hash512
+from remme.tp.atomic_swap import (
+    FAMILY_VERSIONS,
+    AtomicSwapHandler,
+)
+
+BOT_ADDRESS = '112007b9433e1da5c624ff926477141abedfd57585a36590b0a8edc4104ef28093ee30'
+BOT_PRIVATE_KEY = '1cb15ecfe1b3dc02df0003ac396037f85b98cf9f99b0beae000dc5e9e8b6dab4'
+BOT_PUBLIC_KEY = '03ecc5cb4094eb05319be6c7a63ebf17133d4ffaea48cdcfd1d5fc79dac7db7b6b'
+BOT_INITIAL_BALANCE = 1000
+
+ALICE_ADDRESS = '112007db8a00c010402e2e3a7d03491323e761e0ea612481c518605648ceeb5ed454f7'
+
+RANDOM_NODE_PUBLIC_KEY = '039d6881f0a71d05659e1f40b443684b93c7b7c504ea23ea8949ef5216a2236940'
+
+SWAP_IDS = [hash512(f'swap-{index}')[:64] for index in range(3)]
+ADDRESSES_TO_STORE_SWAP_INFO_BY = [AtomicSwapHandler().make_address_from_data(swap_id) for swap_id in SWAP_IDS]
+
+CURRENT_TIMESTAMP = int(datetime.datetime.now().timestamp())
+EXPIRED_SWAP_TIMESTAMP = CURRENT_TIMESTAMP - 2 * 24 * 60 * 60 - 1
+NOT_EXPIRED_SWAP_TIMESTAMP = CURRENT_TIMESTAMP - 1
+
+BLOCK_INFO_ADDRESS = BlockInfoClient.create_block_address(1000)
+
+INPUTS = [
+    CONFIG_ADDRESS,
+    BLOCK_INFO_ADDRESS,
+    BOT_ADDRESS,
+    *ADDRESSES_TO_STORE_SWAP_INFO_BY,
+]
+OUTPUTS = [
+    BOT_ADDRESS,
+    *ADDRESSES_TO_STORE_SWAP_INFO_BY,
+]
+
+
+def create_expire_many_transaction_request(swap_ids, family_version=FAMILY_VERSIONS[-1]):
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = AtomicSwapMethod.EXPIRE_MANY
+    transaction_payload.data = AtomicSwapExpireManyPayload(swap_ids=swap_ids).SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = TransactionHeader(
+        signer_public_key=BOT_PUBLIC_KEY,
+        family_name=AtomicSwapHandler().family_name,
+        family_version=family_version,
+        inputs=INPUTS,
+        outputs=OUTPUTS,
+        dependencies=[],
+        payload_sha512=hash512(data=serialized_transaction_payload),
+        batcher_public_key=RANDOM_NODE_PUBLIC_KEY,
+        nonce=time.time().hex().encode(),
+    )
+
+    serialized_header = transaction_header.SerializeToString()
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=create_signer(private_key=BOT_PRIVATE_KEY).sign(serialized_header),
+    )
+
+
+def create_swap_info(swap_id, amount, created_at=EXPIRED_SWAP_TIMESTAMP, sender_address=BOT_ADDRESS):
+    swap_info = AtomicSwapInfo()
+    swap_info.swap_id = swap_id
+    swap_info.state = AtomicSwapInfo.OPENED
+    swap_info.amount = amount
+    swap_info.created_at = created_at
+    swap_info.sender_address = sender_address
+    swap_info.receiver_address = ALICE_ADDRESS
+    swap_info.is_initiator = False
+    return swap_info
+
+
+def create_context(swap_infos):
+    block_info_config = BlockInfoConfig()
+    block_info_config.latest_block = 1000
+
+    block_info = BlockInfo()
+    block_info.timestamp = CURRENT_TIMESTAMP
+
+    bot_account = Account()
+    bot_account.balance = BOT_INITIAL_BALANCE
+
+    return StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        CONFIG_ADDRESS: block_info_config.SerializeToString(),
+        BLOCK_INFO_ADDRESS: block_info.SerializeToString(),
+        BOT_ADDRESS: bot_account.SerializeToString(),
+        **{
+            AtomicSwapHandler().make_address_from_data(swap_info.swap_id): swap_info.SerializeToString()
+            for swap_info in swap_infos
+        },
+    })
+
+
+def test_expire_many_atomic_swaps():
+    """
+    Case: expire several atomic swaps of the signer, which time locks are passed.
+    Expect: swaps are expired, signer account is credited with the total amount, single event is emitted.
+    """
+    swap_infos = [create_swap_info(swap_id, amount) for swap_id, amount in zip(SWAP_IDS, [100, 200, 300])]
+    mock_context = create_context(swap_infos)
+
+    AtomicSwapHandler().apply(transaction=create_expire_many_transaction_request(SWAP_IDS), context=mock_context)
+
+    expected_bot_account = Account()
+    expected_bot_account.balance = BOT_INITIAL_BALANCE + 600
+
+    assert expected_bot_account.SerializeToString() == mock_context.state[BOT_ADDRESS]
+
+    for address, swap_info in zip(ADDRESSES_TO_STORE_SWAP_INFO_BY, swap_infos):
+        swap_info.state = AtomicSwapInfo.EXPIRED
+        assert swap_info.SerializeToString() == mock_context.state[address]
+
+    event, = mock_context.events()
+    entities_changed = json.loads(dict(event._attributes)['entities_changed'])
+
+    assert Events.SWAP_EXPIRE_MANY.value == event._event_type
+    assert SWAP_IDS == [entity['swap_id'] for entity in entities_changed if entity['type'] == 'AtomicSwapInfo']
+
+
+@pytest.mark.parametrize('swap_infos, swap_ids, expected_error', [
+    pytest.param(
+        [create_swap_info(SWAP_IDS[0], 100)], SWAP_IDS[:2],
+        f'Atomic swap was not initiated for identifier {SWAP_IDS[1]}!', id='not initiated swap',
+    ),
+    pytest.param(
+        [create_swap_info(SWAP_IDS[0], 100), create_swap_info(SWAP_IDS[1], 100, sender_address=ALICE_ADDRESS)],
+        SWAP_IDS[:2],
+        'Signer is not the one who opened the swap.', id='swap of other sender',
+    ),
+    pytest.param(
+        [create_swap_info(SWAP_IDS[0], 100), create_swap_info(SWAP_IDS[1], 100, created_at=NOT_EXPIRED_SWAP_TIMESTAMP)],
+        SWAP_IDS[:2],
+        f'Swap non initiator needs to wait 48 hours since timestamp {NOT_EXPIRED_SWAP_TIMESTAMP} to withdraw.',
+        id='time lock is not passed',
+    ),
+    pytest.param(
+        [create_swap_info(SWAP_IDS[0], 100)], [SWAP_IDS[0], SWAP_IDS[0]],
+        'Atomic swap identifiers should be unique.', id='repeated swap',
+    ),
+])
+def test_expire_many_atomic_swaps_with_invalid_swap(swap_infos, swap_ids, expected_error):
+    """
+    Case: expire several atomic swaps, one of which could not be expired separately.
+    Expect: invalid transaction error is raised with the swap error message, none of swaps is expired.
+    """
+    mock_context = create_context(swap_infos)
+    state_before = dict(mock_context.state)
+
+    with pytest.raises(InvalidTransaction) as error:
+        AtomicSwapHandler().apply(transaction=create_expire_many_transaction_request(swap_ids), context=mock_context)
+
+    assert expected_error == str(error.value)
+    assert state_before == mock_context.state
+
+
+def test_expire_many_atomic_swaps_of_first_family_version():
+    """
+    Case: expire several atomic swaps by transaction request of family version 0.1, not having the method.
+    Expect: invalid transaction error is raised, none of swaps is expired.
+    """
+    mock_context = create_context([create_swap_info(swap_id, 100) for swap_id in SWAP_IDS])
+    state_before = dict(mock_context.state)
+
+    with pytest.raises(InvalidTransaction) as error:
+        AtomicSwapHandler().apply(
+            transaction=create_expire_many_transaction_request(SWAP_IDS, family_version=FAMILY_VERSIONS[0]),
+            context=mock_context,
+        )
+
+    assert f'Invalid account method value ({AtomicSwapMethod.EXPIRE_MANY}) has been set.' == str(error.value)
+    assert state_before == mock_context.state
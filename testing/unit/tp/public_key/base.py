@@ -31,6 +31,7 @@ SENDER_PRIVATE_KEY = '1cb15ecfe1b3dc02df0003ac396037f85b98cf9f99b0beae000dc5e9e8
 SENDER_PUBLIC_KEY = '03ecc5cb4094eb05319be6c7a63ebf17133d4ffaea48cdcfd1d5fc79dac7db7b6b'
 SENDER_ADDRESS = '112007b9433e1da5c624ff926477141abedfd57585a36590b0a8edc4104ef28093ee30'
 SENDER_INITIAL_BALANCE = 5000
+SENDER_INDEX_ADDRESS = PubKeyHandler().make_owner_index_address(SENDER_ADDRESS)
 
 CERTIFICATE_PRIVATE_KEY, CERTIFICATE_PUBLIC_KEY = generate_rsa_keys()
 ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY = generate_address('pub_key', CERTIFICATE_PUBLIC_KEY)
@@ -121,11 +122,14 @@ def generate_ecdsa_payload(key=None, entity_hash=None, entity_hash_signature=Non
     )
 
 
-def generate_header(payload, inputs, outputs, signer_public_key=SENDER_PUBLIC_KEY):
+def generate_header(
+    payload, inputs, outputs, signer_public_key=SENDER_PUBLIC_KEY,
+    family_version=TRANSACTION_REQUEST_ACCOUNT_HANDLER_PARAMS.get('family_version'),
+):
     return TransactionHeader(
         signer_public_key=signer_public_key,
         family_name=TRANSACTION_REQUEST_ACCOUNT_HANDLER_PARAMS.get('family_name'),
-        family_version=TRANSACTION_REQUEST_ACCOUNT_HANDLER_PARAMS.get('family_version'),
+        family_version=family_version,
         inputs=inputs,
         outputs=outputs,
         dependencies=[],
@@ -0,0 +1,372 @@
+"""
+Provide tests for public key handler owner's public keys index implementation.
+"""
+import pytest
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_signing.secp256k1 import (
+    Secp256k1PrivateKey,
+    Secp256k1Context,
+)
+
+from remme.protos.account_pb2 import Account
+from remme.protos.pub_key_pb2 import (
+    NewPubKeyStoreAndPayPayload,
+    PubKeyMethod,
+    PubKeyOwnerIndex,
+    PubKeyOwnerIndexBucket,
+)
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.settings import ZERO_ADDRESS
+from remme.tp.pub_key import (
+    FAMILY_VERSIONS,
+    PUB_KEY_STORE_PRICE,
+    PUB_KEYS_INDEX_BUCKET_SIZE,
+    PUB_KEYS_MIGRATION_SIZE,
+    PubKeyHandler,
+)
+from testing.conftest import create_signer
+from testing.mocks.stub import StubContext
+from .base import (
+    ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    SENDER_PRIVATE_KEY,
+    SENDER_ADDRESS,
+    SENDER_INDEX_ADDRESS,
+    SENDER_INITIAL_BALANCE,
+    IS_NODE_ECONOMY_ENABLED_ADDRESS,
+    generate_header,
+    generate_rsa_payload,
+)
+
+OWNER_PRIVATE_KEY = 'baea35704ff361475ede4f6fee4a542e2e74eaaf07c38e1d1931e07de5e6487f'
+OWNER_PUBLIC_KEY = '022a20772a806cf32393663055ae8ad26e60ee2619ae449fe7b6ebe0f355006c4e'
+OWNER_ADDRESS = '11200781ae7b6618d6eae1fba104f3ed5565fab462a6f735b3e2a3978d5d5c1fe81579'
+OWNER_INDEX_ADDRESS = PubKeyHandler().make_owner_index_address(OWNER_ADDRESS)
+
+PAYER_PRIVATE_KEY = 'bdf1567f8f3374d128d32466eb9862ecb0f2f23930abd6ee94990f418780e889'
+PAYER_PUBLIC_KEY = '0360f28da594661d39deabf2817cad2bdacdcca043e91004d3c935fa9e93caa1a3'
+PAYER_ADDRESS = '1120078c9ac38f8b9c6c0560afd71ade8b7821cc5a43486320578f9fa8414ee975af88'
+
+SENDER_INDEX_BUCKETS_ADDRESSES = [
+    PubKeyHandler().make_owner_index_bucket_address(SENDER_ADDRESS, bucket) for bucket in range(3)
+]
+
+INPUTS = OUTPUTS = [
+    ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    SENDER_ADDRESS,
+    SENDER_INDEX_ADDRESS,
+    *SENDER_INDEX_BUCKETS_ADDRESSES,
+    ZERO_ADDRESS,
+    IS_NODE_ECONOMY_ENABLED_ADDRESS,
+]
+
+STORE_FOR_OTHER_INPUTS = STORE_FOR_OTHER_OUTPUTS = [
+    ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    OWNER_ADDRESS,
+    OWNER_INDEX_ADDRESS,
+    PAYER_ADDRESS,
+    ZERO_ADDRESS,
+    IS_NODE_ECONOMY_ENABLED_ADDRESS,
+]
+
+
+def generate_public_key_addresses(count):
+    return [PubKeyHandler().make_address_from_data(f'public-key-{index}') for index in range(count)]
+
+
+def create_store_transaction_request(inputs=INPUTS, outputs=OUTPUTS, family_version=FAMILY_VERSIONS[-1]):
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = PubKeyMethod.STORE
+    transaction_payload.data = generate_rsa_payload().SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = generate_header(serialized_transaction_payload, inputs, outputs, family_version=family_version)
+
+    serialized_header = transaction_header.SerializeToString()
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=create_signer(private_key=SENDER_PRIVATE_KEY).sign(serialized_header),
+    )
+
+
+def create_store_for_other_transaction_request(family_version=FAMILY_VERSIONS[-1]):
+    new_public_key_payload = generate_rsa_payload()
+    signature_by_owner = Secp256k1Context().sign(
+        new_public_key_payload.SerializeToString(), Secp256k1PrivateKey.from_hex(OWNER_PRIVATE_KEY),
+    )
+
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = PubKeyMethod.STORE_AND_PAY
+    transaction_payload.data = NewPubKeyStoreAndPayPayload(
+        pub_key_payload=new_public_key_payload,
+        owner_public_key=bytes.fromhex(OWNER_PUBLIC_KEY),
+        signature_by_owner=bytes.fromhex(signature_by_owner),
+    ).SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = generate_header(
+        serialized_transaction_payload, STORE_FOR_OTHER_INPUTS, STORE_FOR_OTHER_OUTPUTS,
+        signer_public_key=PAYER_PUBLIC_KEY, family_version=family_version,
+    )
+
+    serialized_header = transaction_header.SerializeToString()
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=create_signer(private_key=PAYER_PRIVATE_KEY).sign(serialized_header),
+    )
+
+
+def test_owner_index_addresses():
+    """
+    Case: get addresses of the owner's public keys index and its buckets.
+    Expect: addresses are valid public key family addresses sharing the owner's index prefix.
+    """
+    handler = PubKeyHandler()
+    prefix = handler.make_owner_index_prefix(SENDER_ADDRESS)
+
+    assert 62 == len(prefix)
+    assert prefix.startswith(handler.namespaces[0])
+
+    addresses = [SENDER_INDEX_ADDRESS, *SENDER_INDEX_BUCKETS_ADDRESSES]
+
+    assert all(handler.is_handler_address(address) and address.startswith(prefix) for address in addresses)
+    assert len(addresses) == len(set(addresses))
+    assert not handler.make_owner_index_prefix(ZERO_ADDRESS).startswith(prefix)
+
+
+def test_store_public_key_to_owner_index_without_full_bucket():
+    """
+    Case: send transaction request to store public key, when the owner's index has full buckets and some latest keys.
+    Expect: public key address is appended to the latest keys of the index, buckets are not changed.
+    """
+    stored_public_key_addresses = generate_public_key_addresses(3)
+
+    sender_account = Account()
+    sender_account.balance = SENDER_INITIAL_BALANCE
+
+    sender_index = PubKeyOwnerIndex()
+    sender_index.buckets_count = 1
+    sender_index.pub_keys.extend(stored_public_key_addresses)
+
+    sender_index_bucket = PubKeyOwnerIndexBucket()
+    sender_index_bucket.pub_keys.extend(generate_public_key_addresses(PUB_KEYS_INDEX_BUCKET_SIZE))
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+        SENDER_INDEX_ADDRESS: sender_index.SerializeToString(),
+        SENDER_INDEX_BUCKETS_ADDRESSES[0]: sender_index_bucket.SerializeToString(),
+    })
+
+    PubKeyHandler().apply(transaction=create_store_transaction_request(), context=mock_context)
+
+    expected_sender_index = PubKeyOwnerIndex()
+    expected_sender_index.buckets_count = 1
+    expected_sender_index.pub_keys.extend(stored_public_key_addresses + [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY])
+
+    assert expected_sender_index.SerializeToString() == mock_context.state[SENDER_INDEX_ADDRESS]
+    assert sender_index_bucket.SerializeToString() == mock_context.state[SENDER_INDEX_BUCKETS_ADDRESSES[0]]
+    assert SENDER_INDEX_BUCKETS_ADDRESSES[1] not in mock_context.state
+
+
+def test_store_public_key_to_owner_index_fills_bucket():
+    """
+    Case: send transaction request to store public key, when the owner's index lacks a key to fill a bucket.
+    Expect: latest keys with the public key address are written to the next bucket, index keeps buckets count only.
+    """
+    stored_public_key_addresses = generate_public_key_addresses(PUB_KEYS_INDEX_BUCKET_SIZE - 1)
+
+    sender_account = Account()
+    sender_account.balance = SENDER_INITIAL_BALANCE
+
+    sender_index = PubKeyOwnerIndex()
+    sender_index.buckets_count = 1
+    sender_index.pub_keys.extend(stored_public_key_addresses)
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+        SENDER_INDEX_ADDRESS: sender_index.SerializeToString(),
+    })
+
+    PubKeyHandler().apply(transaction=create_store_transaction_request(), context=mock_context)
+
+    expected_sender_index = PubKeyOwnerIndex()
+    expected_sender_index.buckets_count = 2
+
+    expected_sender_index_bucket = PubKeyOwnerIndexBucket()
+    expected_sender_index_bucket.pub_keys.extend(stored_public_key_addresses + [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY])
+
+    assert expected_sender_index.SerializeToString() == mock_context.state[SENDER_INDEX_ADDRESS]
+    assert expected_sender_index_bucket.SerializeToString() == mock_context.state[SENDER_INDEX_BUCKETS_ADDRESSES[1]]
+    assert SENDER_INDEX_BUCKETS_ADDRESSES[0] not in mock_context.state
+
+
+def test_store_public_key_moves_bucket_of_account_public_keys_to_owner_index():
+    """
+    Case: send transaction request to store public key, when more than a bucket of the owner's public keys
+        are linked to the account.
+    Expect: a bucket of account public keys is moved to the index, the public key address is appended to the account.
+    """
+    account_public_key_addresses = generate_public_key_addresses(3 * PUB_KEYS_INDEX_BUCKET_SIZE + 2)
+
+    sender_account = Account()
+    sender_account.balance = SENDER_INITIAL_BALANCE
+    sender_account.pub_keys.extend(account_public_key_addresses)
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+    })
+
+    PubKeyHandler().apply(transaction=create_store_transaction_request(), context=mock_context)
+
+    expected_sender_account = Account()
+    expected_sender_account.balance = SENDER_INITIAL_BALANCE - PUB_KEY_STORE_PRICE
+    expected_sender_account.pub_keys.extend(
+        account_public_key_addresses[PUB_KEYS_MIGRATION_SIZE:] + [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY],
+    )
+
+    expected_sender_index = PubKeyOwnerIndex()
+    expected_sender_index.buckets_count = 1
+
+    expected_sender_index_bucket = PubKeyOwnerIndexBucket()
+    expected_sender_index_bucket.pub_keys.extend(account_public_key_addresses[:PUB_KEYS_MIGRATION_SIZE])
+
+    assert expected_sender_account.SerializeToString() == mock_context.state[SENDER_ADDRESS]
+    assert expected_sender_index.SerializeToString() == mock_context.state[SENDER_INDEX_ADDRESS]
+    assert expected_sender_index_bucket.SerializeToString() == mock_context.state[SENDER_INDEX_BUCKETS_ADDRESSES[0]]
+    assert SENDER_INDEX_BUCKETS_ADDRESSES[1] not in mock_context.state
+
+
+def test_store_public_keys_move_account_public_keys_to_owner_index_in_steps():
+    """
+    Case: store public keys one by one, when more than 3 buckets of the owner's public keys are linked to the account.
+    Expect: every store writes at most a bucket, all keys end up in the index in the order they were stored.
+    """
+    handler = PubKeyHandler()
+
+    account_public_key_addresses = generate_public_key_addresses(3 * PUB_KEYS_INDEX_BUCKET_SIZE + 2)
+    new_public_key_addresses = [handler.make_address_from_data(f'new-public-key-{index}') for index in range(5)]
+
+    owner_account = Account()
+    owner_account.pub_keys.extend(account_public_key_addresses)
+    owner_index = None
+    buckets = {}
+
+    for new_public_key_address in new_public_key_addresses:
+        state = handler._store_public_keys_to_owner_index(
+            public_keys_to_store_addresses=[new_public_key_address],
+            owner_address=SENDER_ADDRESS,
+            owner_account=owner_account,
+            owner_index=owner_index,
+        )
+        owner_index = state[SENDER_INDEX_ADDRESS]
+
+        written_buckets = {
+            address: bucket for address, bucket in state.items() if address in SENDER_INDEX_BUCKETS_ADDRESSES
+        }
+        assert len(written_buckets) <= 1
+        buckets.update(written_buckets)
+
+        listed_public_key_addresses = [
+            address for bucket_address in SENDER_INDEX_BUCKETS_ADDRESSES if bucket_address in buckets
+            for address in buckets[bucket_address].pub_keys
+        ] + list(owner_index.pub_keys) + list(owner_account.pub_keys)
+        stored_count = new_public_key_addresses.index(new_public_key_address) + 1
+
+        assert account_public_key_addresses + new_public_key_addresses[:stored_count] == listed_public_key_addresses
+
+    assert not owner_account.pub_keys
+    assert 3 == owner_index.buckets_count
+
+
+@pytest.mark.parametrize('family_version, expected_account_public_keys, expected_index_public_keys', [
+    (FAMILY_VERSIONS[0], [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY], None),
+    (FAMILY_VERSIONS[-1], [], [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY]),
+])
+def test_store_public_key_for_other_by_family_version(
+    family_version, expected_account_public_keys, expected_index_public_keys,
+):
+    """
+    Case: send transaction request to store public key for other of the first and the latest family versions.
+    Expect: public key address is linked to the owner's account by 0.1 and to the owner's index by the latest one.
+    """
+    payer_account = Account()
+    payer_account.balance = SENDER_INITIAL_BALANCE
+
+    mock_context = StubContext(inputs=STORE_FOR_OTHER_INPUTS, outputs=STORE_FOR_OTHER_OUTPUTS, initial_state={
+        PAYER_ADDRESS: payer_account.SerializeToString(),
+    })
+
+    PubKeyHandler().apply(
+        transaction=create_store_for_other_transaction_request(family_version), context=mock_context,
+    )
+
+    stored_payer_account = Account()
+    stored_payer_account.ParseFromString(mock_context.state[PAYER_ADDRESS])
+
+    stored_owner_account = Account()
+    stored_owner_account.ParseFromString(mock_context.state.get(OWNER_ADDRESS, b''))
+
+    assert SENDER_INITIAL_BALANCE - PUB_KEY_STORE_PRICE == stored_payer_account.balance
+    assert expected_account_public_keys == list(stored_owner_account.pub_keys)
+
+    if expected_index_public_keys is None:
+        assert OWNER_INDEX_ADDRESS not in mock_context.state
+    else:
+        stored_owner_index = PubKeyOwnerIndex()
+        stored_owner_index.ParseFromString(mock_context.state[OWNER_INDEX_ADDRESS])
+        assert expected_index_public_keys == list(stored_owner_index.pub_keys)
+
+
+def test_store_public_key_of_first_family_version_to_account():
+    """
+    Case: send transaction request of family version 0.1 to store public key, inputs do not contain owner's index.
+    Expect: public key address is appended to the owner's account, the owner's index is not changed.
+    """
+    sender_account = Account()
+    sender_account.balance = SENDER_INITIAL_BALANCE
+    sender_account.pub_keys.extend(generate_public_key_addresses(2))
+
+    inputs = outputs = [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY, SENDER_ADDRESS, ZERO_ADDRESS, IS_NODE_ECONOMY_ENABLED_ADDRESS]
+
+    mock_context = StubContext(inputs=inputs, outputs=outputs, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+    })
+
+    PubKeyHandler().apply(
+        transaction=create_store_transaction_request(inputs, outputs, family_version=FAMILY_VERSIONS[0]),
+        context=mock_context,
+    )
+
+    expected_sender_account = Account()
+    expected_sender_account.balance = SENDER_INITIAL_BALANCE - PUB_KEY_STORE_PRICE
+    expected_sender_account.pub_keys.extend(generate_public_key_addresses(2) + [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY])
+
+    assert expected_sender_account.SerializeToString() == mock_context.state[SENDER_ADDRESS]
+    assert SENDER_INDEX_ADDRESS not in mock_context.state
+
+
+def test_store_public_key_to_owner_index_not_declared_in_inputs():
+    """
+    Case: send transaction request to store public key to the owner's index, which address is not in inputs.
+    Expect: invalid transaction error is raised, state is not changed.
+    """
+    inputs = outputs = [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY, SENDER_ADDRESS, ZERO_ADDRESS, IS_NODE_ECONOMY_ENABLED_ADDRESS]
+
+    sender_account = Account()
+    sender_account.balance = SENDER_INITIAL_BALANCE
+
+    mock_context = StubContext(inputs=inputs, outputs=outputs, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+    })
+
+    with pytest.raises(InvalidTransaction) as error:
+        PubKeyHandler().apply(transaction=create_store_transaction_request(inputs, outputs), context=mock_context)
+
+    assert f'Addresses "{[SENDER_INDEX_ADDRESS]}" are not declared in transaction inputs' == str(error.value)
+    assert {SENDER_ADDRESS: sender_account.SerializeToString()} == mock_context.state
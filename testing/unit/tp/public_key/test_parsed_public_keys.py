@@ -0,0 +1,83 @@
+"""
+Provide tests for public key handler deserialized public keys reusing implementation.
+"""
+import pytest
+
+from remme.shared.utils import LRUCache
+from remme.tp import pub_key
+from remme.tp.pub_key import (
+    _SECP256K1_VERIFY_CONTEXT,
+    _load_ed25519_public_key,
+    _load_rsa_public_key,
+    _load_secp256k1_public_key,
+    load_public_key,
+)
+from .base import (
+    CERTIFICATE_PUBLIC_KEY,
+    ECDSA_PUBLIC_KEY,
+    ED25519_PUBLIC_KEY,
+)
+
+
+@pytest.fixture
+def parsed_public_keys(monkeypatch):
+    """
+    Replace deserialized public keys cache with an empty one for the test duration.
+    """
+    cache = LRUCache(maxsize=pub_key.PARSED_PUBLIC_KEYS_CACHE_SIZE)
+    monkeypatch.setattr(pub_key, '_parsed_public_keys', cache)
+    return cache
+
+
+@pytest.mark.parametrize('loader, key', [
+    (_load_rsa_public_key, CERTIFICATE_PUBLIC_KEY),
+    (_load_secp256k1_public_key, ECDSA_PUBLIC_KEY),
+    (_load_ed25519_public_key, ED25519_PUBLIC_KEY),
+])
+def test_load_public_key_reuses_deserialized_object(parsed_public_keys, loader, key):
+    """
+    Case: load the same public key twice.
+    Expect: the same deserialized object is returned, cache size is accounted in bytes of the key.
+    """
+    public_key = load_public_key(loader, key)
+
+    assert public_key is load_public_key(loader, bytes(key))
+    assert 1 == parsed_public_keys.info().hits
+    assert len(key) == parsed_public_keys.info().currsize
+
+
+def test_secp256k1_public_keys_share_verify_context(parsed_public_keys):
+    """
+    Case: load secp256k1 public key.
+    Expect: the key uses process wide verify-enabled context instead of allocating own one.
+    """
+    public_key = load_public_key(_load_secp256k1_public_key, ECDSA_PUBLIC_KEY)
+
+    assert _SECP256K1_VERIFY_CONTEXT.ctx == public_key.ctx
+
+
+def test_load_public_key_does_not_cache_errors(parsed_public_keys):
+    """
+    Case: load public key, that could not be deserialized.
+    Expect: deserialization error is raised, nothing is stored to the cache.
+    """
+    with pytest.raises(ValueError):
+        load_public_key(_load_rsa_public_key, b'not-der-public-key')
+
+    assert 0 == len(parsed_public_keys)
+
+
+def test_lru_cache_evicts_by_size():
+    """
+    Case: set entries with sizes, which total exceeds maximum size of the cache.
+    Expect: least recently used entries are evicted until total size fits, too big entries are not stored.
+    """
+    cache = LRUCache(maxsize=10)
+    cache.set('first', 1, size=4)
+    cache.set('second', 2, size=4)
+    cache.set('third', 3, size=4)
+    cache.set('huge', 4, size=11)
+
+    assert 'first' not in cache
+    assert 'huge' not in cache
+    assert 8 == cache.info().currsize
@@ -0,0 +1,205 @@
+"""
+Provide tests for public key handler apply (store batch) method implementation.
+"""
+import pytest
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+
+from remme.protos.account_pb2 import Account
+from remme.protos.pub_key_pb2 import (
+    NewPubKeyBatchPayload,
+    PubKeyMethod,
+    PubKeyOwnerIndex,
+    PubKeyStorage,
+)
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.settings import ZERO_ADDRESS
+from remme.tp.pub_key import (
+    FAMILY_VERSIONS,
+    PUB_KEY_STORE_PRICE,
+    PubKeyHandler,
+)
+from testing.conftest import create_signer
+from testing.mocks.stub import StubContext
+from .base import (
+    ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    ADDRESS_FROM_ECDSA_PUBLIC_KEY,
+    ADDRESS_FROM_ED25519_PUBLIC_KEY,
+    IS_NODE_ECONOMY_ENABLED_ADDRESS,
+    SENDER_ADDRESS,
+    SENDER_INDEX_ADDRESS,
+    SENDER_INITIAL_BALANCE,
+    SENDER_PRIVATE_KEY,
+    SENDER_PUBLIC_KEY,
+    generate_ecdsa_payload,
+    generate_ed25519_payload,
+    generate_header,
+    generate_rsa_payload,
+)
+
+INPUTS = OUTPUTS = [
+    ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    ADDRESS_FROM_ED25519_PUBLIC_KEY,
+    ADDRESS_FROM_ECDSA_PUBLIC_KEY,
+    SENDER_ADDRESS,
+    SENDER_INDEX_ADDRESS,
+    ZERO_ADDRESS,
+    IS_NODE_ECONOMY_ENABLED_ADDRESS,
+]
+
+
+def create_store_batch_transaction_request(new_public_key_payloads, inputs=INPUTS, outputs=OUTPUTS,
+                                          family_version=FAMILY_VERSIONS[-1]):
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = PubKeyMethod.STORE_BATCH
+    transaction_payload.data = NewPubKeyBatchPayload(pub_keys=new_public_key_payloads).SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = generate_header(serialized_transaction_payload, inputs, outputs, family_version=family_version)
+
+    serialized_header = transaction_header.SerializeToString()
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=create_signer(private_key=SENDER_PRIVATE_KEY).sign(serialized_header),
+    )
+
+
+def create_context(sender_balance=SENDER_INITIAL_BALANCE, initial_state=None):
+    sender_account = Account()
+    sender_account.balance = sender_balance
+
+    return StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+        **(initial_state or {}),
+    })
+
+
+def test_store_public_keys_batch():
+    """
+    Case: send transaction request to store RSA, Ed25519 and ECDSA public keys in a batch.
+    Expect: public keys are stored, sender is charged for all of them, keys are appended to sender's index in order.
+    """
+    new_public_key_payloads = [generate_rsa_payload(), generate_ed25519_payload(), generate_ecdsa_payload()]
+    mock_context = create_context()
+
+    PubKeyHandler().apply(
+        transaction=create_store_batch_transaction_request(new_public_key_payloads), context=mock_context,
+    )
+
+    public_keys_addresses = [
+        ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY, ADDRESS_FROM_ED25519_PUBLIC_KEY, ADDRESS_FROM_ECDSA_PUBLIC_KEY,
+    ]
+
+    for address, new_public_key_payload in zip(public_keys_addresses, new_public_key_payloads):
+        expected_public_key_storage = PubKeyStorage()
+        expected_public_key_storage.owner = SENDER_PUBLIC_KEY
+        expected_public_key_storage.payload.CopyFrom(new_public_key_payload)
+        expected_public_key_storage.is_revoked = False
+
+        assert expected_public_key_storage.SerializeToString() == mock_context.state[address]
+
+    expected_sender_account = Account()
+    expected_sender_account.balance = SENDER_INITIAL_BALANCE - 3 * PUB_KEY_STORE_PRICE
+
+    expected_zero_account = Account()
+    expected_zero_account.balance = 3 * PUB_KEY_STORE_PRICE
+
+    expected_sender_index = PubKeyOwnerIndex()
+    expected_sender_index.pub_keys.extend(public_keys_addresses)
+
+    assert expected_sender_account.SerializeToString() == mock_context.state[SENDER_ADDRESS]
+    assert expected_zero_account.SerializeToString() == mock_context.state[ZERO_ADDRESS]
+    assert expected_sender_index.SerializeToString() == mock_context.state[SENDER_INDEX_ADDRESS]
+
+
+@pytest.mark.parametrize('new_public_key_payloads, initial_state, expected_error', [
+    pytest.param(
+        [generate_rsa_payload(), generate_ed25519_payload(entity_hash_signature=b'invalid-signature')], {},
+        'Invalid signature', id='invalid signature',
+    ),
+    pytest.param(
+        [generate_rsa_payload(), generate_rsa_payload()], {},
+        'Public keys of the batch should be unique.', id='repeated public key',
+    ),
+    pytest.param(
+        [generate_rsa_payload(), generate_ed25519_payload()],
+        {ADDRESS_FROM_ED25519_PUBLIC_KEY: PubKeyStorage(owner=SENDER_PUBLIC_KEY).SerializeToString()},
+        'This public key is already registered.', id='already registered public key',
+    ),
+])
+def test_store_public_keys_batch_with_invalid_public_key(new_public_key_payloads, initial_state, expected_error):
+    """
+    Case: send transaction request to store public keys in a batch, one of which could not be stored separately.
+    Expect: invalid transaction error is raised with the public key error message, none of public keys is stored.
+    """
+    mock_context = create_context(initial_state=initial_state)
+    state_before = dict(mock_context.state)
+
+    with pytest.raises(InvalidTransaction) as error:
+        PubKeyHandler().apply(
+            transaction=create_store_batch_transaction_request(new_public_key_payloads), context=mock_context,
+        )
+
+    assert expected_error == str(error.value)
+    assert state_before == mock_context.state
+
+
+def test_store_public_keys_batch_not_enough_balance():
+    """
+    Case: send transaction request to store public keys in a batch, sender balance is enough to store some of them.
+    Expect: invalid transaction error is raised with not enough balance error message.
+    """
+    with pytest.raises(InvalidTransaction) as error:
+        PubKeyHandler().apply(
+            transaction=create_store_batch_transaction_request([generate_rsa_payload(), generate_ed25519_payload()]),
+            context=create_context(sender_balance=PUB_KEY_STORE_PRICE),
+        )
+
+    assert f'Not enough transferable balance. Sender\'s current balance: {PUB_KEY_STORE_PRICE}.' == str(error.value)
+
+
+def test_store_public_keys_batch_of_first_family_version():
+    """
+    Case: send transaction request of family version 0.1, not having the method, to store public keys in a batch.
+    Expect: invalid transaction error is raised, state is not changed.
+    """
+    mock_context = create_context()
+    initial_state = dict(mock_context.state)
+
+    with pytest.raises(InvalidTransaction) as error:
+        PubKeyHandler().apply(
+            transaction=create_store_batch_transaction_request(
+                [generate_rsa_payload()], family_version=FAMILY_VERSIONS[0],
+            ),
+            context=mock_context,
+        )
+
+    assert f'Invalid account method value ({PubKeyMethod.STORE_BATCH}) has been set.' == str(error.value)
+    assert initial_state == mock_context.state
+
+
+def test_store_public_keys_batch_to_owner_index_not_declared_in_inputs():
+    """
+    Case: send transaction request to store public keys in a batch, the owner's index address is not in inputs.
+    Expect: invalid transaction error is raised, state is not changed.
+    """
+    inputs = outputs = [address for address in INPUTS if address != SENDER_INDEX_ADDRESS]
+
+    sender_account = Account()
+    sender_account.balance = SENDER_INITIAL_BALANCE
+
+    mock_context = StubContext(inputs=inputs, outputs=outputs, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+    })
+
+    with pytest.raises(InvalidTransaction) as error:
+        PubKeyHandler().apply(
+            transaction=create_store_batch_transaction_request([generate_rsa_payload()], inputs, outputs),
+            context=mock_context,
+        )
+
+    assert f'Addresses "{[SENDER_INDEX_ADDRESS]}" are not declared in transaction inputs' == str(error.value)
+    assert {SENDER_ADDRESS: sender_account.SerializeToString()} == mock_context.state
@@ -16,12 +16,14 @@ from remme.protos.account_pb2 import Account
 from remme.protos.pub_key_pb2 import (
     PubKeyStorage,
     PubKeyMethod,
+    PubKeyOwnerIndex,
     NewPubKeyPayload,
     NewPubKeyStoreAndPayPayload,
 )
 from remme.protos.transaction_pb2 import TransactionPayload
 from remme.settings import ZERO_ADDRESS
 from remme.tp.pub_key import (
+    FAMILY_VERSIONS,
     PUB_KEY_STORE_PRICE,
     PubKeyHandler,
 )
@@ -51,6 +53,8 @@ OWNER_PRIVATE_KEY = 'baea35704ff361475ede4f6fee4a542e2e74eaaf07c38e1d1931e07de5e
 OWNER_PUBLIC_KEY = '022a20772a806cf32393663055ae8ad26e60ee2619ae449fe7b6ebe0f355006c4e'
 OWNER_ADDRESS = '11200781ae7b6618d6eae1fba104f3ed5565fab462a6f735b3e2a3978d5d5c1fe81579'
 
+OWNER_INDEX_ADDRESS = PubKeyHandler().make_owner_index_address(OWNER_ADDRESS)
+
 PAYER_PRIVATE_KEY = 'bdf1567f8f3374d128d32466eb9862ecb0f2f23930abd6ee94990f418780e889'
 PAYER_PUBLIC_KEY = '0360f28da594661d39deabf2817cad2bdacdcca043e91004d3c935fa9e93caa1a3'
 PAYER_ADDRESS = '1120078c9ac38f8b9c6c0560afd71ade8b7821cc5a43486320578f9fa8414ee975af88'
@@ -206,6 +210,113 @@ def test_store_rsa_public_key_for_other():
     assert expected_state == state_as_dict
 
 
+def create_store_for_other_paid_by_owner_transaction_request(inputs, outputs, family_version):
+    new_public_key_payload = generate_rsa_payload(key=CERTIFICATE_PUBLIC_KEY)
+    serialized_new_public_key_payload = new_public_key_payload.SerializeToString()
+
+    private_key = Secp256k1PrivateKey.from_hex(OWNER_PRIVATE_KEY)
+    signature_by_owner = Secp256k1Context().sign(serialized_new_public_key_payload, private_key)
+
+    new_public_key_store_and_pay_payload = NewPubKeyStoreAndPayPayload(
+        pub_key_payload=new_public_key_payload,
+        owner_public_key=bytes.fromhex(OWNER_PUBLIC_KEY),
+        signature_by_owner=bytes.fromhex(signature_by_owner),
+    )
+
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = PubKeyMethod.STORE_AND_PAY
+    transaction_payload.data = new_public_key_store_and_pay_payload.SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = generate_header(
+        serialized_transaction_payload, inputs, outputs, signer_public_key=OWNER_PUBLIC_KEY,
+        family_version=family_version,
+    )
+
+    serialized_header = transaction_header.SerializeToString()
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=create_signer(private_key=OWNER_PRIVATE_KEY).sign(serialized_header),
+    )
+
+
+def test_store_rsa_public_key_for_other_paid_by_owner():
+    """
+    Case: send family version 0.1 transaction request to store certificate public key (RSA) for other,
+        signed by the owner itself.
+    Expect: public key information is stored to blockchain linked to owner address. Owner account is written
+        without the charge for storing, as it always was by family version 0.1.
+    """
+    transaction_request = create_store_for_other_paid_by_owner_transaction_request(
+        INPUTS, OUTPUTS, family_version=FAMILY_VERSIONS[0],
+    )
+
+    owner_account = Account()
+    owner_account.balance = PAYER_INITIAL_BALANCE
+    owner_account.pub_keys.append(RANDOM_ALREADY_STORED_OWNER_PUBLIC_KEY_ADDRESS)
+    serialized_owner_account = owner_account.SerializeToString()
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        OWNER_ADDRESS: serialized_owner_account,
+    })
+
+    expected_owner_account = Account()
+    expected_owner_account.balance = PAYER_INITIAL_BALANCE
+    expected_owner_account.pub_keys.append(RANDOM_ALREADY_STORED_OWNER_PUBLIC_KEY_ADDRESS)
+    expected_owner_account.pub_keys.append(ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY)
+    serialized_expected_owner_account = expected_owner_account.SerializeToString()
+
+    PubKeyHandler().apply(transaction=transaction_request, context=mock_context)
+
+    state_as_list = mock_context.get_state(addresses=[OWNER_ADDRESS, ZERO_ADDRESS])
+    state_as_dict = {entry.address: entry.data for entry in state_as_list}
+
+    assert serialized_expected_owner_account == state_as_dict.get(OWNER_ADDRESS)
+    assert ZERO_ADDRESS in state_as_dict
+
+
+def test_store_rsa_public_key_for_other_paid_by_owner_to_owner_index():
+    """
+    Case: send family version 0.2 transaction request to store certificate public key (RSA) for other,
+        signed by the owner itself.
+    Expect: public key is linked to the owner's index. Owner paid for storing.
+    """
+    inputs = outputs = INPUTS + [OWNER_INDEX_ADDRESS]
+
+    transaction_request = create_store_for_other_paid_by_owner_transaction_request(
+        inputs, outputs, family_version=FAMILY_VERSIONS[-1],
+    )
+
+    owner_account = Account()
+    owner_account.balance = PAYER_INITIAL_BALANCE
+    owner_account.pub_keys.append(RANDOM_ALREADY_STORED_OWNER_PUBLIC_KEY_ADDRESS)
+    serialized_owner_account = owner_account.SerializeToString()
+
+    mock_context = StubContext(inputs=inputs, outputs=outputs, initial_state={
+        OWNER_ADDRESS: serialized_owner_account,
+    })
+
+    expected_owner_account = Account()
+    expected_owner_account.balance = PAYER_INITIAL_BALANCE - PUB_KEY_STORE_PRICE
+    serialized_expected_owner_account = expected_owner_account.SerializeToString()
+
+    PubKeyHandler().apply(transaction=transaction_request, context=mock_context)
+
+    state_as_list = mock_context.get_state(addresses=[OWNER_ADDRESS, OWNER_INDEX_ADDRESS])
+    state_as_dict = {entry.address: entry.data for entry in state_as_list}
+
+    stored_owner_index = PubKeyOwnerIndex()
+    stored_owner_index.ParseFromString(state_as_dict.get(OWNER_INDEX_ADDRESS))
+
+    assert serialized_expected_owner_account == state_as_dict.get(OWNER_ADDRESS)
+    assert [
+        RANDOM_ALREADY_STORED_OWNER_PUBLIC_KEY_ADDRESS, ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    ] == list(stored_owner_index.pub_keys)
+
+
 def test_store_ed25519_public_key():
     """
     Case: send transaction request to store certificate public key (Ed25519) for other.
@@ -0,0 +1,215 @@
+"""
+Provide tests for public key handler signatures verification engines implementation.
+"""
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+
+from remme.protos.account_pb2 import Account
+from remme.protos.pub_key_pb2 import PubKeyMethod
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.settings import ZERO_ADDRESS
+from remme.tp.pub_key import (
+    PUB_KEY_STORE_PRICE,
+    InlineVerificationEngine,
+    ProcessPoolVerificationEngine,
+    PubKeyHandler,
+    create_verification_engine,
+)
+from testing.conftest import create_signer
+from testing.utils.client import generate_rsa_signature
+from testing.mocks.stub import StubContext
+from .base import (
+    ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    SENDER_PRIVATE_KEY,
+    SENDER_ADDRESS,
+    SENDER_INITIAL_BALANCE,
+    IS_NODE_ECONOMY_ENABLED_ADDRESS,
+    generate_header,
+    generate_rsa_payload,
+    generate_ed25519_payload,
+    generate_ecdsa_payload,
+)
+
+
+INPUTS = OUTPUTS = [
+    ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY,
+    SENDER_ADDRESS,
+    ZERO_ADDRESS,
+    IS_NODE_ECONOMY_ENABLED_ADDRESS,
+]
+
+
+@pytest.fixture
+def process_pool_engine():
+    """
+    Set process pool verification engine to the public key handler for the test duration.
+    """
+    engine = ProcessPoolVerificationEngine(max_workers=2)
+    PubKeyHandler().set_verification_engine(engine)
+
+    yield engine
+
+    PubKeyHandler().set_verification_engine(InlineVerificationEngine())
+
+
+def create_store_transaction_request(new_public_key_payload):
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = PubKeyMethod.STORE
+    transaction_payload.data = new_public_key_payload.SerializeToString()
+
+    serialized_transaction_payload = transaction_payload.SerializeToString()
+
+    transaction_header = generate_header(serialized_transaction_payload, INPUTS, OUTPUTS)
+
+    serialized_header = transaction_header.SerializeToString()
+
+    return TpProcessRequest(
+        header=transaction_header,
+        payload=serialized_transaction_payload,
+        signature=create_signer(private_key=SENDER_PRIVATE_KEY).sign(serialized_header),
+    )
+
+
+def test_create_verification_engine():
+    """
+    Case: create verification engines by their names.
+    Expect: engine of requested type is returned.
+    """
+    assert isinstance(create_verification_engine('inline'), InlineVerificationEngine)
+    assert isinstance(create_verification_engine('process_pool', 2), ProcessPoolVerificationEngine)
+
+
+def test_process_pool_engine_verify_processors_in_order(process_pool_engine):
+    """
+    Case: verify several processors of different key types with one call to process pool engine.
+    Expect: verification results are returned in order of passed processors.
+    """
+    not_user_certificte_private_key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048, backend=default_backend(),
+    )
+    invalid_rsa_payload = generate_rsa_payload(
+        entity_hash_signature=generate_rsa_signature(b'w', not_user_certificte_private_key),
+    )
+
+    processors = [
+        PubKeyHandler._get_public_key_processor(transaction_payload=payload) for payload in (
+            generate_rsa_payload(), invalid_rsa_payload, generate_ed25519_payload(), generate_ecdsa_payload(),
+        )
+    ]
+
+    assert [True, False, True, True] == process_pool_engine.verify(*processors)
+
+
+def test_process_pool_engine_verify_single_processor_on_pool(mocker):
+    """
+    Case: verify a single processor with process pool engine.
+    Expect: signature is submitted to the process pool.
+    """
+    engine = ProcessPoolVerificationEngine(max_workers=2)
+    mock_executor = engine._executor = mocker.Mock()
+    mock_executor.submit.return_value.result.return_value = True
+
+    processor = PubKeyHandler._get_public_key_processor(transaction_payload=generate_rsa_payload())
+
+    assert [True] == engine.verify(processor)
+    mock_executor.submit.assert_called_once()
+
+
+def test_process_pool_engine_verify_single_processor_inline(mocker):
+    """
+    Case: verify a single processor with process pool engine, that verifies single signatures inline.
+    Expect: signature is verified without starting or submitting to the process pool.
+    """
+    engine = ProcessPoolVerificationEngine(max_workers=2, single_inline=True)
+    mock_start = mocker.patch.object(engine, 'start')
+
+    processor = PubKeyHandler._get_public_key_processor(transaction_payload=generate_rsa_payload())
+
+    assert [True] == engine.verify(processor)
+    assert engine._executor is None
+    mock_start.assert_not_called()
+
+
+def test_process_pool_engine_verify_on_broken_pool(mocker):
+    """
+    Case: verify processors with process pool engine, which pool is broken.
+    Expect: broken pool is shut down without waiting, signatures are verified inline.
+    """
+    engine = ProcessPoolVerificationEngine(max_workers=2)
+    mock_executor = engine._executor = mocker.Mock()
+    mock_executor.submit.return_value.result.side_effect = BrokenProcessPool()
+
+    processor = PubKeyHandler._get_public_key_processor(transaction_payload=generate_rsa_payload())
+
+    assert [True] == engine.verify(processor)
+    mock_executor.shutdown.assert_called_once_with(wait=False)
+    assert engine._executor is None
+
+
+def test_public_key_handler_store_with_process_pool_engine(process_pool_engine):
+    """
+    Case: send transaction request to store certificate public key, when process pool engine is used.
+    Expect: public key is stored and linked to owner account as with inline verification.
+    """
+    sender_account = Account()
+    sender_account.balance = SENDER_INITIAL_BALANCE
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        SENDER_ADDRESS: sender_account.SerializeToString(),
+    })
+
+    transaction_request = create_store_transaction_request(generate_rsa_payload())
+
+    PubKeyHandler().apply(transaction=transaction_request, context=mock_context)
+
+    stored_sender_account = Account()
+    stored_sender_account.ParseFromString(mock_context.state[SENDER_ADDRESS])
+
+    assert ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY in mock_context.state
+    assert [ADDRESS_FROM_CERTIFICATE_PUBLIC_KEY] == list(stored_sender_account.pub_keys)
+    assert SENDER_INITIAL_BALANCE - PUB_KEY_STORE_PRICE == stored_sender_account.balance
+
+
+def test_public_key_handler_store_invalid_signature_with_process_pool_engine(process_pool_engine):
+    """
+    Case: send transaction request, to store certificate public key with invalid signature, when process pool
+        engine is used.
+    Expect: invalid transaction error is raised with invalid signature error message.
+    """
+    not_user_certificte_private_key = rsa.generate_private_key(
+        public_exponent=65537, key_size=2048, backend=default_backend(),
+    )
+
+    new_public_key_payload = generate_rsa_payload(
+        entity_hash_signature=generate_rsa_signature(b'w', not_user_certificte_private_key),
+    )
+    transaction_request = create_store_transaction_request(new_public_key_payload)
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={})
+
+    with pytest.raises(InvalidTransaction) as error:
+        PubKeyHandler().apply(transaction=transaction_request, context=mock_context)
+
+    assert 'Invalid signature' == str(error.value)
+
+
+def test_public_key_handler_store_not_der_public_key_with_process_pool_engine(process_pool_engine):
+    """
+    Case: send transaction request, to store certificate public key not in DER format, when process pool
+        engine is used.
+    Expect: invalid transaction error raised in worker process is propagated with the same message.
+    """
+    new_public_key_payload = generate_rsa_payload(key=b'not-der-public-key')
+    transaction_request = create_store_transaction_request(new_public_key_payload)
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={})
+
+    with pytest.raises(InvalidTransaction) as error:
+        PubKeyHandler().apply(transaction=transaction_request, context=mock_context)
+
+    assert 'Cannot deserialize the provided public key. Check if it is in DER format.' == str(error.value)
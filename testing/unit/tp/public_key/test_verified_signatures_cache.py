@@ -0,0 +1,105 @@
+"""
+Provide tests for public key handler verified signatures cache implementation.
+"""
+import pytest
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from remme.shared.utils import LRUCache
+from remme.tp.pub_key import PubKeyHandler
+from .base import (
+    generate_rsa_payload,
+    generate_ed25519_payload,
+)
+
+
+@pytest.fixture
+def verified_signatures():
+    """
+    Replace verified signatures cache of the public key handler with an empty one for the test duration.
+    """
+    handler = PubKeyHandler()
+    original_cache, handler._verified_signatures = handler._verified_signatures, LRUCache(maxsize=2)
+
+    yield handler._verified_signatures
+
+    handler._verified_signatures = original_cache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    """
+    Case: set more entries to the cache than its maximum size after reading the first one.
+    Expect: least recently used entry is evicted, hits and misses are counted.
+    """
+    cache = LRUCache(maxsize=2)
+    cache.set('first', 1)
+    cache.set('second', 2)
+
+    assert 1 == cache.get('first')
+
+    cache.set('third', 3)
+
+    assert 'second' not in cache
+    assert cache.get('second') is None
+    assert (1, 1, 2, 2) == cache.info()
+
+
+def test_verify_signatures_reuses_verified_result(verified_signatures, mocker):
+    """
+    Case: verify signature of the same public key payload twice.
+    Expect: signature is passed to the verification engine once, second result is got from the cache.
+    """
+    engine_verify = mocker.spy(PubKeyHandler().verification_engine, 'verify')
+
+    processor = PubKeyHandler._get_public_key_processor(transaction_payload=generate_rsa_payload())
+    same_processor = PubKeyHandler._get_public_key_processor(transaction_payload=generate_rsa_payload())
+
+    assert [True] == PubKeyHandler()._verify_signatures(processor)
+    assert [True] == PubKeyHandler()._verify_signatures(same_processor)
+
+    assert 1 == engine_verify.call_count
+    assert 1 == PubKeyHandler().verified_signatures_cache_info.hits
+    assert 1 == PubKeyHandler().verified_signatures_cache_info.misses
+
+
+def test_verify_signatures_caches_invalid_result(verified_signatures):
+    """
+    Case: verify invalid signature of a public key payload twice.
+    Expect: negative verification result is cached and returned as well.
+    """
+    payload = generate_ed25519_payload(entity_hash_signature=b'0' * 64)
+    processor = PubKeyHandler._get_public_key_processor(transaction_payload=payload)
+
+    assert [False] == PubKeyHandler()._verify_signatures(processor)
+    assert [False] == PubKeyHandler()._verify_signatures(processor)
+
+    assert 1 == PubKeyHandler().verified_signatures_cache_info.hits
+
+
+def test_verify_signatures_does_not_cache_errors(verified_signatures):
+    """
+    Case: verify signature of a public key, that could not be deserialized.
+    Expect: invalid transaction error is raised and nothing is stored to the cache.
+    """
+    processor = PubKeyHandler._get_public_key_processor(
+        transaction_payload=generate_rsa_payload(key=b'not-der-public-key'),
+    )
+
+    with pytest.raises(InvalidTransaction):
+        PubKeyHandler()._verify_signatures(processor)
+
+    assert 0 == len(verified_signatures)
+
+
+def test_verification_cache_key_differs_by_padding():
+    """
+    Case: get verification cache keys for RSA payloads that differ by padding only.
+    Expect: cache keys are different.
+    """
+    pkcs1v15_payload = generate_rsa_payload()
+    pss_payload = generate_rsa_payload()
+    pss_payload.rsa.padding = pss_payload.rsa.Padding.Value('PSS')
+
+    pkcs1v15_processor = PubKeyHandler._get_public_key_processor(transaction_payload=pkcs1v15_payload)
+    pss_processor = PubKeyHandler._get_public_key_processor(transaction_payload=pss_payload)
+
+    assert pkcs1v15_processor.get_verification_cache_key() != pss_processor.get_verification_cache_key()
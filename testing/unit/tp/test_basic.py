@@ -0,0 +1,69 @@
+"""
+Provide tests for basic handler methods dispatching implementation.
+"""
+import pytest
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from remme.protos.pub_key_pb2 import PubKeyMethod
+from remme.tp.account import AccountHandler
+from remme.tp.atomic_swap import AtomicSwapHandler
+from remme.tp.basic import EMIT_EVENT, PB_CLASS, PROCESSOR, VALIDATOR
+from remme.tp.pub_key import PubKeyHandler
+from testing.mocks.stub import StubContext
+
+
+@pytest.mark.parametrize('handler', [AccountHandler(), PubKeyHandler(), AtomicSwapHandler()])
+def test_dispatch_table_matches_state_processor(handler):
+    """
+    Case: get compiled dispatch table of a handler.
+    Expect: it is built once and its records match entries of the handler's state processor.
+    """
+    state_processor = handler.get_state_processor()
+
+    assert handler.dispatch_table is handler.dispatch_table
+    assert state_processor.keys() == handler.dispatch_table.keys()
+
+    for method, dispatch in handler.dispatch_table.items():
+        assert state_processor[method][PB_CLASS] is dispatch.pb_class
+        assert state_processor[method][PROCESSOR] == dispatch.processor
+        assert state_processor[method][VALIDATOR] is dispatch.validator
+        assert state_processor[method].get(EMIT_EVENT) == dispatch.emit_event
+        assert f'tp.{handler.family_name}.{method}' == dispatch.metric
+
+
+def test_dispatch_table_is_read_only():
+    """
+    Case: set a method to compiled dispatch table.
+    Expect: type error is raised.
+    """
+    with pytest.raises(TypeError):
+        AccountHandler().dispatch_table[100] = None
+
+
+def test_dispatch_table_of_family_version():
+    """
+    Case: get compiled dispatch tables of the first and the latest family versions of public key handler.
+    Expect: tables are built once per version, public keys are stored by different processors.
+    """
+    handler = PubKeyHandler()
+    first_version, *_, latest_version = handler.family_versions
+
+    assert handler.get_dispatch_table(first_version) is handler.get_dispatch_table(first_version)
+    assert handler.get_dispatch_table(latest_version) is handler.dispatch_table
+    assert handler.get_dispatch_table(first_version)[PubKeyMethod.STORE].processor != \
+        handler.dispatch_table[PubKeyMethod.STORE].processor
+
+
+def test_apply_transaction_of_unknown_family_version():
+    """
+    Case: apply transaction request of the family version the handler does not process.
+    Expect: invalid transaction error is raised.
+    """
+    transaction = TpProcessRequest(header=TransactionHeader(family_name='account', family_version='100.0'))
+
+    with pytest.raises(InvalidTransaction) as error:
+        AccountHandler().apply(transaction=transaction, context=StubContext(inputs=[], outputs=[], initial_state={}))
+
+    assert 'Invalid family version (100.0) has been set.' == str(error.value)
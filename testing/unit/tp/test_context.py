@@ -0,0 +1,185 @@
+"""
+Provide tests for cache context service implementation.
+"""
+import pytest
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from remme.protos.account_pb2 import Account
+from remme.protos.block_info_pb2 import BlockInfo, BlockInfoConfig
+from remme.shared.block_info import BLOCK_INFO_NAMESPACE, CONFIG_ADDRESS, create_block_address
+from remme.tp.context import CacheContextService
+from testing.mocks.stub import StubContext
+
+FIRST_ADDRESS = '112007' + '1' * 64
+SECOND_ADDRESS = '112007' + '2' * 64
+THIRD_ADDRESS = '112007' + '3' * 64
+
+INPUTS = OUTPUTS = [
+    FIRST_ADDRESS,
+    SECOND_ADDRESS,
+    THIRD_ADDRESS,
+]
+
+
+def create_context_service():
+    account = Account()
+    account.balance = 100
+
+    mock_context = StubContext(inputs=INPUTS, outputs=OUTPUTS, initial_state={
+        FIRST_ADDRESS: account.SerializeToString(),
+        SECOND_ADDRESS: account.SerializeToString(),
+    })
+
+    return CacheContextService(context=mock_context)
+
+
+def test_get_cached_data_fetches_missed_addresses_with_single_request():
+    """
+    Case: get data of several addresses that were not pre-loaded.
+    Expect: data is fetched with a single state request and parsed in order of resolvers.
+    """
+    context_service = create_context_service()
+
+    first_account, second_account, third_account = context_service.get_cached_data([
+        (FIRST_ADDRESS, Account),
+        (SECOND_ADDRESS, Account),
+        (THIRD_ADDRESS, Account),
+    ])
+
+    assert 100 == first_account.balance
+    assert 100 == second_account.balance
+    assert third_account is None
+    assert 1 == context_service.state_round_trips
+
+
+def test_get_cached_data_does_not_fetch_pre_loaded_addresses():
+    """
+    Case: get data of pre-loaded addresses, including address without data.
+    Expect: no state requests are sent except the pre-loading one.
+    """
+    context_service = create_context_service()
+    context_service.preload_state(INPUTS)
+
+    accounts = list(context_service.get_cached_data([
+        (THIRD_ADDRESS, Account),
+        (FIRST_ADDRESS, Account),
+        (FIRST_ADDRESS, Account),
+    ]))
+
+    assert [None, 100, 100] == [account and account.balance for account in accounts]
+    assert 1 == context_service.state_round_trips
+
+
+def test_get_cached_data_unauthorized_address():
+    """
+    Case: get data of addresses, one of which is not presented in inputs.
+    Expect: invalid transaction error is raised.
+    """
+    context_service = create_context_service()
+
+    with pytest.raises(InvalidTransaction):
+        list(context_service.get_cached_data([
+            (FIRST_ADDRESS, Account),
+            ('112007' + '4' * 64, Account),
+        ]))
+
+
+def test_set_state_skips_unchanged_entries(mocker):
+    """
+    Case: set data of pre-loaded addresses, one of which is unchanged.
+    Expect: only changed entries are sent to the validator, skipped entries are counted.
+    """
+    context_service = create_context_service()
+    context_service.preload_state(INPUTS)
+
+    first_account, = context_service.get_cached_data([(FIRST_ADDRESS, Account)])
+    second_account = Account()
+    second_account.balance = 50
+
+    context_set_state = mocker.spy(context_service._context, 'set_state')
+
+    context_service.set_state({
+        FIRST_ADDRESS: first_account.SerializeToString(),
+        SECOND_ADDRESS: second_account.SerializeToString(),
+        THIRD_ADDRESS: second_account.SerializeToString(),
+    })
+
+    assert 1 == context_set_state.call_count
+    assert {SECOND_ADDRESS, THIRD_ADDRESS} == set(context_set_state.call_args[0][0])
+    assert 1 == context_service.skipped_writes
+
+
+def test_set_state_compares_with_previously_set_entries(mocker):
+    """
+    Case: set the same data of an address twice.
+    Expect: the second write is not sent to the validator.
+    """
+    context_service = create_context_service()
+
+    account = Account()
+    account.balance = 50
+
+    context_set_state = mocker.spy(context_service._context, 'set_state')
+
+    context_service.set_state({THIRD_ADDRESS: account.SerializeToString()})
+    context_service.set_state({THIRD_ADDRESS: account.SerializeToString()})
+
+    assert 1 == context_set_state.call_count
+    assert 1 == context_service.skipped_writes
+
+
+def create_block_info_context_service(latest_block, predicted_block_num=None):
+    block_info_config = BlockInfoConfig()
+    block_info_config.latest_block = latest_block
+
+    block_info = BlockInfo()
+    block_info.block_num = latest_block
+    block_info.timestamp = 1540000000
+
+    block_info_addresses = [create_block_address(num) for num in range(10)]
+
+    inputs = [CONFIG_ADDRESS, BLOCK_INFO_NAMESPACE] + block_info_addresses
+
+    mock_context = StubContext(inputs=inputs, outputs=[], initial_state={
+        CONFIG_ADDRESS: block_info_config.SerializeToString(),
+        create_block_address(latest_block): block_info.SerializeToString(),
+    })
+
+    return CacheContextService(context=mock_context, latest_block_num=predicted_block_num)
+
+
+def test_preload_state_predicts_block_info_addresses():
+    """
+    Case: pre-load inputs with block info namespace prefix after block info config was read by another transaction.
+    Expect: info of the latest and the next block is pre-loaded, reading the latest one sends no state request.
+    """
+    previous_context_service = create_block_info_context_service(latest_block=5)
+    previous_context_service.preload_state([CONFIG_ADDRESS, BLOCK_INFO_NAMESPACE])
+
+    assert 5 == previous_context_service.latest_block_num
+
+    for latest_block in (5, 6):
+        context_service = create_block_info_context_service(
+            latest_block=latest_block, predicted_block_num=previous_context_service.latest_block_num,
+        )
+        context_service.preload_state([CONFIG_ADDRESS, BLOCK_INFO_NAMESPACE])
+
+        block_info, = context_service.get_cached_data([
+            (create_block_address(latest_block), BlockInfo),
+        ])
+
+        assert latest_block == block_info.block_num
+        assert 1 == context_service.state_round_trips
+
+
+def test_preload_state_does_not_predict_block_info_addresses_without_prefix():
+    """
+    Case: pre-load inputs without block info namespace prefix.
+    Expect: only full addresses are pre-loaded.
+    """
+    context_service = create_block_info_context_service(latest_block=5, predicted_block_num=5)
+    context_service.preload_state([CONFIG_ADDRESS])
+
+    list(context_service.get_cached_data([(create_block_address(5), BlockInfo)]))
+
+    assert 2 == context_service.state_round_trips
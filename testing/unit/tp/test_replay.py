@@ -0,0 +1,75 @@
+"""
+Provide tests for transaction processor offline replay implementation.
+"""
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+
+from remme.protos.account_pb2 import Account, AccountMethod, GenesisPayload, TransferPayload
+from remme.protos.transaction_pb2 import TransactionPayload
+from remme.settings import GENESIS_ADDRESS
+from remme.tp.account import AccountHandler
+from remme.tp.replay import Replayer, read_batch_lists
+from testing.conftest import create_signer
+
+SENDER_SIGNER = create_signer(private_key='1cb15ecfe1b3dc02df0003ac396037f85b98cf9f99b0beae000dc5e9e8b6dab4')
+SENDER_ADDRESS = AccountHandler().make_address_from_data(SENDER_SIGNER.get_public_key().as_hex())
+RECEIVER_ADDRESS = AccountHandler().make_address_from_data('receiver')
+
+TOTAL_SUPPLY = 1000
+
+
+def create_transaction(message_factory, method, payload, inputs, outputs):
+    transaction_payload = TransactionPayload()
+    transaction_payload.method = method
+    transaction_payload.data = payload.SerializeToString()
+
+    return message_factory.create_transaction(transaction_payload.SerializeToString(), inputs, outputs, [])
+
+
+def create_batches_file(path, transfer_values):
+    message_factory = AccountHandler().get_message_factory(signer=SENDER_SIGNER)
+
+    genesis = create_transaction(
+        message_factory, AccountMethod.GENESIS, GenesisPayload(total_supply=TOTAL_SUPPLY),
+        [GENESIS_ADDRESS], [GENESIS_ADDRESS, SENDER_ADDRESS],
+    )
+
+    batch_list = BatchList()
+    batch_list.batches.extend(BatchList.FromString(message_factory.create_batch([genesis])).batches)
+
+    for value in transfer_values:
+        transfer = create_transaction(
+            message_factory, AccountMethod.TRANSFER, TransferPayload(address_to=RECEIVER_ADDRESS, value=value),
+            [SENDER_ADDRESS, RECEIVER_ADDRESS], [SENDER_ADDRESS, RECEIVER_ADDRESS],
+        )
+        batch_list.batches.extend(BatchList.FromString(message_factory.create_batch([transfer])).batches)
+
+    path.write_binary(batch_list.SerializeToString())
+    return str(path)
+
+
+def test_replay_batches_file(tmpdir):
+    """
+    Case: replay file with genesis and transfer batches, one of which transfers more than the sender's balance.
+    Expect: valid batches change the state, the invalid one is rejected, transactions and state operations are counted.
+    """
+    batches_file = create_batches_file(tmpdir.join('transfers.batch'), transfer_values=[100, 200, 10 ** 6])
+
+    replayer = Replayer()
+    for batch_list in read_batch_lists([batches_file]):
+        replayer.replay(batch_list)
+
+    sender_account = Account.FromString(replayer.state[SENDER_ADDRESS])
+    receiver_account = Account.FromString(replayer.state[RECEIVER_ADDRESS])
+
+    assert TOTAL_SUPPLY - 300 == sender_account.balance
+    assert 300 == receiver_account.balance
+
+    assert 4 == replayer.batches
+    assert 1 == replayer.invalid_batches
+    assert 1 == len(replayer.stats['account.genesis'].latencies)
+    assert 2 == len(replayer.stats['account.transfer'].latencies)
+    assert 1 == replayer.stats['account.transfer'].invalid
+    assert 2 == replayer.stats['account.transfer'].counters['set_state']
+    assert 2 == replayer.stats['account.transfer'].counters['events']
+
+    assert 'account.transfer' in replayer.report(elapsed=1)
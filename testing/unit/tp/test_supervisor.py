@@ -0,0 +1,119 @@
+"""
+Provide tests for transaction processor workers supervisor implementation.
+"""
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from remme.tp.supervisor import WorkersSupervisor
+
+
+def sleep_worker(seconds, index):
+    time.sleep(seconds)
+
+
+def exit_worker(index):
+    pass
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_supervisor_starts_workers():
+    """
+    Case: start supervisor with several workers.
+    Expect: the number of workers processes are alive until supervisor is stopped.
+    """
+    supervisor = WorkersSupervisor(sleep_worker, 2, args=(60,))
+    supervisor.start()
+
+    try:
+        assert wait_for(lambda: 2 == supervisor.alive)
+    finally:
+        supervisor.stop()
+
+    assert 0 == supervisor.alive
+
+
+def test_supervisor_restarts_dead_workers():
+    """
+    Case: check workers, which processes exited.
+    Expect: dead workers are restarted and restarts are counted per worker.
+    """
+    supervisor = WorkersSupervisor(exit_worker, 2)
+    supervisor.start()
+
+    try:
+        assert wait_for(lambda: 0 == supervisor.alive)
+        supervisor.check()
+    finally:
+        supervisor.stop()
+
+    assert [1, 1] == supervisor.restarts
+
+
+def test_supervisor_delays_restarts_of_failing_worker():
+    """
+    Case: check the worker, which process exits as soon as it is started, until it is restarted three times.
+    Expect: the worker is restarted at once, then after the delay, then after the doubled delay.
+    """
+    supervisor = WorkersSupervisor(exit_worker, 1, restart_delay=0.3)
+    supervisor.start()
+
+    restarted_at = [time.monotonic()]
+
+    try:
+        while len(restarted_at) < 4:
+            supervisor.check()
+
+            if supervisor.restarts[0] == len(restarted_at):
+                restarted_at.append(time.monotonic())
+
+            time.sleep(0.01)
+    finally:
+        supervisor.stop()
+
+    intervals = [restarted - previous for previous, restarted in zip(restarted_at, restarted_at[1:])]
+
+    assert 0.3 <= intervals[1] < intervals[2]
+    assert 0.6 <= intervals[2]
+
+
+def test_supervisor_requires_workers():
+    """
+    Case: create supervisor without workers.
+    Expect: value error is raised.
+    """
+    with pytest.raises(ValueError):
+        WorkersSupervisor(exit_worker, 0)
+
+
+def test_transaction_processor_module_runs_workers():
+    """
+    Case: run transaction processor module with one worker, as docker does with `python3 -m remme.tp`.
+    Expect: the spawned worker imports the processor function and stays alive, it is not restarted.
+    """
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'remme.tp', '--workers', '1', '--families', 'account'],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+
+    try:
+        time.sleep(10)
+        assert process.poll() is None
+    finally:
+        process.send_signal(signal.SIGTERM)
+        _, output = process.communicate(timeout=30)
+
+    assert 'Started worker 0' in output
+    assert 'exited with code' not in output
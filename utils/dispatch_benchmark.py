@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+# Copyright 2018 REMME
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ------------------------------------------------------------------------
+
+"""Microbenchmark of transaction processor methods dispatching.
+
+Compares per-transaction overhead of building `get_state_processor` dict and
+looking up its entries with the compiled `dispatch_table` records.
+
+Usage:
+    python3 utils/dispatch_benchmark.py [--number N] [--repeat R]
+"""
+import argparse
+import timeit
+
+from remme.tp.basic import EMIT_EVENT, PB_CLASS, PROCESSOR, VALIDATOR
+from remme.tp.handlers import TP_HANDLERS
+
+
+def dispatch_state_processor(handler, method):
+    state_processor = handler.get_state_processor()
+    return (
+        state_processor[method][PB_CLASS],
+        state_processor[method][PROCESSOR],
+        state_processor[method][VALIDATOR],
+        state_processor[method].get(EMIT_EVENT, None),
+        f'tp.{handler.family_name}.{method}',
+    )
+
+
+def dispatch_table(handler, method):
+    dispatch = handler.dispatch_table[method]
+    return (
+        dispatch.pb_class,
+        dispatch.processor,
+        dispatch.validator,
+        dispatch.emit_event,
+        dispatch.metric,
+    )
+
+
+def measure(function, handler, method, number, repeat):
+    timings = timeit.repeat(lambda: function(handler, method), number=number, repeat=repeat)
+    return min(timings) / number * 10 ** 9
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Methods dispatching microbenchmark.')
+    parser.add_argument('--number', type=int, default=100000, help='Dispatches per measurement')
+    parser.add_argument('--repeat', type=int, default=5, help='Measurements, the best one is reported')
+    args = parser.parse_args()
+
+    print(f'{"family":<12} {"method":>6} {"before, ns":>12} {"after, ns":>12} {"speedup":>8}')
+
+    for handler in TP_HANDLERS.values():
+        for method in handler.dispatch_table:
+            before = measure(dispatch_state_processor, handler, method, args.number, args.repeat)
+            after = measure(dispatch_table, handler, method, args.number, args.repeat)
+            print(f'{handler.family_name:<12} {method:>6} {before:>12.1f} {after:>12.1f} {before / after:>7.1f}x')
@@ -17,6 +17,10 @@
 
 """Statistics for metrics collected in InfluxDB.
 
+Reads summaries of execution times, which are aggregated by REMME Core
+components and sent once per flush interval, and prints overall statistics
+with percentiles of each interval.
+
 Usage:
     influxdb_stats.py <influx_host> <port> <user> <password> <db> <node> <metric>
 
@@ -24,7 +28,7 @@ Options:
     influx_host    InfluxDB host that we should work with.
     port           InfluxDB port.
     user           InfluxDB user.
-    password       InfluxDB password.
+    password       InfluxDB user password.
     db             The exact database that stores the metrics.
     node           Node that was sending the metrics.
     metric         The exact metric that we are collecting.
@@ -33,16 +37,14 @@ Options:
     -h --help    Show this screen.
     --version    Show version.
 """
-from datetime import datetime
 from docopt import docopt
-from influxdb import DataFrameClient
-import seaborn
+from influxdb import InfluxDBClient
 
 if __name__ == '__main__':
     args = docopt(__doc__, version='0.1')
     args = {k[1:-1]: v for k, v in args.items()}
     print(args)
-    client = DataFrameClient(
+    client = InfluxDBClient(
         args['influx_host'],
         args['port'],
         args['user'],
@@ -51,26 +53,29 @@ if __name__ == '__main__':
     )
     node = args['node']
     metric = args['metric']
-    res = client.query(f'select "execution_time" from "{metric}","{node}"')
-    res = res[metric]
-    print('Median metric value:', res.median(), 'seconds')
-    print('Mean metric value:', res.mean(), 'seconds')
-    time = datetime.now().strftime('%Y-%m-%d %H:%M:%SZ')
-    plot_title = f'CDF of {metric} on {node}'
-    seaborn \
-        .distplot(
-            res,
-            axlabel='Execution time (seconds)',
-            hist=False,
-            kde_kws=dict(cumulative=True)
-        ) \
-        .get_figure() \
-        .savefig(f'{time} {plot_title}.png')
-    plot_title = f'Histogram of {metric} on {node}'
-    seaborn \
-        .distplot(
-            res,
-            axlabel='Execution time (seconds)'
-        ) \
-        .get_figure() \
-        .savefig(f'{time} {plot_title}.png')
+    escaped_node = node.replace("'", "\\'")
+    res = client.query(f'select * from "{metric}" where "hostname" = \'{escaped_node}\'')
+    summaries = list(res.get_points())
+    if not summaries:
+        print(f'No summaries of {metric} on {node} found')
+        exit(1)
+
+    count = sum(summary['count'] for summary in summaries)
+    total = sum(summary['sum'] for summary in summaries)
+    percentiles = sorted(
+        (key for key in summaries[0] if key.startswith('p') and key[1:].isdigit()),
+        key=lambda key: int(key[1:]),
+    )
+
+    print('Measurements count:', count)
+    print('Mean metric value:', total / count, 'seconds')
+    print('Min metric value:', min(summary['min'] for summary in summaries), 'seconds')
+    print('Max metric value:', max(summary['max'] for summary in summaries), 'seconds')
+    print()
+    print('time', 'count', 'mean', *percentiles, 'max', sep='\t')
+    for summary in summaries:
+        print(
+            summary['time'], summary['count'], f'{summary["mean"]:.6f}',
+            *(f'{summary[key]:.6f}' for key in percentiles),
+            f'{summary["max"]:.6f}', sep='\t',
+        )